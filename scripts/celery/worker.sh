@@ -1,5 +0,0 @@
-#!/bin/sh
-set -e
-
-echo "Starting Celery Worker..."
-celery -A backend worker --loglevel=info
\ No newline at end of file
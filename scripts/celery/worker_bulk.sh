@@ -0,0 +1,17 @@
+#!/bin/sh
+set -e
+
+# Each worker process keeps a persistent connection unless
+# CELERY_DB_POOL_MAX_SIZE enables a connection pool per process.
+export DB_POOL_MIN_SIZE="${CELERY_DB_POOL_MIN_SIZE:-1}"
+export DB_POOL_MAX_SIZE="${CELERY_DB_POOL_MAX_SIZE:-0}"
+
+# Long full-table sync shards: one message per process at a time so idle
+# workers can take the remaining shards, late acks, and recycled processes.
+echo "Starting Celery Worker (bulk queue)..."
+celery -A backend worker --loglevel=info \
+    --queues bulk \
+    --hostname "bulk@%h" \
+    --concurrency "${CELERY_BULK_CONCURRENCY:-4}" \
+    --prefetch-multiplier "${CELERY_BULK_PREFETCH_MULTIPLIER:-1}" \
+    --max-tasks-per-child "${CELERY_BULK_MAX_TASKS_PER_CHILD:-50}"
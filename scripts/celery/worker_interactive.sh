@@ -0,0 +1,16 @@
+#!/bin/sh
+set -e
+
+# Each worker process keeps a persistent connection unless
+# CELERY_DB_POOL_MAX_SIZE enables a connection pool per process.
+export DB_POOL_MIN_SIZE="${CELERY_DB_POOL_MIN_SIZE:-1}"
+export DB_POOL_MAX_SIZE="${CELERY_DB_POOL_MAX_SIZE:-0}"
+
+# Short per-item syncs: many processes, a few prefetched messages each,
+# acks on receipt (see backend/celery.py).
+echo "Starting Celery Worker (interactive queue)..."
+celery -A backend worker --loglevel=info \
+    --queues interactive \
+    --hostname "interactive@%h" \
+    --concurrency "${CELERY_INTERACTIVE_CONCURRENCY:-8}" \
+    --prefetch-multiplier "${CELERY_INTERACTIVE_PREFETCH_MULTIPLIER:-4}"
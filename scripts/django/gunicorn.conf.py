@@ -0,0 +1,33 @@
+"""
+Gunicorn settings of the production serving profile, shared by the WSGI
+(start.sh) and ASGI (start_asgi.sh) servers. Values come from the
+environment; see .env.sample.
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('WEB_PORT', '8000')}"
+
+# Several worker processes per container, each with its own connections
+# (or connection pool). The app is imported in every worker after the
+# fork, so no database connection is ever shared with the master.
+workers = int(os.environ.get("WEB_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+worker_class = "gthread"
+threads = int(os.environ.get("WEB_THREADS", "4"))
+preload_app = False
+
+# Recycle workers now and then so that memory growth stays bounded.
+max_requests = int(os.environ.get("WEB_MAX_REQUESTS", "1000"))
+max_requests_jitter = int(os.environ.get("WEB_MAX_REQUESTS_JITTER", "100"))
+
+timeout = int(os.environ.get("WEB_TIMEOUT", "30"))
+
+# Restart workers when code changes; for development only.
+reload = os.environ.get("WEB_RELOAD", "false").lower() in ("1", "true", "yes")
+graceful_timeout = 30
+keepalive = 5
+
+# Worker heartbeats go to memory, not to a possibly slow container disk.
+worker_tmp_dir = "/dev/shm"
+accesslog = "-"
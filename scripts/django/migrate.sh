@@ -0,0 +1,5 @@
+#!/bin/sh
+set -e
+
+echo "Applying Django migrations..."
+python manage.py migrate --noinput
@@ -1,9 +1,11 @@
-#!/bin/bash
+#!/bin/sh
 set -e
 
-echo "Running Django migrations..."
-python manage.py makemigrations --noinput
-python manage.py migrate --noinput
+# Migrations are applied once per deploy by migrate.sh (the migrate
+# service), not on every boot. Each gunicorn thread keeps a persistent,
+# health-checked connection unless WEB_DB_POOL_MAX_SIZE enables a pool.
+export DB_POOL_MIN_SIZE="${WEB_DB_POOL_MIN_SIZE:-1}"
+export DB_POOL_MAX_SIZE="${WEB_DB_POOL_MAX_SIZE:-0}"
 
-echo "Starting Django development server..."
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+echo "Starting Django under gunicorn (WSGI)..."
+exec gunicorn backend.wsgi:application --config "$(dirname "$0")/gunicorn.conf.py"
@@ -0,0 +1,14 @@
+#!/bin/sh
+set -e
+
+# Migrations are applied by migrate.sh. Under ASGI, requests do not reuse
+# persistent connections, so every worker process gets a connection pool.
+export DB_POOL_MIN_SIZE="${ASGI_DB_POOL_MIN_SIZE:-2}"
+export DB_POOL_MAX_SIZE="${ASGI_DB_POOL_MAX_SIZE:-10}"
+
+echo "Starting Django under gunicorn with uvicorn workers (ASGI)..."
+exec gunicorn backend.asgi:application \
+  --config "$(dirname "$0")/gunicorn.conf.py" \
+  --worker-class uvicorn.workers.UvicornWorker \
+  --bind "0.0.0.0:${ASGI_PORT:-8001}" \
+  --workers "${ASGI_WORKERS:-$(nproc)}"
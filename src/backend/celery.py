@@ -1,9 +1,150 @@
 import os
+import time
+from typing import Any, Dict
 
-from celery import Celery
+from celery import Celery, Task
+from celery.signals import (
+    before_task_publish,
+    task_failure,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+)
+from django.conf import settings
+from kombu import Queue
+
+from .db import close_all_connections
+from .metrics import REGISTRY, Counter, Histogram
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "backend.settings")
 
 app = Celery("backend")
 app.config_from_object("django.conf:settings", namespace="CELERY")
 app.autodiscover_tasks()
+
+# Per-item syncs triggered from the API or the admin run on a low-latency
+# queue; full-table syncs and maintenance run on a throughput queue. Each
+# queue has its own workers (scripts/celery/worker_*.sh), so a full sync
+# never holds up an interactive one.
+INTERACTIVE_QUEUE = "interactive"
+BULK_QUEUE = "bulk"
+
+INTERACTIVE_TASKS = ["items.tasks.simulate_external_price_sync_for_item"]
+BULK_TASKS = [
+    "items.tasks.sync_external_prices_for_items",
+    "items.tasks.hourly_external_price_sync",
+    "items.tasks.sync_external_price_shard",
+    "items.tasks.aggregate_external_price_sync",
+    "items.tasks.release_external_price_sync_lock",
+    "items.tasks.maintain_price_history_partitions",
+    "items.tasks.rebuild_price_drift_summary",
+]
+
+app.conf.task_queues = (Queue(INTERACTIVE_QUEUE), Queue(BULK_QUEUE))
+app.conf.task_default_queue = INTERACTIVE_QUEUE
+app.conf.task_routes = {
+    **{name: {"queue": INTERACTIVE_QUEUE} for name in INTERACTIVE_TASKS},
+    **{name: {"queue": BULK_QUEUE} for name in BULK_TASKS},
+}
+# Bulk tasks are idempotent (they only rewrite stale prices), so they are
+# acknowledged after they finish and redelivered if their worker dies.
+# Interactive tasks are acknowledged on receipt: retrying a lost one is
+# the caller's job and its lock expires on its own.
+app.conf.task_annotations = {
+    name: {"acks_late": True, "reject_on_worker_lost": True} for name in BULK_TASKS
+}
+
+
+# Task metrics, exported at /metrics with the web ones. Publishing stamps
+# the message with a wall-clock "published_at" header, from which the
+# worker derives the queue wait (so worker and publisher clocks should be
+# in sync). Tasks run through .apply() have no queue and no wait.
+TASKS_PUBLISHED = Counter(
+    "celery_tasks_published_total", "Tasks sent to the broker.", ["task", "queue"]
+)
+TASK_QUEUE_WAIT = Histogram(
+    "celery_task_queue_wait_seconds",
+    "Time from publishing a task to a worker starting it.",
+    ["task", "queue"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 900.0),
+)
+TASK_RUNTIME = Histogram(
+    "celery_task_runtime_seconds",
+    "Task execution time.",
+    ["task", "queue"],
+    buckets=(0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 300.0, 1800.0),
+)
+TASKS_FINISHED = Counter(
+    "celery_tasks_total",
+    "Finished task runs by final state (SUCCESS, FAILURE, RETRY...).",
+    ["task", "queue", "state"],
+)
+TASK_FAILURES = Counter(
+    "celery_task_failures_total",
+    "Failed task runs by exception type.",
+    ["task", "exception"],
+)
+
+# Start times of the tasks running in this process, by task ID.
+_started: Dict[str, float] = {}
+
+
+def task_queue(task: Task) -> str:
+    delivery_info = task.request.delivery_info or {}
+    return delivery_info.get("routing_key") or "direct"
+
+
+@before_task_publish.connect
+def record_task_published(
+    sender: str, headers: Dict[str, Any], routing_key: str = "", **kwargs: Any
+) -> None:
+    if not settings.METRICS["ENABLED"]:
+        return
+    headers["published_at"] = time.time()
+    TASKS_PUBLISHED.inc(task=sender, queue=routing_key or "direct")
+
+
+@task_prerun.connect
+def record_task_started(task_id: str, task: Task, **kwargs: Any) -> None:
+    if not settings.METRICS["ENABLED"]:
+        return
+    _started[task_id] = time.perf_counter()
+    published_at = getattr(task.request, "published_at", None)
+    if published_at is not None:
+        TASK_QUEUE_WAIT.observe(
+            max(time.time() - published_at, 0.0),
+            task=task.name,
+            queue=task_queue(task),
+        )
+
+
+@task_postrun.connect
+def record_task_finished(
+    task_id: str, task: Task, state: str = "", **kwargs: Any
+) -> None:
+    started = _started.pop(task_id, None)
+    if started is None:
+        return
+    queue = task_queue(task)
+    TASK_RUNTIME.observe(time.perf_counter() - started, task=task.name, queue=queue)
+    TASKS_FINISHED.inc(task=task.name, queue=queue, state=state or "UNKNOWN")
+    REGISTRY.maybe_flush()
+
+
+@task_failure.connect
+def record_task_failure(sender: Task, exception: BaseException, **kwargs: Any) -> None:
+    if settings.METRICS["ENABLED"]:
+        TASK_FAILURES.inc(task=sender.name, exception=type(exception).__name__)
+
+
+@worker_process_shutdown.connect
+def flush_task_metrics(**kwargs: Any) -> None:
+    REGISTRY.flush()
+
+
+@worker_init.connect
+def close_parent_connections(**kwargs: Any) -> None:
+    # Runs before the pool processes are forked: each must open its own
+    # connections (or connection pool, with DB_POOL_MAX_SIZE).
+    close_all_connections()
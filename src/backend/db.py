@@ -0,0 +1,15 @@
+from django.db import connections
+
+
+def close_all_connections() -> None:
+    """
+    Close this process's database connections and, when pooling is
+    enabled, its connection pools. Call it before forking, so that child
+    processes open their own connections rather than share the parent's
+    sockets.
+    """
+    connections.close_all()
+    for connection in connections.all(initialized_only=True):
+        # Only pools that exist: the ``pool`` property would create one.
+        if connection.alias in getattr(connection, "_connection_pools", {}):
+            connection.close_pool()
@@ -0,0 +1,265 @@
+import atexit
+import logging
+import threading
+import time
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+import redis
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+# Latency buckets in seconds, from 5 ms to 10 s.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Family name -> (type, help text).
+Families = Dict[str, Tuple[str, str]]
+# Family name -> {sample line without value -> value}.
+Samples = Dict[str, Dict[str, float]]
+
+
+def format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    """Render a Prometheus label set, e.g. ``{view="item-list"}``."""
+    if not names:
+        return ""
+    pairs = (
+        '{}="{}"'.format(
+            name,
+            str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n"),
+        )
+        for name, value in zip(names, values)
+    )
+    return "{" + ",".join(pairs) + "}"
+
+
+class Metric:
+    """
+    A metric family whose samples are accumulated in-process and drained
+    into the shared store by ``REGISTRY.flush()``. Recording is a dict
+    update under a lock, cheap enough for every request and task.
+    """
+
+    type = ""
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.pending: Dict[Tuple[str, ...], list] = {}
+        REGISTRY.register(self)
+
+    def label_values(self, labels: Dict[str, Any]) -> Tuple[Any, ...]:
+        # Values are converted to strings when drained, not on every call.
+        return tuple(map(labels.__getitem__, self.labelnames))
+
+    def drain(self) -> Dict[str, float]:
+        """Return the samples recorded since the last drain, and reset them."""
+        raise NotImplementedError
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self.label_values(labels)
+        with REGISTRY.lock:
+            series = self.pending.setdefault(key, [0.0])
+            series[0] += amount
+
+    def drain(self) -> Dict[str, float]:
+        pending, self.pending = self.pending, {}
+        return {
+            self.name + format_labels(self.labelnames, key): series[0]
+            for key, series in pending.items()
+        }
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.buckets = tuple(buckets)
+        super().__init__(name, documentation, labelnames)
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self.label_values(labels)
+        index = bisect_left(self.buckets, value)
+        with REGISTRY.lock:
+            series = self.pending.get(key)
+            if series is None:
+                # One count per bucket plus +Inf, then the sum.
+                series = self.pending[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def drain(self) -> Dict[str, float]:
+        pending, self.pending = self.pending, {}
+        samples = {}
+        names = (*self.labelnames, "le")
+        bounds = [*map(repr, self.buckets), "+Inf"]
+        for key, series in pending.items():
+            cumulative = 0
+            for bound, count in zip(bounds, series):
+                cumulative += count
+                line = self.name + "_bucket" + format_labels(names, (*key, bound))
+                samples[line] = cumulative
+            labels = format_labels(self.labelnames, key)
+            samples[f"{self.name}_count{labels}"] = cumulative
+            samples[f"{self.name}_sum{labels}"] = series[-1]
+        return samples
+
+
+class MetricsRegistry:
+    """The metric families of this process and their pending samples."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.metrics: Dict[str, Metric] = {}
+        self.flushed_at = time.monotonic()
+
+    def register(self, metric: Metric) -> None:
+        self.metrics[metric.name] = metric
+
+    def flush(self) -> None:
+        """Add the samples recorded since the last flush to the shared store."""
+        with self.lock:
+            self.flushed_at = time.monotonic()
+            samples = {name: metric.drain() for name, metric in self.metrics.items()}
+        samples = {name: lines for name, lines in samples.items() if lines}
+        if samples:
+            families = {
+                name: (self.metrics[name].type, self.metrics[name].documentation)
+                for name in samples
+            }
+            try:
+                get_metrics_store().add(families, samples)
+            except Exception:
+                # Metrics must never fail a request or task: drop this batch.
+                logger.exception("Flushing metrics to the store failed")
+
+    def flush_due(self) -> bool:
+        """Whether METRICS["FLUSH_INTERVAL"] seconds passed since the last flush."""
+        return time.monotonic() - self.flushed_at >= settings.METRICS["FLUSH_INTERVAL"]
+
+    def maybe_flush(self) -> None:
+        """Flush once METRICS["FLUSH_INTERVAL"] seconds have passed."""
+        if self.flush_due():
+            self.flush()
+
+
+REGISTRY = MetricsRegistry()
+
+
+class LocalMetricsStore:
+    """Process-local store, for tests and single-process servers."""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.families: Families = {}
+        self.samples: Samples = {}
+
+    def add(self, families: Families, samples: Samples) -> None:
+        with self.lock:
+            self.families.update(families)
+            for name, lines in samples.items():
+                stored = self.samples.setdefault(name, {})
+                for line, value in lines.items():
+                    stored[line] = stored.get(line, 0) + value
+
+    def read(self) -> Tuple[Families, Samples]:
+        with self.lock:
+            return dict(self.families), {
+                name: dict(lines) for name, lines in self.samples.items()
+            }
+
+    def clear(self) -> None:
+        with self.lock:
+            self.families.clear()
+            self.samples.clear()
+
+
+class RedisMetricsStore:
+    """
+    Store shared by every web and worker process: one Redis hash per
+    family, incremented with HINCRBYFLOAT in a single pipeline per flush,
+    plus a hash of family types and help texts.
+    """
+
+    def __init__(self, url: str, prefix: str = "metrics:") -> None:
+        self.client = redis.Redis.from_url(url)
+        self.prefix = prefix
+
+    def add(self, families: Families, samples: Samples) -> None:
+        pipeline = self.client.pipeline(transaction=False)
+        pipeline.hset(
+            f"{self.prefix}families",
+            mapping={name: "\n".join(family) for name, family in families.items()},
+        )
+        for name, lines in samples.items():
+            for line, value in lines.items():
+                pipeline.hincrbyfloat(f"{self.prefix}{name}", line, value)
+        pipeline.execute()
+
+    def read(self) -> Tuple[Families, Samples]:
+        stored = self.client.hgetall(f"{self.prefix}families")
+        families: Families = {}
+        for name, family in stored.items():
+            kind, documentation = family.decode().split("\n", 1)
+            families[name.decode()] = (kind, documentation)
+        pipeline = self.client.pipeline(transaction=False)
+        for name in families:
+            pipeline.hgetall(f"{self.prefix}{name}")
+        samples = {
+            name: {line.decode(): float(value) for line, value in lines.items()}
+            for name, lines in zip(families, pipeline.execute())
+        }
+        return families, samples
+
+
+@lru_cache(maxsize=None)
+def get_metrics_store():
+    """Return the process-wide metrics store configured in settings."""
+    config = settings.METRICS["STORE"]
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+def _sort_key(line: str) -> Tuple[str, float]:
+    # Keep histogram buckets in ascending order of their bound.
+    head, bound, tail = line.partition('le="')
+    if not bound:
+        return line, 0.0
+    value, _, rest = tail.partition('"')
+    return head + rest, float(value)
+
+
+def format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+def render_metrics() -> str:
+    """All families in the Prometheus text exposition format (0.0.4)."""
+    REGISTRY.flush()
+    families, samples = get_metrics_store().read()
+    output: List[str] = []
+    for name in sorted(families):
+        kind, documentation = families[name]
+        output.append(f"# HELP {name} {documentation}")
+        output.append(f"# TYPE {name} {kind}")
+        lines = samples.get(name, {})
+        for line in sorted(lines, key=_sort_key):
+            output.append(f"{line} {format_value(lines[line])}")
+    return "\n".join(output) + "\n"
+
+
+atexit.register(REGISTRY.flush)
@@ -0,0 +1,281 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import HttpRequest, HttpResponse
+from rest_framework import serializers
+
+from .metrics import REGISTRY, Counter, Histogram
+
+logger = logging.getLogger(__name__)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle a request, by view and action.",
+    ["view", "action"],
+)
+REQUEST_PHASE = Histogram(
+    "http_request_phase_seconds",
+    "Time spent per request in SQL, authentication, serialization and rendering.",
+    ["view", "action", "phase"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_queries",
+    "SQL queries run per request.",
+    ["view", "action"],
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200, 500),
+)
+REQUESTS = Counter(
+    "http_requests_total",
+    "Requests handled, by view, action and status code.",
+    ["view", "action", "status"],
+)
+QUERY_WARNINGS = Counter(
+    "http_request_query_warnings_total",
+    "Requests flagged for repeated (N+1) or slow queries.",
+    ["view", "action", "kind"],
+)
+
+# Order of the phases in the Server-Timing header.
+PHASES = ("sql", "auth", "serialize", "render")
+
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar(
+    "request_metrics", default=None
+)
+
+
+class RequestMetrics:
+    """
+    Measurements of one request. Called from ``record_query`` for each
+    query, it times it and counts repeats of the same SQL text, which is
+    how N+1 patterns show up.
+    """
+
+    def __init__(self) -> None:
+        self.phases: Dict[str, float] = dict.fromkeys(PHASES, 0.0)
+        self.queries = 0
+        self.statements: Dict[str, int] = {}
+        self.slow_queries: List[Tuple[float, str]] = []
+        self.slow_query_seconds = settings.METRICS["SLOW_QUERY_MS"] / 1000
+
+    def __call__(
+        self, execute: Callable, sql: str, params: Any, many: bool, context: Dict
+    ) -> Any:
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - started
+            self.queries += 1
+            self.phases["sql"] += duration
+            self.statements[sql] = self.statements.get(sql, 0) + 1
+            if duration >= self.slow_query_seconds:
+                self.slow_queries.append((duration, sql))
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] += seconds
+
+    def most_repeated(self) -> Tuple[str, int]:
+        return max(self.statements.items(), key=lambda item: item[1])
+
+    def server_timing(self, total: float) -> str:
+        entries = [
+            f"{phase};dur={self.phases[phase] * 1000:.1f}"
+            + (f';desc="{self.queries} queries"' if phase == "sql" else "")
+            for phase in PHASES
+            if phase == "sql" or self.phases[phase]
+        ]
+        entries.append(f"total;dur={total * 1000:.1f}")
+        return ", ".join(entries)
+
+
+@contextmanager
+def request_phase(phase: str) -> Iterator[None]:
+    """Add the time spent in the block to ``phase`` of the current request."""
+    metrics = _current.get()
+    if metrics is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        metrics.add(phase, time.perf_counter() - started)
+
+
+def view_labels(request: HttpRequest) -> Tuple[str, str]:
+    """The URL name and viewset action (or HTTP method) a request resolved to."""
+    match = request.resolver_match
+    method = request.method.lower() if request.method else ""
+    if match is None:
+        return "unmatched", method
+    actions = getattr(match.func, "actions", None) or {}
+    return match.view_name or match.route, actions.get(method, method)
+
+
+def record_query(
+    execute: Callable, sql: str, params: Any, many: bool, context: Dict
+) -> Any:
+    """
+    Execute wrapper installed on every connection. Queries run while a
+    request is being measured are timed by that request's RequestMetrics,
+    including those the async ORM runs in worker threads, which inherit
+    the request's context.
+    """
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    return metrics(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_recorder(connection: Any, **kwargs: Any) -> None:
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class RequestMetricsMiddleware:
+    """
+    Measure every request: its total time, its query count and SQL time,
+    and the time spent in authentication, serialization and rendering.
+
+    The breakdown is returned in a ``Server-Timing`` header and aggregated
+    per view and action into the histograms served at ``/metrics``.
+    Requests repeating one statement METRICS["N_PLUS_ONE_THRESHOLD"] times
+    or more, or running a query slower than METRICS["SLOW_QUERY_MS"], are
+    logged as warnings.
+
+    The middleware runs natively under both WSGI and ASGI, so that it does
+    not force async views back onto a thread.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response: Callable[[HttpRequest], Any]) -> None:
+        if not settings.METRICS["ENABLED"]:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        # Connections opened later get the recorder from connection_created.
+        for opened in connections.all(initialized_only=True):
+            install_query_recorder(opened)
+
+    def __call__(self, request: HttpRequest) -> Any:
+        if self.is_async:
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics, time.perf_counter() - started)
+        REGISTRY.maybe_flush()
+        return response
+
+    async def __acall__(self, request: HttpRequest) -> HttpResponse:
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        started = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self.finish(request, response, metrics, time.perf_counter() - started)
+        if REGISTRY.flush_due():
+            # The store is written over the network: keep it off the event loop.
+            await sync_to_async(REGISTRY.flush, thread_sensitive=False)()
+        return response
+
+    def finish(
+        self,
+        request: HttpRequest,
+        response: HttpResponse,
+        metrics: RequestMetrics,
+        total: float,
+    ) -> None:
+        view, action = view_labels(request)
+        self.record(metrics, total, view, action, response.status_code)
+        if settings.METRICS["SERVER_TIMING"]:
+            response["Server-Timing"] = metrics.server_timing(total)
+
+    def process_template_response(
+        self, request: HttpRequest, response: HttpResponse
+    ) -> HttpResponse:
+        # DRF responses are rendered right after this hook returns.
+        metrics = _current.get()
+        if metrics is not None:
+            started = time.perf_counter()
+            response.add_post_render_callback(
+                lambda _: metrics.add("render", time.perf_counter() - started)
+            )
+        return response
+
+    def record(
+        self,
+        metrics: RequestMetrics,
+        total: float,
+        view: str,
+        action: str,
+        status: int,
+    ) -> None:
+        REQUEST_DURATION.observe(total, view=view, action=action)
+        REQUEST_QUERIES.observe(metrics.queries, view=view, action=action)
+        for phase, seconds in metrics.phases.items():
+            REQUEST_PHASE.observe(seconds, view=view, action=action, phase=phase)
+        REQUESTS.inc(view=view, action=action, status=status)
+
+        threshold = settings.METRICS["N_PLUS_ONE_THRESHOLD"]
+        if metrics.queries >= threshold:
+            sql, count = metrics.most_repeated()
+            if count >= threshold:
+                QUERY_WARNINGS.inc(view=view, action=action, kind="n_plus_one")
+                logger.warning(
+                    "Possible N+1 in %s (%s): statement ran %d times: %.300s",
+                    view,
+                    action,
+                    count,
+                    sql,
+                )
+        for duration, sql in metrics.slow_queries:
+            QUERY_WARNINGS.inc(view=view, action=action, kind="slow_query")
+            logger.warning(
+                "Slow query in %s (%s): %.1f ms: %.300s",
+                view,
+                action,
+                duration * 1000,
+                sql,
+            )
+
+
+class TimedSerializerMixin:
+    """Count the time spent building ``serializer.data`` as serialization."""
+
+    @property
+    def data(self) -> Any:
+        with request_phase("serialize"):
+            return super().data
+
+
+class TimedListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    pass
+
+
+class TimedViewMixin:
+    """Count the time spent authenticating an API request."""
+
+    def perform_authentication(self, request: Any) -> None:
+        with request_phase("auth"):
+            super().perform_authentication(request)
@@ -20,6 +20,7 @@ DJANGO_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
 ]
 
 # Third-party apps
@@ -41,6 +42,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 # Middleware configuration
 MIDDLEWARE = [
+    "backend.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -74,8 +76,43 @@ TEMPLATES = [
 ]
 
 
-# Database configuration
+# Database configuration. By default connections persist for
+# DB_CONN_MAX_AGE seconds and are health-checked before being reused in a
+# new request. A DB_POOL_MAX_SIZE above 0 uses a psycopg 3 pool per process
+# instead, which is what ASGI servers need: their request threads do not
+# live long enough to reuse a persistent connection. The start scripts set
+# the pool size per process type (web, Celery); see .env.sample.
 DATABASES = {"default": env.db("DATABASE_URI")}
+DB_POOL_MAX_SIZE = env.int("DB_POOL_MAX_SIZE", default=0)
+if DB_POOL_MAX_SIZE:
+    # Django checks pooled connections when they are taken from the pool.
+    DATABASES["default"]["CONN_MAX_AGE"] = 0
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": min(env.int("DB_POOL_MIN_SIZE", default=1), DB_POOL_MAX_SIZE),
+        "max_size": DB_POOL_MAX_SIZE,
+        # Seconds a request waits for a free connection before failing.
+        "timeout": env.float("DB_POOL_TIMEOUT", default=10.0),
+        # Idle connections above min_size are closed after this many seconds.
+        "max_idle": env.float("DB_POOL_MAX_IDLE", default=300.0),
+    }
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = env.int("DB_CONN_MAX_AGE", default=60)
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = env.bool(
+        "DB_CONN_HEALTH_CHECKS", default=True
+    )
+
+# Cache configuration: a shared Redis cache plus a small per-process LRU
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": env("CACHE_URL", default="redis://redis:6379/2"),
+    },
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "local-lru",
+        "OPTIONS": {"MAX_ENTRIES": env.int("LOCAL_CACHE_MAX_ENTRIES", default=1000)},
+    },
+}
 
 # Password validation
 AUTH_PASSWORD_VALIDATORS = [
@@ -124,6 +161,57 @@ REST_FRAMEWORK = {
     "PAGE_SIZE": 5,
 }
 
+# Two-tier response cache for item list/retrieve. By default every read
+# checks the invalidation tokens in the shared cache, so a committed write
+# is never served stale. A GENERATION_TIMEOUT above 0 keeps the tokens in
+# each process for that many seconds: local hits then skip the shared
+# cache, but may serve a response up to that long after another process
+# changed its Items.
+ITEMS_RESPONSE_CACHE = {
+    "ENABLED": env.bool("ITEMS_RESPONSE_CACHE_ENABLED", default=True),
+    "TIMEOUT": env.int("ITEMS_RESPONSE_CACHE_TIMEOUT", default=300),
+    "GENERATION_TIMEOUT": env.float(
+        "ITEMS_RESPONSE_CACHE_GENERATION_TIMEOUT", default=0.0
+    ),
+    "LOCAL_ALIAS": "local",
+    "SHARED_ALIAS": "default",
+}
+
+# Request metrics (backend.middleware), served in Prometheus format at
+# /metrics. Samples are buffered per process and added to the shared store
+# every FLUSH_INTERVAL seconds. Requests running one statement
+# N_PLUS_ONE_THRESHOLD times, or a query slower than SLOW_QUERY_MS, are
+# logged. When TOKEN is set, /metrics requires "Authorization: Bearer";
+# without one it is only served when DEBUG is on.
+METRICS = {
+    "ENABLED": env.bool("METRICS_ENABLED", default=True),
+    "STORE": {
+        "BACKEND": "backend.metrics.RedisMetricsStore",
+        "OPTIONS": {"url": env("METRICS_REDIS_URL", default="redis://redis:6379/3")},
+    },
+    "FLUSH_INTERVAL": env.float("METRICS_FLUSH_INTERVAL", default=5.0),
+    "SERVER_TIMING": env.bool("METRICS_SERVER_TIMING", default=True),
+    "SLOW_QUERY_MS": env.float("METRICS_SLOW_QUERY_MS", default=200.0),
+    "N_PLUS_ONE_THRESHOLD": env.int("METRICS_N_PLUS_ONE_THRESHOLD", default=10),
+    "TOKEN": env("METRICS_TOKEN", default=None),
+}
+
+# Keyset pagination for items (opt in with ?pagination=cursor)
+ITEMS_CURSOR_PAGE_SIZE = env.int("ITEMS_CURSOR_PAGE_SIZE", default=100)
+ITEMS_CURSOR_MAX_PAGE_SIZE = env.int("ITEMS_CURSOR_MAX_PAGE_SIZE", default=1000)
+
+# Serve item list/retrieve from .values() rows instead of model instances.
+ITEMS_FAST_READ_SERIALIZATION = env.bool("ITEMS_FAST_READ_SERIALIZATION", default=True)
+
+# Rows fetched per server-side cursor round trip by the streaming export.
+ITEMS_EXPORT_CHUNK_SIZE = env.int("ITEMS_EXPORT_CHUNK_SIZE", default=2000)
+
+# Rows validated and COPYed per transaction by the bulk import.
+ITEMS_IMPORT_BATCH_SIZE = env.int("ITEMS_IMPORT_BATCH_SIZE", default=5000)
+
+# Largest number of entries accepted by one bulk create/update/delete.
+ITEMS_BULK_MAX_ITEMS = env.int("ITEMS_BULK_MAX_ITEMS", default=1000)
+
 # Spectacular settings for API schema generation
 SPECTACULAR_SETTINGS = {
     "TITLE": "Djaqngo REST API",
@@ -142,3 +230,76 @@ CELERY_RESULT_BACKEND = env("CELERY_RESULT_BACKEND")
 CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_BEAT_SCHEDULER = "django_celery_beat.schedulers:DatabaseScheduler"
+# Queues, routes and acks are set in backend/celery.py. Unacknowledged
+# (acks_late) messages are redelivered after the visibility timeout, so it
+# must exceed the longest bulk task.
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    "visibility_timeout": env.int("CELERY_VISIBILITY_TIMEOUT", default=2 * 60 * 60)
+}
+# Redeliver acks_late tasks running when the broker connection drops.
+CELERY_WORKER_CANCEL_LONG_RUNNING_TASKS_ON_CONNECTION_LOSS = True
+
+# External price sync
+ITEMS_PRICE_SYNC_BATCH_SIZE = env.int("ITEMS_PRICE_SYNC_BATCH_SIZE", default=500)
+ITEMS_PRICE_SYNC_IN_DATABASE = env.bool("ITEMS_PRICE_SYNC_IN_DATABASE", default=False)
+# Stale Items per shard of the hourly sync, widened to at most
+# ITEMS_PRICE_SYNC_MAX_PARALLEL_SHARDS shards.
+ITEMS_PRICE_SYNC_SHARD_SIZE = env.int("ITEMS_PRICE_SYNC_SHARD_SIZE", default=100_000)
+ITEMS_PRICE_SYNC_MAX_PARALLEL_SHARDS = env.int(
+    "ITEMS_PRICE_SYNC_MAX_PARALLEL_SHARDS", default=16
+)
+ITEMS_PRICE_SYNC_MAX_ATTEMPTS = env.int("ITEMS_PRICE_SYNC_MAX_ATTEMPTS", default=3)
+# Seconds after which a synced external_price is considered stale.
+ITEMS_PRICE_SYNC_TTL = env.int("ITEMS_PRICE_SYNC_TTL", default=24 * 60 * 60)
+# Daily partitions of the external price history: kept for RETENTION_DAYS
+# and created PRECREATE_DAYS in advance by the daily maintenance task.
+ITEMS_PRICE_HISTORY_RETENTION_DAYS = env.int(
+    "ITEMS_PRICE_HISTORY_RETENTION_DAYS", default=90
+)
+ITEMS_PRICE_HISTORY_PRECREATE_DAYS = env.int(
+    "ITEMS_PRICE_HISTORY_PRECREATE_DAYS", default=7
+)
+# Edges of the price drift histogram buckets. The summary is rebuilt with
+# new edges by the daily rebuild task (or rebuild_price_drift_summary).
+ITEMS_PRICE_DRIFT_BUCKETS = env.json(
+    "ITEMS_PRICE_DRIFT_BUCKETS", default=[-100, -10, -1, 0, 1, 10, 100]
+)
+# Expiry in seconds of the locks deduplicating syncs of one Item and of
+# the whole table; they bound how long a crashed run blocks new ones.
+ITEMS_PRICE_SYNC_ITEM_LOCK_TIMEOUT = env.int(
+    "ITEMS_PRICE_SYNC_ITEM_LOCK_TIMEOUT", default=10 * 60
+)
+ITEMS_PRICE_SYNC_FULL_LOCK_TIMEOUT = env.int(
+    "ITEMS_PRICE_SYNC_FULL_LOCK_TIMEOUT", default=2 * 60 * 60
+)
+# Minimum seconds between PROGRESS states published by a sync task.
+ITEMS_TASK_PROGRESS_INTERVAL = env.float("ITEMS_TASK_PROGRESS_INTERVAL", default=2.0)
+# Largest number of task IDs accepted by one batch status request.
+ITEMS_TASK_STATUS_MAX_IDS = env.int("ITEMS_TASK_STATUS_MAX_IDS", default=1000)
+# Max number of created Item IDs per batched sync task dispatched on commit
+ITEMS_PRICE_SYNC_DISPATCH_BATCH_SIZE = env.int(
+    "ITEMS_PRICE_SYNC_DISPATCH_BATCH_SIZE", default=500
+)
+
+# External price provider: dotted path to a items.utils.price_providers class
+# and its constructor options. The default simulates a batch API with
+# 0.1-0.5 s of latency per request.
+ITEMS_PRICE_PROVIDER = {
+    "BACKEND": env(
+        "ITEMS_PRICE_PROVIDER",
+        default="items.utils.price_providers.SimulatedPriceProvider",
+    ),
+    "OPTIONS": env.json(
+        "ITEMS_PRICE_PROVIDER_OPTIONS",
+        default={"min_latency": 0.1, "max_latency": 0.5, "max_batch_size": 100},
+    ),
+}
+ITEMS_PRICE_CLIENT = {
+    "MAX_IN_FLIGHT": env.int("ITEMS_PRICE_CLIENT_MAX_IN_FLIGHT", default=8),
+    # Requests per second per upstream host, per worker process: each
+    # process has its own token bucket, so a host may see this rate times
+    # the number of processes. Unset means unlimited.
+    "RATE_LIMIT": env.float("ITEMS_PRICE_CLIENT_RATE_LIMIT", default=None),
+    "FAILURE_THRESHOLD": env.int("ITEMS_PRICE_CLIENT_FAILURE_THRESHOLD", default=5),
+    "RESET_TIMEOUT": env.float("ITEMS_PRICE_CLIENT_RESET_TIMEOUT", default=30.0),
+}
@@ -1,3 +1,22 @@
 from backend.settings import *  # noqa: F401,F403,F405
 
 DATABASES = {"default": env.db("DATABASE_URI")}
+
+# Tests run without Redis; both cache tiers are process-local.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-shared",
+    },
+    "local": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "test-local",
+    },
+}
+
+# Metrics stay in-process and are flushed after every request.
+METRICS = {
+    **METRICS,
+    "STORE": {"BACKEND": "backend.metrics.LocalMetricsStore"},
+    "FLUSH_INTERVAL": 0,
+}
@@ -3,6 +3,8 @@ from django.urls import include, path
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 
+from . import views
+
 urlpatterns = [
     path("admin/", admin.site.urls),
     # JWT endpoints (can remain unversioned or be versioned — up to you)
@@ -11,6 +13,8 @@ urlpatterns = [
     # API schema & docs
     path("schema/", SpectacularAPIView.as_view(), name="schema"),
     path("docs/", SpectacularSwaggerView.as_view(url_name="schema"), name="swagger-ui"),
+    # Prometheus metrics
+    path("metrics", views.metrics, name="metrics"),
     # Versioned API entrypoint
     path(
         "api/v1/",
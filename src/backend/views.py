@@ -0,0 +1,22 @@
+from django.conf import settings
+from django.http import Http404, HttpRequest, HttpResponse
+from django.utils.crypto import constant_time_compare
+
+from .metrics import render_metrics
+
+
+def metrics(request: HttpRequest) -> HttpResponse:
+    """
+    Request and task metrics in the Prometheus text format. Without a
+    METRICS["TOKEN"] the endpoint is only served when DEBUG is on.
+    """
+    token = settings.METRICS["TOKEN"]
+    if not settings.METRICS["ENABLED"] or not (token or settings.DEBUG):
+        raise Http404
+    if token and not constant_time_compare(
+        request.headers.get("Authorization", ""), f"Bearer {token}"
+    ):
+        return HttpResponse(status=401)
+    return HttpResponse(
+        render_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8"
+    )
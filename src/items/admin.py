@@ -1,7 +1,9 @@
+from django.conf import settings
 from django.contrib import admin, messages
 
 from .models import Item
 from .tasks import hourly_external_price_sync
+from .utils.sync_locks import FULL_SYNC_LOCK, dispatch_once
 
 
 @admin.register(Item)
@@ -11,9 +13,13 @@ class ItemAdmin(admin.ModelAdmin):
 
     @admin.action(description="Run external price sync task (now)")
     def run_external_price_sync(self, request, queryset):
-        hourly_external_price_sync.delay()
-        self.message_user(
-            request,
-            "External price sync task has been triggered.",
-            messages.SUCCESS,
+        task_id, sent = dispatch_once(
+            hourly_external_price_sync,
+            FULL_SYNC_LOCK,
+            settings.ITEMS_PRICE_SYNC_FULL_LOCK_TIMEOUT,
         )
+        if sent:
+            message = "External price sync task has been triggered."
+        else:
+            message = f"External price sync task {task_id} is already running."
+        self.message_user(request, message, messages.SUCCESS)
@@ -6,4 +6,4 @@ class ItemsConfig(AppConfig):
     name = "items"
 
     def ready(self):
-        pass
+        from . import signals  # noqa: F401
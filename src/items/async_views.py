@@ -0,0 +1,116 @@
+from typing import Any, Callable, Coroutine
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.http import Http404, HttpRequest, HttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.response import Response
+
+from backend.middleware import request_phase
+
+from . import cache
+from .views import ItemViewSet
+
+Handler = Callable[[ItemViewSet], Coroutine[Any, Any, Any]]
+
+
+async def list_items(view: ItemViewSet) -> Any:
+    """The payload of ItemViewSet.list, read with the async ORM."""
+    queryset = view.filter_queryset(view.get_queryset())
+    page = await view.paginator.apaginate_queryset(queryset, view.request, view=view)
+    if page is None:
+        rows = [row async for row in queryset.aiterator()]
+        return view.get_serializer(rows, many=True).data
+    data = view.get_serializer(page, many=True).data
+    return view.get_paginated_response(data).data
+
+
+async def retrieve_item(view: ItemViewSet) -> Any:
+    """The payload of ItemViewSet.retrieve, read with the async ORM."""
+    queryset = view.filter_queryset(view.get_queryset())
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    lookup = {view.lookup_field: view.kwargs[lookup_url_kwarg]}
+    try:
+        instance = await queryset.aget(**lookup)
+    except (queryset.model.DoesNotExist, TypeError, ValueError, ValidationError):
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+    view.check_object_permissions(view.request, instance)
+    return view.get_serializer(instance).data
+
+
+async def cached_payload(view: ItemViewSet, compute: Handler) -> Any:
+    """Run ``compute``, through the response cache when it is enabled."""
+    if not settings.ITEMS_RESPONSE_CACHE["ENABLED"]:
+        return await compute(view)
+    if view.action == "list":
+        return await cache.aget_or_compute(
+            lambda: cache.list_cache_key(view.request, view), lambda: compute(view)
+        )
+    return await cache.aget_or_compute(
+        lambda: cache.detail_cache_key(view.request, view),
+        lambda: compute(view),
+    )
+
+
+async def render(response: Response) -> HttpResponse:
+    """
+    Render a finalized DRF response into a plain HttpResponse. Django would
+    otherwise render it in a worker thread, even when already rendered.
+    """
+    with request_phase("render"):
+        if isinstance(response.accepted_renderer, JSONRenderer):
+            response.render()
+        else:
+            # The browsable API may query the database while rendering.
+            await sync_to_async(response.render)()
+    rendered = HttpResponse(response.content, status=response.status_code)
+    for header, value in response.items():
+        rendered[header] = value
+    return rendered
+
+
+def item_read_view(action: str, compute: Handler) -> Callable:
+    """
+    Async view serving ItemViewSet ``action`` under ASGI.
+
+    An ItemViewSet instance does everything that needs no I/O (filters,
+    search, ordering, pagination and serializers) exactly as for the sync
+    endpoints. Authentication, permission and throttle checks may query
+    the database, and run in a worker thread; the item reads use the async
+    ORM. Django still runs each query in a thread of its own, but reading
+    the request and writing the response happen on the event loop, so
+    slow clients hold no worker.
+    """
+
+    async def view(request: HttpRequest, **kwargs: Any) -> HttpResponse:
+        viewset = ItemViewSet()
+        viewset.action_map = {"get": action, "head": action}
+        for method in viewset.action_map:
+            # Only read to build the Allow header.
+            setattr(viewset, method, getattr(viewset, action))
+        viewset.args, viewset.kwargs = (), kwargs
+        drf_request: Request = viewset.initialize_request(request, **kwargs)
+        viewset.request = drf_request
+        viewset.headers = viewset.default_response_headers
+
+        try:
+            if viewset.action is None:
+                viewset.http_method_not_allowed(drf_request)
+            await sync_to_async(viewset.initial)(drf_request, **kwargs)
+            response = Response(await cached_payload(viewset, compute))
+        except Exception as exc:
+            response = viewset.handle_exception(exc)
+        response = viewset.finalize_response(drf_request, response, **kwargs)
+        return await render(response)
+
+    view = csrf_exempt(view)
+    # Read by the request metrics to label the action.
+    view.actions = {"get": action}
+    return view
+
+
+item_list = item_read_view("list", list_items)
+item_detail = item_read_view("retrieve", retrieve_item)
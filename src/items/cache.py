@@ -0,0 +1,240 @@
+import hashlib
+import threading
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.http import Http404
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from .models import Item
+from .pagination import ItemKeysetPagination
+from .utils.on_commit import OnCommitBuffer
+
+# Generation tokens. Cached responses embed the tokens they were computed
+# under in their key, so replacing a token invalidates every response that
+# depends on it, in both tiers and in every process. Any write to an Item
+# replaces LIST_GENERATION: it may move Items across any filtered, searched
+# or ordered page, so every cached list is dropped, while detail entries
+# are invalidated per Item.
+ALL_ITEMS_GENERATION = "items:generation:all"
+LIST_GENERATION = "items:generation:list"
+ITEM_GENERATION = "items:generation:item:{}"
+
+PAGINATION_PARAMS = (
+    "page",
+    ItemKeysetPagination.page_size_query_param,
+    ItemKeysetPagination.cursor_query_param,
+    "pagination",
+)
+
+
+class CacheStats:
+    """Thread-safe per-process hit/miss counters for the response cache."""
+
+    fields = ("local_hits", "shared_hits", "misses")
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.counts = dict.fromkeys(self.fields, 0)
+
+    def incr(self, field: str) -> None:
+        with self.lock:
+            self.counts[field] += 1
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.lock:
+            return dict(self.counts)
+
+    def reset(self) -> None:
+        with self.lock:
+            self.counts = dict.fromkeys(self.fields, 0)
+
+
+stats = CacheStats()
+
+
+def local_cache():
+    return caches[settings.ITEMS_RESPONSE_CACHE["LOCAL_ALIAS"]]
+
+
+def shared_cache():
+    return caches[settings.ITEMS_RESPONSE_CACHE["SHARED_ALIAS"]]
+
+
+def get_generations(keys: List[str]) -> List[str]:
+    """
+    Return the current token for each generation key.
+
+    When GENERATION_TIMEOUT is set, tokens are copied to the local cache
+    for that many seconds, so a response served from the local tier costs
+    no shared cache round trip. In exchange, a write made by another
+    process reaches this one's cached responses up to GENERATION_TIMEOUT
+    seconds late; writes made by this process are seen at once. Tokens not
+    held locally are read from the shared cache in one round trip. Missing
+    tokens (never set, or evicted) are created with a fresh random value,
+    so an evicted token can never resurrect older cached responses.
+    """
+    copy_timeout = settings.ITEMS_RESPONSE_CACHE["GENERATION_TIMEOUT"]
+    tokens = local_cache().get_many(keys) if copy_timeout else {}
+    missing = [key for key in keys if key not in tokens]
+    if missing:
+        cache = shared_cache()
+        fetched = cache.get_many(missing)
+        for key in missing:
+            if key not in fetched:
+                cache.add(
+                    key, uuid.uuid4().hex, settings.ITEMS_RESPONSE_CACHE["TIMEOUT"]
+                )
+                fetched[key] = cache.get(key)
+        if copy_timeout:
+            local_cache().set_many(fetched, copy_timeout)
+        tokens.update(fetched)
+    return [tokens[key] for key in keys]
+
+
+def build_key(kind: str, generations: List[str], parts: Iterable[Any]) -> str:
+    digest = hashlib.sha1(repr((generations, list(parts))).encode()).hexdigest()
+    return f"items:response:{kind}:{digest}"
+
+
+def query_params_key(request: Request, view: Any) -> List[Tuple[str, str]]:
+    """
+    The query parameters that affect a response (filters, search, ordering,
+    pagination), sorted, so unrelated parameters share a cache entry.
+    """
+    names = {api_settings.SEARCH_PARAM, api_settings.ORDERING_PARAM}
+    names.update(PAGINATION_PARAMS)
+    for backend in view.filter_backends:
+        if hasattr(backend, "get_filterset_class"):
+            filterset_class = backend().get_filterset_class(view, view.queryset)
+            if filterset_class is not None:
+                names.update(filterset_class.base_filters)
+
+    return sorted(
+        (name, value) for name in names for value in request.query_params.getlist(name)
+    )
+
+
+def list_cache_key(request: Request, view: Any) -> str:
+    """
+    Cache key for a list request. It covers the query parameters that affect
+    the result plus the host and path, which appear in pagination links.
+    """
+    params = query_params_key(request, view)
+    generations = get_generations([ALL_ITEMS_GENERATION, LIST_GENERATION])
+    return build_key("list", generations, [request.get_host(), request.path, params])
+
+
+def detail_cache_key(request: Request, view: Any) -> str:
+    """
+    Cache key for a single item. It uses the resolved ID, so every spelling
+    of it in the URL shares the entry its writes invalidate, and the filter
+    and search parameters, which may exclude the item. Raises Http404 for
+    IDs that cannot match an item.
+    """
+    try:
+        item_id = int(view.kwargs[view.lookup_url_kwarg or view.lookup_field])
+    except ValueError:
+        raise Http404(f"No {Item._meta.object_name} matches the given query.")
+    params = query_params_key(request, view)
+    generations = get_generations(
+        [ALL_ITEMS_GENERATION, ITEM_GENERATION.format(item_id)]
+    )
+    return build_key("detail", generations, [item_id, params])
+
+
+def get_or_compute(key: str, compute: Callable[[], Optional[Any]]) -> Any:
+    """
+    Look a response payload up in the local LRU, then in the shared cache,
+    and compute it on a miss. ``compute`` returns None for uncacheable results.
+    """
+    data = lookup(key)
+    if data is None:
+        data = compute()
+        store(key, data)
+    return data
+
+
+async def aget_or_compute(
+    make_key: Callable[[], str], compute: Callable[[], Awaitable[Optional[Any]]]
+) -> Any:
+    """
+    ``get_or_compute`` for async views. The key is built (which reads the
+    generation tokens) and both tiers are looked up in one trip to a worker
+    thread, as is the write after a miss; ``compute`` runs on the event loop.
+    """
+
+    def lookup_key() -> Tuple[str, Any]:
+        key = make_key()
+        return key, lookup(key)
+
+    key, data = await sync_to_async(lookup_key)()
+    if data is None:
+        data = await compute()
+        await sync_to_async(store)(key, data)
+    return data
+
+
+def lookup(key: str) -> Any:
+    """Return the cached payload for ``key`` from either tier, or None."""
+    local = local_cache()
+    data = local.get(key)
+    if data is not None:
+        stats.incr("local_hits")
+        return data
+
+    data = shared_cache().get(key)
+    if data is not None:
+        stats.incr("shared_hits")
+        local.set(key, data, settings.ITEMS_RESPONSE_CACHE["TIMEOUT"])
+        return data
+
+    stats.incr("misses")
+    return None
+
+
+def store(key: str, data: Optional[Any]) -> None:
+    """Cache a computed payload in both tiers, unless it is None."""
+    if data is not None:
+        timeout = settings.ITEMS_RESPONSE_CACHE["TIMEOUT"]
+        shared_cache().set(key, data, timeout)
+        local_cache().set(key, data, timeout)
+
+
+def _bump(keys: List[str]) -> None:
+    # Tokens only need to outlive the responses keyed on them; an expired
+    # token is replaced by a fresh one, which merely causes misses.
+    tokens = {key: uuid.uuid4().hex for key in keys}
+    shared_cache().set_many(tokens, settings.ITEMS_RESPONSE_CACHE["TIMEOUT"])
+    copy_timeout = settings.ITEMS_RESPONSE_CACHE["GENERATION_TIMEOUT"]
+    if copy_timeout:
+        local_cache().set_many(tokens, copy_timeout)
+
+
+class CacheInvalidationBuffer(OnCommitBuffer):
+    """Invalidates cached lists and the collected Items' details on commit."""
+
+    def flush(self, item_ids: List[int]) -> None:
+        _bump([LIST_GENERATION] + [ITEM_GENERATION.format(pk) for pk in item_ids])
+
+
+def invalidate_items(item_ids: Iterable[int], using: Optional[str] = None) -> None:
+    """
+    Invalidate cached lists and the detail entries of the given Items once
+    the current transaction commits. Calls within one transaction are
+    coalesced into a single round trip to the shared cache.
+    """
+    CacheInvalidationBuffer.add(item_ids, using=using)
+
+
+def invalidate_all_items(using: Optional[str] = None) -> None:
+    """
+    Invalidate every cached item response, for set-based writes whose
+    affected IDs are not known.
+    """
+    transaction.on_commit(lambda: _bump([ALL_ITEMS_GENERATION]), using=using)
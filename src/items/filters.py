@@ -0,0 +1,73 @@
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    TrigramWordSimilarity,
+)
+from django.db.models import F, Q, QuerySet
+from django.db.models.functions import Upper
+from django_filters import rest_framework as filters
+from rest_framework.filters import SearchFilter
+from rest_framework.request import Request
+
+from .models import Item
+
+
+class ItemFilter(filters.FilterSet):
+    """
+    Range filters on Item, e.g. ``?price__gte=10&created_at__lt=2025-01-01``
+    or ``?id__in=1,2,3``. Every filtered column has a ``(column, id)`` index
+    that also serves keyset ordering on it.
+    """
+
+    class Meta:
+        """Meta options for the ItemFilter."""
+
+        model = Item
+        fields = {
+            "id": ["in"],
+            "price": ["exact", "gte", "lte"],
+            "external_price": ["gte", "lte"],
+            "created_at": ["gte", "lt"],
+            "updated_at": ["gte", "lt"],
+        }
+
+
+class ItemSearchFilter(SearchFilter):
+    """
+    Postgres search over the Item ``search_vector`` column.
+
+    Matches are the union of a full-text ``websearch`` query on the GIN
+    indexed tsvector and trigram matching on ``name``/``description``
+    (fuzzy word similarity plus substring ILIKE), both served by GIN
+    indexes. Results are ordered by relevance unless an explicit
+    ``ordering`` is requested. Substring matching needs at least three
+    characters to use the trigram index, so it is skipped for shorter terms.
+    """
+
+    search_config = "english"
+    min_substring_length = 3
+
+    def filter_queryset(self, request: Request, queryset: QuerySet, view) -> QuerySet:
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+
+        search = " ".join(terms)
+        query = SearchQuery(search, search_type="websearch", config=self.search_config)
+
+        # Trigram indexes are built on UPPER(column), which is also what
+        # Django's icontains lookup compares against.
+        condition = Q(search_vector=query) | Q(upper_name__trigram_word_similar=search)
+        for term in terms:
+            if len(term) >= self.min_substring_length:
+                condition |= Q(name__icontains=term) | Q(description__icontains=term)
+
+        return (
+            queryset.alias(upper_name=Upper("name"))
+            .filter(condition)
+            .annotate(
+                search_rank=SearchRank(F("search_vector"), query)
+                + TrigramWordSimilarity(search, "name")
+            )
+            .order_by("-search_rank", "-pk")
+        )
@@ -0,0 +1,114 @@
+import json
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from items.utils.benchmarks import (
+    BENCHMARKS,
+    compare_results,
+    describe_environment,
+    run_benchmarks,
+    seed_items,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the item API, serializers and price sync at growing table "
+        "sizes, seeding items with generate_items as needed. The price sync "
+        "benchmarks run in a transaction that is rolled back. Results can be "
+        "saved as a JSON baseline and compared against an earlier one."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=[10_000],
+            help="Table sizes to benchmark, e.g. 10000 100000 1000000",
+        )
+        parser.add_argument("--repeat", type=int, default=20)
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            choices=list(BENCHMARKS),
+            help="Benchmarks to run (all by default)",
+        )
+        parser.add_argument(
+            "--with_cache",
+            action="store_true",
+            help="Leave the response cache enabled for the API benchmarks",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Generator processes used to seed items",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--output", help="Write the results to this JSON file")
+        parser.add_argument(
+            "--compare", help="Baseline JSON file to check the results against"
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.2,
+            help="Relative slowdown beyond which a metric counts as a regression",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            with open(options["compare"]) as file:
+                baseline = json.load(file)
+
+        results = {"environment": describe_environment(), "sizes": {}}
+        for size in sorted(options["sizes"]):
+            count = seed_items(size, workers=options["workers"], seed=options["seed"])
+            if count != size:
+                self.stderr.write(
+                    self.style.WARNING(
+                        f"The table already holds {count:,} items; "
+                        f"skipping size {size:,}."
+                    )
+                )
+                continue
+
+            self.stdout.write(f"Benchmarking {size:,} items...")
+            results["sizes"][str(size)] = run_benchmarks(
+                options["repeat"], options["only"], options["with_cache"]
+            )
+            for name, metrics in results["sizes"][str(size)].items():
+                values = ", ".join(f"{key}={value}" for key, value in metrics.items())
+                self.stdout.write(f"  {name:<18} {values}")
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
+
+        if baseline is None:
+            return
+
+        regressions = compare_results(baseline, results, options["threshold"])
+        for regression in regressions:
+            self.stdout.write(
+                self.style.ERROR(
+                    f"  {regression['size']} {regression['benchmark']} "
+                    f"{regression['metric']}: {regression['baseline']} -> "
+                    f"{regression['current']} ({regression['change']:+.1%})"
+                )
+            )
+        if regressions:
+            raise CommandError(
+                f"{len(regressions)} metrics regressed by more than "
+                f"{options['threshold']:.0%}."
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"No regressions beyond {options['threshold']:.0%} "
+                f"against {options['compare']}."
+            )
+        )
@@ -0,0 +1,41 @@
+import json
+
+from django.core.management.base import BaseCommand
+
+from items.utils.benchmarks import (
+    CONNECTION_MODES,
+    describe_environment,
+    run_connection_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the database connection overhead per request with a new "
+        "connection per request, persistent connections and a psycopg 3 "
+        "connection pool, against the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--repeat", type=int, default=200)
+        parser.add_argument(
+            "--modes",
+            nargs="+",
+            choices=list(CONNECTION_MODES),
+            help="Connection modes to compare (all by default)",
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        results = {
+            "environment": describe_environment(),
+            "modes": run_connection_benchmarks(options["repeat"], options["modes"]),
+        }
+        for mode, metrics in results["modes"].items():
+            values = ", ".join(f"{key}={value}" for key, value in metrics.items())
+            self.stdout.write(f"  {mode:<12} {values}")
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
@@ -0,0 +1,60 @@
+import time
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+
+from items.models import Item
+from items.utils.price_client import PriceClient
+from items.utils.price_providers import SimulatedPriceProvider
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure external price client throughput offline against the "
+        "simulated provider. No database access is required."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--items", type=int, default=10000)
+        parser.add_argument("--batch_size", type=int, default=100)
+        parser.add_argument("--max_in_flight", type=int, default=8)
+        parser.add_argument(
+            "--latency",
+            type=float,
+            default=0.05,
+            help="Simulated seconds per provider request",
+        )
+        parser.add_argument(
+            "--rate_limit",
+            type=float,
+            help="Requests per second allowed to the simulated host",
+        )
+
+    def handle(self, *args, **options):
+        provider = SimulatedPriceProvider(
+            min_latency=options["latency"],
+            max_latency=options["latency"],
+            max_batch_size=options["batch_size"],
+            host=f"benchmark-{time.monotonic_ns()}",
+        )
+        client = PriceClient(
+            provider,
+            max_in_flight=options["max_in_flight"],
+            rate_limit=options["rate_limit"],
+        )
+        items = [
+            Item(pk=pk, price=Decimal("100.00"))
+            for pk in range(1, options["items"] + 1)
+        ]
+
+        started = time.perf_counter()
+        prices = client.fetch_prices(items)
+        elapsed = time.perf_counter() - started
+        client.close()
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Fetched {len(prices)} prices in {elapsed:.2f}s "
+                f"({len(prices) / elapsed:.0f} items/s)."
+            )
+        )
@@ -0,0 +1,58 @@
+import time
+from typing import Callable
+
+from django.core.management.base import BaseCommand
+from rest_framework.renderers import JSONRenderer
+
+from items.models import Item
+from items.serializers import ItemRowSerializer, ItemSerializer
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare ItemSerializer against the .values() based ItemRowSerializer "
+        "on a page of existing items (query + serialization + JSON rendering)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=500)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        rows, repeat = options["rows"], options["repeat"]
+        queryset = Item.objects.defer("search_vector").order_by("-created_at")
+        renderer = JSONRenderer()
+
+        def model_path() -> bytes:
+            page = list(queryset[:rows])
+            return renderer.render(ItemSerializer(page, many=True).data)
+
+        def row_path() -> bytes:
+            page = list(queryset.values(*ItemRowSerializer.value_fields())[:rows])
+            return renderer.render(ItemRowSerializer(page, many=True).data)
+
+        if model_path() != row_path():
+            self.stderr.write(self.style.ERROR("Outputs differ."))
+            return
+
+        count = queryset[:rows].count()
+        model_time = self.measure(model_path, repeat)
+        row_time = self.measure(row_path, repeat)
+
+        self.stdout.write(f"Rows per page: {count}, repeats: {repeat}")
+        self.stdout.write(f"ItemSerializer:    {model_time * 1000:8.2f} ms/page")
+        self.stdout.write(f"ItemRowSerializer: {row_time * 1000:8.2f} ms/page")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Speedup: {model_time / row_time:.2f}x, output identical."
+            )
+        )
+
+    @staticmethod
+    def measure(path: Callable[[], bytes], repeat: int) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            path()
+            best = min(best, time.perf_counter() - started)
+        return best
@@ -0,0 +1,108 @@
+import asyncio
+import json
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from items.models import Item
+from items.utils.load_test import run_load
+
+# URL names of the sync (WSGI) and async (ASGI) endpoint of each scenario.
+SCENARIOS = {
+    "list": ("item-list", "item-async-list"),
+    "retrieve": ("item-detail", "item-async-detail"),
+    "search": ("item-list", "item-async-list"),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Load test the item read endpoints served by a WSGI server against "
+        "the async endpoints served by an ASGI server, at growing numbers "
+        "of concurrent clients. Both servers must already be running."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--wsgi", default="http://localhost:8000", help="WSGI server base URL"
+        )
+        parser.add_argument(
+            "--asgi", default="http://localhost:8001", help="ASGI server base URL"
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            nargs="+",
+            default=[1, 10, 50, 200],
+            help="Concurrent clients per run",
+        )
+        parser.add_argument(
+            "--duration", type=float, default=10.0, help="Seconds per run"
+        )
+        parser.add_argument(
+            "--scenarios",
+            nargs="+",
+            choices=list(SCENARIOS),
+            default=list(SCENARIOS),
+        )
+        parser.add_argument(
+            "--slow_clients",
+            type=int,
+            default=0,
+            help="Extra connections sending their request one byte at a time",
+        )
+        parser.add_argument(
+            "--username", required=True, help="User the requests authenticate as"
+        )
+        parser.add_argument("--output", help="Write the results to this JSON file")
+
+    def handle(self, *args, **options):
+        try:
+            user = User.objects.get(username=options["username"])
+        except User.DoesNotExist:
+            raise CommandError(f"User {options['username']!r} does not exist.")
+        token = str(RefreshToken.for_user(user).access_token)
+
+        ids = list(Item.objects.order_by("?").values_list("pk", flat=True)[:100])
+        if not ids:
+            raise CommandError("The Item table is empty; seed it with generate_items.")
+        term = Item.objects.filter(pk=ids[0]).values_list("name", flat=True).get()
+
+        results = {}
+        for scenario in options["scenarios"]:
+            results[scenario] = {}
+            for server, url_name in zip(("wsgi", "asgi"), SCENARIOS[scenario]):
+                if scenario == "retrieve":
+                    paths = [reverse(url_name, args=[pk]) for pk in ids]
+                elif scenario == "search":
+                    paths = [f"{reverse(url_name)}?{urlencode({'search': term})}"]
+                else:
+                    paths = [reverse(url_name)]
+
+                results[scenario][server] = {}
+                for concurrency in sorted(options["concurrency"]):
+                    result = asyncio.run(
+                        run_load(
+                            options[server],
+                            paths,
+                            concurrency,
+                            options["duration"],
+                            token,
+                            options["slow_clients"],
+                        )
+                    )
+                    results[scenario][server][str(concurrency)] = result
+                    values = ", ".join(
+                        f"{key}={value}" for key, value in result.items()
+                    )
+                    self.stdout.write(
+                        f"  {scenario:<9} {server} c={concurrency:<4} {values}"
+                    )
+
+        if options["output"]:
+            with open(options["output"], "w") as file:
+                json.dump(results, file, indent=2)
+            self.stdout.write(f"Results written to {options['output']}.")
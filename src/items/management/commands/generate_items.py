@@ -1,36 +1,72 @@
-import random
+import os
+import time
 
 from django.core.management.base import BaseCommand
-from faker import Faker
 
-from items.models import Item
-
-fake = Faker()
+from items.utils.item_generator import CREATED_AT_DISTRIBUTIONS, generate_items
 
 
 class Command(BaseCommand):
-    help = "Generate 100,000 fake items for testing"
-
-    def handle(self, *args, **kwargs):
-        self.stdout.write("Generating 100,000 fake items...")
+    help = (
+        "Generate fake items for testing, in parallel worker processes that "
+        "stream batches to Postgres with COPY."
+    )
 
-        items = []
+    def add_arguments(self, parser):
+        parser.add_argument("--count", type=int, default=100_000)
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            default=10_000,
+            help="Rows generated and COPYed per transaction",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of generator processes",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            help="Seed for reproducible data (with the same batch size)",
+        )
+        parser.add_argument(
+            "--distribution",
+            choices=sorted(CREATED_AT_DISTRIBUTIONS),
+            default="uniform",
+            help="Distribution of created_at over the time window",
+        )
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=730,
+            help="Length of the created_at window, ending now",
+        )
 
-        for _ in range(100000):
-            created_at = fake.date_time_between(start_date="-2y", end_date="now")
-            item = Item(
-                name=fake.word().capitalize(),
-                description=fake.sentence(),
-                price=round(random.uniform(1.0, 1000.0), 2),
-                created_at=created_at,
-                updated_at=created_at,
-            )
-            items.append(item)
+    def handle(self, *args, **options):
+        count = options["count"]
+        self.stdout.write(
+            f"Generating {count:,} fake items with {options['workers']} workers..."
+        )
 
-        Item.objects.bulk_create(items, batch_size=1000)
+        started = time.perf_counter()
+        written = 0
+        for rows in generate_items(
+            count,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            seed=options["seed"],
+            distribution=options["distribution"],
+            days=options["days"],
+        ):
+            written += rows
+            self.stdout.write(f"  {written:,}/{count:,} items", ending="\r")
+        elapsed = time.perf_counter() - started
 
         self.stdout.write(
             self.style.SUCCESS(
-                "Successfully created 100,000 items with random timestamps"
+                f"Successfully created {written:,} items in {elapsed:.1f}s "
+                f"({written / max(elapsed, 1e-9):,.0f} items/s)"
             )
         )
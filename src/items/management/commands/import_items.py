@@ -0,0 +1,47 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from items.utils.bulk_import import IMPORT_FORMATS, guess_import_format, import_items
+
+
+class Command(BaseCommand):
+    help = (
+        "Upsert items from a CSV or NDJSON file using COPY. Rows with an "
+        "existing id overwrite that item; the rest are created."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to import, or - for stdin")
+        parser.add_argument(
+            "--format",
+            dest="import_format",
+            choices=IMPORT_FORMATS,
+            help="Input format; guessed from the file extension by default",
+        )
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            help="Number of rows validated and loaded per transaction",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        import_format = options["import_format"] or guess_import_format(path)
+        if import_format is None:
+            raise CommandError("Cannot guess the input format; pass --format.")
+
+        if path == "-":
+            report = import_items(sys.stdin, import_format, options["batch_size"])
+        else:
+            with open(path, newline="", encoding="utf-8") as stream:
+                report = import_items(stream, import_format, options["batch_size"])
+
+        for error in report.errors:
+            self.stderr.write(f"Row {error['row']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Created {report.created} and updated {report.updated} items; "
+                f"{len(report.errors)} rows failed."
+            )
+        )
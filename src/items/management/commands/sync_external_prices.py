@@ -6,7 +6,7 @@ from items.utils.price_sync import sync_all_items, sync_item_by_id
 class Command(BaseCommand):
     help = (
         "Sync external_price for items. Use --item_id to sync a single item by ID. "
-        "Without --item_id, syncs all items."
+        "Without --item_id, syncs all stale items (or every item with --full)."
     )
 
     def add_arguments(self, parser):
@@ -15,17 +15,37 @@ class Command(BaseCommand):
             type=int,
             help="ID of a single item to sync external price",
         )
+        parser.add_argument(
+            "--batch_size",
+            type=int,
+            help="Number of items read and written per window when syncing all",
+        )
+        parser.add_argument(
+            "--in_database",
+            action="store_true",
+            help="Compute prices in Postgres with one UPDATE per ID range",
+        )
+        parser.add_argument(
+            "--full",
+            action="store_true",
+            help="Sync every item, not only those that are stale",
+        )
 
     def handle(self, *args, **options):
         item_id = options.get("item_id")
 
         if item_id is not None:
             self.stdout.write(f"Syncing external price for item ID {item_id}...")
-            result = sync_item_by_id(item_id, simulate_delay=False)
+            result = sync_item_by_id(item_id)
             self.stdout.write(result)
         else:
-            self.stdout.write("Syncing external price for all items...")
-            count = sync_all_items()
+            scope = "all" if options.get("full") else "stale"
+            self.stdout.write(f"Syncing external price for {scope} items...")
+            count = sync_all_items(
+                batch_size=options.get("batch_size"),
+                in_database=options.get("in_database") or None,
+                full=options.get("full"),
+            )
             self.stdout.write(
                 self.style.SUCCESS(f"Updated external_price for {count} items.")
             )
@@ -0,0 +1,19 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("items", "0003_auto_add_periodic_task"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["price", "id"], name="items_item_price_bc8058_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,47 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("items", "0005_item_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="item",
+            name="external_price_synced_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When external_price was last synced; null if never",
+                null=True,
+            ),
+        ),
+        migrations.AddField(
+            model_name="item",
+            name="price_at_sync",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=2,
+                help_text="The price external_price was last synced against",
+                max_digits=10,
+                null=True,
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["external_price_synced_at", "id"], name="item_synced_at_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                condition=models.Q(("price", models.F("price_at_sync")), _negated=True),
+                fields=["id"],
+                name="item_price_sync_pending_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,95 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:46
+
+import json
+
+from django.db import migrations, models
+
+CREATE_TABLE = """
+CREATE TABLE items_itempricehistory (
+    id bigserial NOT NULL,
+    item_id bigint NOT NULL,
+    price numeric(10, 2) NOT NULL,
+    external_price numeric(10, 2) NOT NULL,
+    recorded_at timestamp with time zone NOT NULL,
+    PRIMARY KEY (id, recorded_at)
+) PARTITION BY RANGE (recorded_at);
+
+CREATE INDEX item_price_history_recorded_brin
+    ON items_itempricehistory USING brin (recorded_at);
+CREATE INDEX item_price_history_item_recorded_idx
+    ON items_itempricehistory (item_id, recorded_at);
+
+-- Catches rows outside the daily partitions created by maintenance.
+CREATE TABLE items_itempricehistory_default
+    PARTITION OF items_itempricehistory DEFAULT;
+"""
+
+DROP_TABLE = "DROP TABLE items_itempricehistory;"
+
+
+def create_partition_maintenance_task(apps, schema_editor):
+    """
+    Create a daily periodic task that creates upcoming price history
+    partitions and drops those past the retention period.
+    """
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+
+    schedule, _ = IntervalSchedule.objects.get_or_create(every=1, period="days")
+
+    PeriodicTask.objects.get_or_create(
+        name="Daily price history partition maintenance",
+        defaults={
+            "interval": schedule,
+            "task": "items.tasks.maintain_price_history_partitions",
+            "kwargs": json.dumps({}),
+        },
+    )
+
+
+def delete_partition_maintenance_task(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(
+        name="Daily price history partition maintenance"
+    ).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("items", "0006_item_price_sync_state"),
+        ("django_celery_beat", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ItemPriceHistory",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("price", models.DecimalField(decimal_places=2, max_digits=10)),
+                (
+                    "external_price",
+                    models.DecimalField(decimal_places=2, max_digits=10),
+                ),
+                ("recorded_at", models.DateTimeField()),
+            ],
+            options={
+                "verbose_name": "Item price history",
+                "verbose_name_plural": "Item price history",
+                "db_table": "items_itempricehistory",
+                "managed": False,
+            },
+        ),
+        migrations.RunSQL(CREATE_TABLE, DROP_TABLE),
+        migrations.RunPython(
+            create_partition_maintenance_task, delete_partition_maintenance_task
+        ),
+    ]
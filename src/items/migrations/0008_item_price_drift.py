@@ -0,0 +1,164 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:55
+
+import json
+from decimal import Decimal
+
+import django.db.models.expressions
+import django.db.models.functions.math
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.db import migrations, models
+from django.db.models.functions import Abs
+
+# Copy of items.utils.price_drift as of this migration, so later changes to
+# that module do not change what it does.
+DEFAULT_BUCKET_EDGES = [-100, -10, -1, 0, 1, 10, 100]
+TOTAL_FIELDS = ("items", "drift_sum", "abs_drift_sum", "squared_drift_sum")
+ZERO_TOTALS = (0, Decimal("0"), Decimal("0"), Decimal("0"))
+
+
+def drift_buckets(Item, edges):
+    """Every bucket's totals, including empty buckets, in one query."""
+    bucket = models.Func(
+        "price_drift",
+        models.Value(
+            edges,
+            output_field=ArrayField(
+                models.DecimalField(max_digits=11, decimal_places=2)
+            ),
+        ),
+        function="width_bucket",
+        output_field=models.IntegerField(),
+    )
+    rows = (
+        Item.objects.filter(price_drift__isnull=False)
+        .order_by()
+        .annotate(bucket=bucket)
+        .values("bucket")
+        .annotate(
+            items=models.Count("pk"),
+            drift_sum=models.Sum("price_drift"),
+            abs_drift_sum=models.Sum(Abs("price_drift")),
+            squared_drift_sum=models.Sum(
+                models.F("price_drift") * models.F("price_drift")
+            ),
+        )
+    )
+    totals = {
+        row["bucket"]: tuple(row[field] for field in TOTAL_FIELDS) for row in rows
+    }
+    bounds = [None, *edges, None]
+    return [
+        {
+            "bucket": bucket,
+            "lower": bounds[bucket],
+            "upper": bounds[bucket + 1],
+            **dict(zip(TOTAL_FIELDS, totals.get(bucket, ZERO_TOTALS))),
+        }
+        for bucket in range(len(edges) + 1)
+    ]
+
+
+def build_drift_summary(apps, schema_editor):
+    """
+    Fill the drift summary from existing Items and schedule its daily
+    rebuild, which reconciles changes made outside price syncs.
+    """
+    Item = apps.get_model("items", "Item")
+    PriceDriftBucket = apps.get_model("items", "PriceDriftBucket")
+    edges = [
+        Decimal(str(edge))
+        for edge in getattr(settings, "ITEMS_PRICE_DRIFT_BUCKETS", DEFAULT_BUCKET_EDGES)
+    ]
+    PriceDriftBucket.objects.bulk_create(
+        PriceDriftBucket(**row) for row in drift_buckets(Item, edges)
+    )
+
+    IntervalSchedule = apps.get_model("django_celery_beat", "IntervalSchedule")
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    schedule, _ = IntervalSchedule.objects.get_or_create(every=1, period="days")
+    PeriodicTask.objects.get_or_create(
+        name="Daily price drift summary rebuild",
+        defaults={
+            "interval": schedule,
+            "task": "items.tasks.rebuild_price_drift_summary",
+            "kwargs": json.dumps({}),
+        },
+    )
+
+
+def delete_drift_summary_task(apps, schema_editor):
+    PeriodicTask = apps.get_model("django_celery_beat", "PeriodicTask")
+    PeriodicTask.objects.filter(name="Daily price drift summary rebuild").delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("items", "0007_item_price_history"),
+        ("django_celery_beat", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PriceDriftBucket",
+            fields=[
+                (
+                    "bucket",
+                    models.PositiveSmallIntegerField(primary_key=True, serialize=False),
+                ),
+                (
+                    "lower",
+                    models.DecimalField(decimal_places=2, max_digits=11, null=True),
+                ),
+                (
+                    "upper",
+                    models.DecimalField(decimal_places=2, max_digits=11, null=True),
+                ),
+                ("items", models.BigIntegerField(default=0)),
+                (
+                    "drift_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=24),
+                ),
+                (
+                    "abs_drift_sum",
+                    models.DecimalField(decimal_places=2, default=0, max_digits=24),
+                ),
+                (
+                    "squared_drift_sum",
+                    models.DecimalField(decimal_places=4, default=0, max_digits=36),
+                ),
+            ],
+            options={
+                "ordering": ["bucket"],
+            },
+        ),
+        migrations.AddField(
+            model_name="item",
+            name="price_drift",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.expressions.CombinedExpression(
+                    models.F("external_price"), "-", models.F("price_at_sync")
+                ),
+                help_text="external_price minus the price it was synced against; null if never synced",
+                output_field=models.DecimalField(decimal_places=2, max_digits=11),
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(fields=["price_drift"], name="item_price_drift_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                models.OrderBy(
+                    django.db.models.functions.math.Abs("price_drift"), descending=True
+                ),
+                models.F("id"),
+                condition=models.Q(("price_drift__isnull", False)),
+                name="item_abs_price_drift_idx",
+            ),
+        ),
+        migrations.RunPython(build_drift_summary, delete_drift_summary_task),
+    ]
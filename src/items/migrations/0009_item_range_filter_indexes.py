@@ -0,0 +1,35 @@
+# Generated by Django 5.1.7 on 2026-10-18 12:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("items", "0008_item_price_drift"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="item",
+            name="items_item_created_3cdd06_idx",
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["created_at", "id"], name="item_created_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["updated_at", "id"], name="item_updated_at_id_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="item",
+            index=models.Index(
+                fields=["external_price", "id"], name="item_external_price_id_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 5.1.7 on 2026-10-18 14:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+COPY_SYNC_STATE = """
+    INSERT INTO items_itemsyncstate (item_id, synced_at)
+    SELECT id, external_price_synced_at FROM items_item
+    WHERE external_price_synced_at IS NOT NULL
+"""
+RESTORE_SYNC_STATE = """
+    UPDATE items_item SET external_price_synced_at = s.synced_at
+    FROM items_itemsyncstate s WHERE s.item_id = items_item.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("items", "0009_item_range_filter_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ItemSyncState",
+            fields=[
+                (
+                    "item",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="sync_state",
+                        serialize=False,
+                        to="items.item",
+                    ),
+                ),
+                (
+                    "synced_at",
+                    models.DateTimeField(
+                        help_text="When external_price was last synced"
+                    ),
+                ),
+            ],
+        ),
+        migrations.RunSQL(COPY_SYNC_STATE, RESTORE_SYNC_STATE),
+        migrations.RemoveIndex(
+            model_name="item",
+            name="item_synced_at_idx",
+        ),
+        migrations.RemoveField(
+            model_name="item",
+            name="external_price_synced_at",
+        ),
+        migrations.AddIndex(
+            model_name="itemsyncstate",
+            index=models.Index(
+                fields=["synced_at", "item"], name="item_sync_state_synced_at_idx"
+            ),
+        ),
+    ]
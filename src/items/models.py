@@ -1,6 +1,14 @@
 from decimal import Decimal
 
+from django.contrib.postgres.indexes import GinIndex, OpClass
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from django.db import models
+from django.db.models.functions import Abs, Upper
+
+# Items never synced, or whose price was edited after their last external
+# price sync. A null price_at_sync makes the comparison match, so rows
+# inserted by raw SQL are picked up too.
+PRICE_SYNC_PENDING = ~models.Q(price=models.F("price_at_sync"))
 
 
 class Item(models.Model):
@@ -15,8 +23,31 @@ class Item(models.Model):
         default=Decimal("0.00"),
         help_text="Price from external system (simulated)",
     )
+    price_at_sync = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        null=True,
+        blank=True,
+        help_text="The price external_price was last synced against",
+    )
+    price_drift = models.GeneratedField(
+        expression=models.F("external_price") - models.F("price_at_sync"),
+        output_field=models.DecimalField(max_digits=11, decimal_places=2),
+        db_persist=True,
+        help_text="external_price minus the price it was synced against; "
+        "null if never synced",
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("name", weight="A", config="english")
+            + SearchVector("description", weight="B", config="english")
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+        help_text="Full-text document over name and description",
+    )
 
     def __str__(self) -> str:
         """Return a string representation of the item."""
@@ -30,7 +61,34 @@ class Item(models.Model):
         ordering = ["-created_at"]
         indexes = [
             models.Index(fields=["name"]),
-            models.Index(fields=["created_at"]),
+            models.Index(fields=["created_at", "id"], name="item_created_at_id_idx"),
+            models.Index(fields=["updated_at", "id"], name="item_updated_at_id_idx"),
+            models.Index(fields=["price", "id"]),
+            models.Index(
+                fields=["external_price", "id"], name="item_external_price_id_idx"
+            ),
+            models.Index(
+                fields=["id"],
+                condition=PRICE_SYNC_PENDING,
+                name="item_price_sync_pending_idx",
+            ),
+            models.Index(fields=["price_drift"], name="item_price_drift_idx"),
+            # Top-N largest drifts in either direction.
+            models.Index(
+                Abs("price_drift").desc(),
+                models.F("id"),
+                condition=models.Q(price_drift__isnull=False),
+                name="item_abs_price_drift_idx",
+            ),
+            GinIndex(fields=["search_vector"], name="item_search_vector_idx"),
+            GinIndex(
+                OpClass(Upper("name"), name="gin_trgm_ops"),
+                name="item_name_trgm_idx",
+            ),
+            GinIndex(
+                OpClass(Upper("description"), name="gin_trgm_ops"),
+                name="item_description_trgm_idx",
+            ),
         ]
         constraints = [
             models.CheckConstraint(
@@ -38,3 +96,85 @@ class Item(models.Model):
                 name="price_gte_0",
             ),
         ]
+
+
+class ItemSyncState(models.Model):
+    """
+    When an Item's external price was last synced.
+
+    Kept out of the Item table so that a sync finding an unchanged price
+    only rewrites this narrow row, not the Item's. Items never synced have
+    no row.
+    """
+
+    item = models.OneToOneField(
+        Item,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="sync_state",
+    )
+    synced_at = models.DateTimeField(help_text="When external_price was last synced")
+
+    class Meta:
+        """Meta options for the ItemSyncState model."""
+
+        indexes = [
+            models.Index(
+                fields=["synced_at", "item"], name="item_sync_state_synced_at_idx"
+            ),
+        ]
+
+
+class PriceDriftBucket(models.Model):
+    """
+    Running totals of ``Item.price_drift`` for one histogram bucket.
+
+    Bucket ``n`` holds drifts in ``[lower, upper)``; the first and last
+    buckets are open-ended. Sync batches add their drift changes to the
+    totals (see items.utils.price_drift), so drift statistics are read
+    from a handful of rows instead of aggregating the Item table.
+    """
+
+    bucket = models.PositiveSmallIntegerField(primary_key=True)
+    lower = models.DecimalField(max_digits=11, decimal_places=2, null=True)
+    upper = models.DecimalField(max_digits=11, decimal_places=2, null=True)
+    items = models.BigIntegerField(default=0)
+    drift_sum = models.DecimalField(max_digits=24, decimal_places=2, default=0)
+    abs_drift_sum = models.DecimalField(max_digits=24, decimal_places=2, default=0)
+    squared_drift_sum = models.DecimalField(max_digits=36, decimal_places=4, default=0)
+
+    class Meta:
+        """Meta options for the PriceDriftBucket model."""
+
+        ordering = ["bucket"]
+
+
+class ItemPriceHistory(models.Model):
+    """
+    Append-only log of external price syncs.
+
+    The table is range-partitioned by ``recorded_at`` (one partition per
+    day, see items.utils.price_history) and created by raw SQL in its
+    migration, so Django does not manage it. ``id`` is unique but the
+    table's real primary key is ``(id, recorded_at)``, as Postgres requires
+    the partition key in it. History outlives deleted Items, so ``item``
+    has no database constraint.
+    """
+
+    item = models.ForeignKey(
+        Item,
+        on_delete=models.DO_NOTHING,
+        db_constraint=False,
+        related_name="price_history",
+    )
+    price = models.DecimalField(max_digits=10, decimal_places=2)
+    external_price = models.DecimalField(max_digits=10, decimal_places=2)
+    recorded_at = models.DateTimeField()
+
+    class Meta:
+        """Meta options for the ItemPriceHistory model."""
+
+        managed = False
+        db_table = "items_itempricehistory"
+        verbose_name = "Item price history"
+        verbose_name_plural = "Item price history"
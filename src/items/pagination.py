@@ -0,0 +1,247 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from typing import Any, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.paginator import InvalidPage
+from django.db.models import Model, Q, QuerySet
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class ItemKeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination over ``(<ordering field>, id)``.
+
+    Each page is fetched with a "WHERE (field, id) > (last field, last id)"
+    range condition and a LIMIT, so it costs the same at any depth and needs
+    no COUNT(*). The cursor is an opaque token encoding the boundary row and
+    the paging direction. Only the first ``ordering`` term is honored, and
+    only fields in the view's ``ordering_fields`` are allowed.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    ordering_param = api_settings.ORDERING_PARAM
+    default_ordering = "-created_at"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self) -> None:
+        self.page_size = settings.ITEMS_CURSOR_PAGE_SIZE
+        self.max_page_size = settings.ITEMS_CURSOR_MAX_PAGE_SIZE
+
+    def paginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> List[Any]:
+        queryset = self.page_queryset(queryset, request, view)
+        return self.set_page(list(queryset[: self.page_size + 1]))
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> List[Any]:
+        """``paginate_queryset`` for async views, reading with ``aiterator()``."""
+        queryset = self.page_queryset(queryset, request, view)
+        return self.set_page(
+            [row async for row in queryset[: self.page_size + 1].aiterator()]
+        )
+
+    def page_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> QuerySet:
+        """
+        Order and filter ``queryset`` to the rows following the cursor,
+        without running it. One row more than a page is read to find out
+        whether another page follows.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(request, view)
+        self.field = self.ordering.lstrip("-")
+        descending = self.ordering.startswith("-")
+
+        position = self.position = self.decode_cursor(queryset.model, request)
+        reverse = position is not None and position[2]
+        if reverse:
+            descending = not descending
+
+        if descending:
+            queryset = queryset.order_by(f"-{self.field}", "-pk")
+        else:
+            queryset = queryset.order_by(self.field, "pk")
+
+        if position is not None:
+            value, pk, _ = position
+            comparison = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{comparison}e": value})
+                & (
+                    Q(**{f"{self.field}__{comparison}": value})
+                    | Q(**{self.field: value, f"pk__{comparison}": pk})
+                )
+            )
+
+        return queryset
+
+    def set_page(self, rows: List[Any]) -> List[Any]:
+        """Keep the page out of the rows read by ``page_queryset``."""
+        has_more = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+
+        if self.position is not None and self.position[2]:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.position is not None
+
+        return self.page
+
+    def get_page_size(self, request: Request) -> int:
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, request: Request, view: Any) -> str:
+        allowed = getattr(view, "ordering_fields", None) or []
+        params = request.query_params.get(self.ordering_param, "")
+        ordering = params.split(",")[0].strip()
+        if ordering.lstrip("-") in allowed:
+            return ordering
+        return self.default_ordering
+
+    def decode_cursor(
+        self, model: type[Model], request: Request
+    ) -> Optional[Tuple[Any, int, bool]]:
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+
+        try:
+            payload = json.loads(b64decode(encoded.encode("ascii")).decode("utf-8"))
+            value = model._meta.get_field(self.field).to_python(payload["v"])
+            return value, int(payload["id"]), bool(payload["r"])
+        except (
+            BinasciiError,
+            KeyError,
+            TypeError,
+            UnicodeError,
+            ValidationError,
+            ValueError,
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, row: Any, reverse: bool) -> str:
+        # Rows are model instances or, on the fast read path, .values() dicts.
+        if isinstance(row, dict):
+            value, pk = row[self.field], row["id"]
+        else:
+            value, pk = getattr(row, self.field), row.pk
+        payload = {"v": str(value), "id": pk, "r": reverse}
+        encoded = b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def get_next_link(self) -> Optional[str]:
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not self.has_previous:
+            return None
+        if not self.page:
+            url = self.request.build_absolute_uri()
+            return remove_query_param(url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_paginated_response_schema(self, schema: dict) -> dict:
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view: Any) -> List[dict]:
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_size_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Number of results to return per page.",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+
+class ItemPageNumberPagination(PageNumberPagination):
+    """Page number pagination that can also paginate in async views."""
+
+    async def apaginate_queryset(
+        self, queryset: QuerySet, request: Request, view: Any = None
+    ) -> Optional[List[Any]]:
+        """
+        ``paginate_queryset`` for async views: the count runs with
+        ``acount()`` and the page is read with ``aiterator()``, while the
+        paginator only slices the queryset.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        paginator = self.django_paginator_class(queryset, page_size)
+        paginator.count = await queryset.acount()
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(
+                self.invalid_page_message.format(
+                    page_number=page_number, message=str(exc)
+                )
+            )
+        self.page.object_list = [row async for row in self.page.object_list.aiterator()]
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        return list(self.page)
+
+
+def uses_keyset_pagination(request: Any) -> bool:
+    """Return True if the client opted into cursor pagination."""
+    params = getattr(request, "query_params", None)
+    if params is None:
+        return False
+    return (
+        params.get("pagination") == "cursor"
+        or ItemKeysetPagination.cursor_query_param in params
+    )
@@ -1,9 +1,19 @@
+from datetime import timedelta
+from decimal import Decimal
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Tuple
+
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.settings import ISO_8601, api_settings
+
+from backend.middleware import TimedListSerializer, TimedSerializerMixin
 
-from .models import Item
+from .models import Item, PriceDriftBucket
+from .utils.price_history import INTERVALS
 
 
-class ItemSerializer(serializers.ModelSerializer):
+class ItemSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     """Serializer for the Item model."""
 
     class Meta:
@@ -20,3 +30,201 @@ class ItemSerializer(serializers.ModelSerializer):
             "updated_at",
         )
         read_only_fields = ["created_at", "updated_at"]
+        # Mirrors the price_gte_0 check constraint.
+        extra_kwargs = {"price": {"min_value": Decimal("0")}}
+        list_serializer_class = TimedListSerializer
+
+
+def _decimal_converter(field: serializers.DecimalField) -> Callable[[Any], Any]:
+    coerce_to_string = getattr(
+        field, "coerce_to_string", api_settings.COERCE_DECIMAL_TO_STRING
+    )
+    if (
+        not coerce_to_string
+        or field.localize
+        or field.normalize_output
+        or field.decimal_places is None
+    ):
+        return field.to_representation
+
+    # Values read from a numeric(max_digits, decimal_places) column already
+    # have the field's exponent, so quantizing them is a no-op.
+    exponent = -field.decimal_places
+    slow = field.to_representation
+
+    def convert(value: Any) -> Any:
+        if type(value) is Decimal and value.as_tuple().exponent == exponent:
+            return format(value, "f")
+        return slow(value)
+
+    return convert
+
+
+def _datetime_converter(field: serializers.DateTimeField) -> Callable[[Any], Any]:
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+
+    field_timezone = (
+        field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    )
+    if field_timezone is None:
+        return field.to_representation
+
+    slow = field.to_representation
+
+    def convert(value: Any) -> Any:
+        if value.tzinfo is None:
+            return slow(value)
+        value = value.astimezone(field_timezone).isoformat()
+        if value.endswith("+00:00"):
+            value = value[:-6] + "Z"
+        return value
+
+    return convert
+
+
+def _converter(field: serializers.Field) -> Callable[[Any], Any]:
+    if isinstance(field, serializers.DecimalField):
+        return _decimal_converter(field)
+    if isinstance(field, serializers.DateTimeField):
+        return _datetime_converter(field)
+    return field.to_representation
+
+
+def compile_row_serializer(
+    fields: Iterable[serializers.Field],
+) -> Callable[[Mapping[str, Any]], Dict[str, Any]]:
+    """
+    Precompile the read path of a serializer's bound ``fields`` for rows
+    fetched with ``.values()``.
+
+    Returns a function turning one row (keyed by field ``source``) into the
+    dict ``Serializer.to_representation`` would produce for the equivalent
+    instance. Decimals and ISO 8601 datetimes are formatted directly; every
+    other field, and any value outside the fast path, goes through the
+    field's own ``to_representation``.
+    """
+    compiled = [(field.field_name, field.source, _converter(field)) for field in fields]
+
+    def row_to_dict(row: Mapping[str, Any]) -> Dict[str, Any]:
+        ret = {}
+        for name, source, convert in compiled:
+            value = row[source]
+            ret[name] = None if value is None else convert(value)
+        return ret
+
+    return row_to_dict
+
+
+class ItemRowSerializer(TimedSerializerMixin, serializers.BaseSerializer):
+    """
+    Read-only counterpart of ItemSerializer for ``.values()`` rows.
+
+    Renders the same JSON as ItemSerializer without building model
+    instances or running DRF's per-field attribute lookup for each row.
+    """
+
+    serializer_class = ItemSerializer
+
+    class Meta:
+        list_serializer_class = TimedListSerializer
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Compiled per serializer instance: datetimes are rendered in the
+        # timezone active for the current request.
+        self.row_to_dict = compile_row_serializer(self.readable_fields())
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def readable_fields(cls) -> Tuple[serializers.Field, ...]:
+        """The wrapped serializer's bound fields, built once per class."""
+        return tuple(cls.serializer_class()._readable_fields)
+
+    @classmethod
+    def value_fields(cls) -> List[str]:
+        """Model fields to pass to ``QuerySet.values()``."""
+        return [field.source for field in cls.readable_fields()]
+
+    def to_representation(self, instance: Mapping[str, Any]) -> Dict[str, Any]:
+        return self.row_to_dict(instance)
+
+
+class PriceHistoryQuerySerializer(serializers.Serializer):
+    """Query parameters of the price history endpoint."""
+
+    interval = serializers.ChoiceField(choices=INTERVALS, default="hour")
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+
+    def validate(self, attrs: Dict[str, Any]) -> Dict[str, Any]:
+        end = attrs.setdefault("end", timezone.now())
+        start = attrs.setdefault("start", end - timedelta(days=7))
+        if start >= end:
+            raise serializers.ValidationError({"start": "Must be before end."})
+        return attrs
+
+
+class PriceHistoryBucketSerializer(serializers.Serializer):
+    """One downsampled bucket of an Item's external price history."""
+
+    bucket = serializers.DateTimeField()
+    min = serializers.DecimalField(max_digits=10, decimal_places=2)
+    max = serializers.DecimalField(max_digits=10, decimal_places=2)
+    avg = serializers.DecimalField(max_digits=10, decimal_places=2)
+    samples = serializers.IntegerField()
+
+
+class PriceDriftQuerySerializer(serializers.Serializer):
+    """Query parameters of the price drift stats endpoint."""
+
+    top = serializers.IntegerField(min_value=0, max_value=100, default=10)
+
+
+class PriceDriftItemSerializer(serializers.ModelSerializer):
+    """An Item listed by drift, with the prices the drift is taken from."""
+
+    # Generated fields map to a plain ReadOnlyField otherwise.
+    price_drift = serializers.DecimalField(
+        max_digits=11, decimal_places=2, read_only=True
+    )
+    external_price_synced_at = serializers.DateTimeField(
+        source="sync_state.synced_at", read_only=True
+    )
+
+    class Meta:
+        """Meta options for the PriceDriftItemSerializer."""
+
+        model = Item
+        fields = (
+            "id",
+            "name",
+            "price",
+            "price_at_sync",
+            "external_price",
+            "price_drift",
+            "external_price_synced_at",
+        )
+
+
+class PriceDriftBucketSerializer(serializers.ModelSerializer):
+    """One price drift histogram bucket."""
+
+    class Meta:
+        """Meta options for the PriceDriftBucketSerializer."""
+
+        model = PriceDriftBucket
+        fields = ("lower", "upper", "items")
+
+
+class PriceDriftSummarySerializer(serializers.Serializer):
+    """Price drift aggregates over all synced Items, and their histogram."""
+
+    items = serializers.IntegerField()
+    mean = serializers.DecimalField(max_digits=None, decimal_places=2)
+    mean_abs = serializers.DecimalField(max_digits=None, decimal_places=2)
+    stddev = serializers.DecimalField(max_digits=None, decimal_places=2)
+    min = serializers.DecimalField(max_digits=None, decimal_places=2)
+    max = serializers.DecimalField(max_digits=None, decimal_places=2)
+    histogram = PriceDriftBucketSerializer(many=True)
@@ -1,14 +1,40 @@
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_delete
 from django.dispatch import receiver
 
+from .cache import invalidate_items
 from .models import Item
-from .tasks import simulate_external_price_sync_for_item
+from .utils.price_drift import DriftDelta
+from .utils.sync_dispatch import queue_external_price_sync
 
 
 @receiver(post_save, sender=Item)
-def trigger_external_price_sync(sender, instance, created, **kwargs):
-    """Trigger external price sync task after Item is created."""
+def trigger_external_price_sync(sender, instance, created, using, **kwargs):
+    """Queue an external price sync for the Item once it is committed."""
     # Only trigger the task if the Item is newly created
     # and not updated, to avoid unnecessary syncs.
     if created:
-        simulate_external_price_sync_for_item.delay(instance.pk)
+        queue_external_price_sync([instance.pk], using=using)
+
+
+@receiver(post_save, sender=Item)
+@receiver(post_delete, sender=Item)
+def invalidate_item_cache(sender, instance, using, **kwargs):
+    """Invalidate cached responses that include the saved or deleted Item."""
+    invalidate_items([instance.pk], using=using)
+
+
+@receiver(pre_delete, sender=Item)
+def remove_item_drift(sender, instance, using, **kwargs):
+    """Take the Item's drift out of the drift summary as it is deleted."""
+    # Read under a lock in the delete's transaction, not from the instance,
+    # which may predate a sync.
+    drift = (
+        Item.objects.using(using)
+        .select_for_update()
+        .filter(pk=instance.pk)
+        .values_list("price_drift", flat=True)
+        .first()
+    )
+    delta = DriftDelta()
+    delta.remove(drift)
+    delta.save()
@@ -1,18 +1,175 @@
-from celery import shared_task
+from typing import Any, Dict, List, Optional
 
-from items.utils.price_sync import sync_all_items, sync_item_by_id
+from celery import chord, shared_task
+from django.conf import settings
 
+from items.utils.price_drift import rebuild_drift_summary
+from items.utils.price_history import drop_expired_partitions, ensure_partitions
+from items.utils.price_sync import (
+    plan_id_shards,
+    sync_item_by_id,
+    sync_item_range,
+    sync_items_by_ids,
+)
+from items.utils.sync_locks import (
+    FULL_SYNC_LOCK,
+    ITEM_SYNC_LOCK,
+    acquire_sync_lock,
+    release_sync_lock,
+)
+from items.utils.task_status import TaskProgress
 
-@shared_task
-def simulate_external_price_sync_for_item(item_id: int) -> str:
-    """Simulate external price sync for a single Item by ID."""
 
-    return sync_item_by_id(item_id)
+@shared_task(bind=True)
+def simulate_external_price_sync_for_item(self, item_id: int) -> str:
+    """
+    Simulate external price sync for a single Item by ID.
+
+    Holds the Item's sync lock while running, so a duplicate of a queued or
+    running sync for the same Item is skipped.
+    """
+
+    run_id = self.request.id
+    if run_id is None:
+        return sync_item_by_id(item_id)
+
+    lock = ITEM_SYNC_LOCK.format(item_id)
+    holder = acquire_sync_lock(
+        lock, run_id, settings.ITEMS_PRICE_SYNC_ITEM_LOCK_TIMEOUT
+    )
+    if holder is not None:
+        return f"External price sync for item {item_id} is already running ({holder})."
+    try:
+        return sync_item_by_id(item_id)
+    finally:
+        release_sync_lock(lock, run_id)
 
 
 @shared_task
-def hourly_external_price_sync() -> str:
-    """Run hourly external price sync for all Items."""
+def sync_external_prices_for_items(item_ids: List[int]) -> str:
+    """Sync external prices for a batch of Items by ID."""
 
-    count = sync_all_items()
+    count = sync_items_by_ids(item_ids)
     return f"Updated external_price for {count} items."
+
+
+@shared_task(bind=True)
+def sync_external_price_shard(self, start_id: int, end_id: int) -> int:
+    """
+    Sync external prices for the stale Items in one ID-range shard,
+    publishing PROGRESS states as batches complete.
+    """
+
+    return sync_item_range(start_id, end_id, progress=TaskProgress.for_task(self))
+
+
+@shared_task
+def aggregate_external_price_sync(
+    counts: List[int], run_id: Optional[str] = None
+) -> str:
+    """
+    Chord callback summing the per-shard update counts and releasing the
+    full sync lock held by run ``run_id``.
+    """
+
+    if run_id is not None:
+        release_sync_lock(FULL_SYNC_LOCK, run_id)
+    return f"Updated external_price for {sum(counts)} items."
+
+
+@shared_task
+def release_external_price_sync_lock(
+    request: Any, exc: Exception, traceback: Any, run_id: str
+) -> None:
+    """
+    Error callback of the full sync chord: a failed shard or callback
+    releases the full sync lock held by run ``run_id``.
+    """
+
+    release_sync_lock(FULL_SYNC_LOCK, run_id)
+
+
+@shared_task(bind=True)
+def hourly_external_price_sync(self) -> Dict[str, Any]:
+    """
+    Run hourly external price sync for stale Items.
+
+    The table is split into ID-range shards that run in parallel across
+    the worker pool; a chord callback aggregates their counts. Each shard
+    only reads Items that are due (see iter_stale_windows), so a run costs
+    in proportion to churn rather than table size.
+
+    The result lists the shard task IDs, so the status endpoints can report
+    the run's combined progress. A run holds the full sync lock until its
+    chord callback completes, or until a shard or the callback fails; runs
+    started meanwhile (by beat or by hand) are skipped.
+    """
+
+    run_id = self.request.id
+    if run_id is not None:
+        holder = acquire_sync_lock(
+            FULL_SYNC_LOCK, run_id, settings.ITEMS_PRICE_SYNC_FULL_LOCK_TIMEOUT
+        )
+        if holder is not None:
+            return {
+                "message": f"External price sync is already running ({holder}).",
+                "aggregate_task_id": None,
+                "subtask_ids": [],
+            }
+
+    try:
+        shards = plan_id_shards()
+        if not shards:
+            if run_id is not None:
+                release_sync_lock(FULL_SYNC_LOCK, run_id)
+            return {
+                "message": "Updated external_price for 0 items.",
+                "aggregate_task_id": None,
+                "subtask_ids": [],
+            }
+
+        header = [
+            sync_external_price_shard.s(start_id, end_id) for start_id, end_id in shards
+        ]
+        subtask_ids = [signature.freeze().id for signature in header]
+        callback = aggregate_external_price_sync.s(run_id)
+        if run_id is not None:
+            callback.on_error(release_external_price_sync_lock.s(run_id=run_id))
+        result = chord(header)(callback)
+    except Exception:
+        # Nothing was dispatched that would release the lock.
+        if run_id is not None:
+            release_sync_lock(FULL_SYNC_LOCK, run_id)
+        raise
+    return {
+        "message": (
+            f"Dispatched external_price sync across {len(shards)} shards "
+            f"(aggregate task {result.id})."
+        ),
+        "aggregate_task_id": result.id,
+        "subtask_ids": subtask_ids,
+    }
+
+
+@shared_task
+def maintain_price_history_partitions() -> str:
+    """
+    Create upcoming daily price history partitions and drop expired ones.
+    """
+
+    created = ensure_partitions()
+    dropped = drop_expired_partitions()
+    return (
+        f"Created {len(created)} and dropped {len(dropped)} "
+        "price history partitions."
+    )
+
+
+@shared_task
+def rebuild_price_drift_summary() -> str:
+    """
+    Recompute the price drift summary from the Item table.
+    """
+
+    items = rebuild_drift_summary()
+    return f"Price drift summary rebuilt over {items} items."
@@ -0,0 +1,46 @@
+from typing import Iterator
+from unittest.mock import MagicMock
+
+import pytest
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from pytest_mock import MockerFixture
+from rest_framework.test import APIClient
+
+from backend.metrics import REGISTRY, get_metrics_store
+from items.cache import stats
+
+
+@pytest.fixture(autouse=True)
+def clear_response_cache() -> Iterator[None]:
+    """Keep cached item responses from leaking between tests."""
+    for cache in caches.all():
+        cache.clear()
+    stats.reset()
+    yield
+
+
+@pytest.fixture(autouse=True)
+def clear_metrics() -> Iterator[None]:
+    """Start every test from an empty metrics store."""
+    REGISTRY.flush()
+    get_metrics_store().clear()
+    yield
+
+
+@pytest.fixture
+def authenticated_client(db) -> APIClient:
+    """Return an API client logged in as a test user."""
+    client = APIClient()
+    client.force_authenticate(
+        user=User.objects.create_user(username="testuser", password="testpass")
+    )
+    return client
+
+
+@pytest.fixture
+def sync_delay(mocker: MockerFixture) -> MagicMock:
+    """Patch the price sync task dispatched for new items."""
+    return mocker.patch(
+        "items.utils.sync_dispatch.sync_external_prices_for_items.delay"
+    )
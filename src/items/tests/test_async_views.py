@@ -0,0 +1,193 @@
+import asyncio
+from decimal import Decimal
+from typing import Callable, ContextManager, Dict, List
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth.models import User
+from django.test import AsyncClient
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from items.cache import stats
+from items.models import Item
+from items.utils.load_test import run_load
+
+
+@pytest.fixture
+def user(db) -> User:
+    return User.objects.create_user(username="testuser", password="testpass")
+
+
+@pytest.fixture
+def auth_headers(user: User) -> Dict[str, str]:
+    """Return the Authorization header of a JWT for the test user."""
+    return {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+
+
+@pytest.fixture
+def items(db) -> List[Item]:
+    """Create 7 items with distinct prices."""
+    return Item.objects.bulk_create(
+        [Item(name=f"Item{i}", price=Decimal(f"{i + 1}.00")) for i in range(7)]
+    )
+
+
+def async_get(url: str, headers: Dict[str, str]):
+    return async_to_sync(AsyncClient().get)(url, headers=headers)
+
+
+def sync_get(url: str, headers: Dict[str, str]):
+    return APIClient().get(url, headers=headers)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "",
+        "?ordering=-price&page=2",
+        "?price__gte=3&price__lte=6&ordering=price",
+        "?search=Item3",
+        "?pagination=cursor&page_size=3&ordering=price",
+    ],
+)
+def test_async_list_matches_item_viewset(
+    auth_headers: Dict[str, str], items: List[Item], query: str
+) -> None:
+    """Test filters, search, ordering and both paginations match the sync view."""
+    sync_url = reverse("item-list")
+    async_url = reverse("item-async-list")
+
+    expected = sync_get(sync_url + query, auth_headers)
+    response = async_get(async_url + query, auth_headers)
+
+    assert response.status_code == expected.status_code == 200
+    assert response.content == expected.content.replace(
+        sync_url.encode(), async_url.encode()
+    )
+
+
+def test_async_cursor_pages_follow_links(
+    auth_headers: Dict[str, str], items: List[Item]
+) -> None:
+    """Test next links lead through every item exactly once."""
+    url = reverse("item-async-list") + "?pagination=cursor&page_size=3"
+
+    ids = []
+    while url:
+        data = async_get(url, auth_headers).json()
+        ids.extend(row["id"] for row in data["results"])
+        url = data["next"]
+
+    assert sorted(ids) == sorted(item.id for item in items)
+
+
+def test_async_retrieve(auth_headers: Dict[str, str], items: List[Item]) -> None:
+    """Test an item is returned as by the sync view, and 404 for unknown IDs."""
+    pk = items[0].pk
+
+    response = async_get(reverse("item-async-detail", args=[pk]), auth_headers)
+    missing = async_get(reverse("item-async-detail", args=["0"]), auth_headers)
+    invalid = async_get(reverse("item-async-detail", args=["abc"]), auth_headers)
+
+    assert response.status_code == 200
+    assert (
+        response.content
+        == sync_get(reverse("item-detail", args=[pk]), auth_headers).content
+    )
+    assert missing.status_code == invalid.status_code == 404
+    assert missing.json() == {"detail": "No Item matches the given query."}
+
+
+def test_async_views_require_authentication(items: List[Item]) -> None:
+    """Test anonymous and badly authenticated requests get a 401."""
+    anonymous = async_get(reverse("item-async-list"), {})
+    bad_token = async_get(
+        reverse("item-async-detail", args=[items[0].pk]),
+        {"Authorization": "Bearer not-a-token"},
+    )
+
+    assert anonymous.status_code == bad_token.status_code == 401
+    assert anonymous["WWW-Authenticate"] == 'Bearer realm="api"'
+
+
+def test_async_views_reject_bad_requests(
+    auth_headers: Dict[str, str], items: List[Item]
+) -> None:
+    """Test out-of-range pages, bad cursors and writes are refused."""
+    url = reverse("item-async-list")
+
+    page = async_get(url + "?page=99", auth_headers)
+    cursor = async_get(url + "?cursor=garbage", auth_headers)
+    post = async_to_sync(AsyncClient().post)(url, headers=auth_headers)
+
+    assert page.status_code == cursor.status_code == 404
+    assert post.status_code == 405
+    assert post["Allow"] == "GET, HEAD, OPTIONS"
+
+
+def test_async_list_uses_response_cache(
+    auth_headers: Dict[str, str],
+    items: List[Item],
+    django_capture_on_commit_callbacks: Callable[..., ContextManager[list]],
+) -> None:
+    """Test repeated lists are served from the cache until an item changes."""
+    url = reverse("item-async-list")
+
+    first = async_get(url, auth_headers)
+    second = async_get(url, auth_headers)
+    with django_capture_on_commit_callbacks(execute=True):
+        items[-1].name = "Renamed"
+        items[-1].save()
+    third = async_get(url, auth_headers)
+
+    assert first.content == second.content != third.content
+    assert stats.snapshot() == {"local_hits": 1, "shared_hits": 0, "misses": 2}
+
+
+def test_sync_and_async_lists_are_cached_apart(
+    auth_headers: Dict[str, str], items: List[Item]
+) -> None:
+    """Test each endpoint gets its own cached page, with its own links."""
+    sync_get(reverse("item-list"), auth_headers)
+    response = async_get(reverse("item-async-list"), auth_headers)
+
+    assert response.json()["next"].startswith(
+        "http://testserver" + reverse("item-async-list")
+    )
+
+
+def test_async_queries_are_measured(
+    auth_headers: Dict[str, str], items: List[Item]
+) -> None:
+    """Test queries run by the async ORM show up in Server-Timing."""
+    response = async_get(reverse("item-async-list"), auth_headers)
+
+    # The user lookup, the count and the page.
+    assert 'desc="3 queries"' in response["Server-Timing"]
+    assert "auth;dur=" in response["Server-Timing"]
+
+
+def test_run_load_counts_responses_and_errors() -> None:
+    """Test the load generator reports successes and non-2xx answers."""
+
+    async def serve(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        while request := await reader.readuntil(b"\r\n\r\n"):
+            status = b"200 OK" if b"/ok" in request else b"500 Error"
+            writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Length: 2\r\n\r\nok")
+            await writer.drain()
+
+    async def load():
+        server = await asyncio.start_server(serve, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        async with server:
+            return await run_load(
+                f"http://127.0.0.1:{port}", ["/ok", "/fail"], 2, 0.2, slow_clients=1
+            )
+
+    result = asyncio.run(load())
+
+    assert result["requests_per_second"] > 0
+    assert result["errors"] > 0
+    assert result["median_ms"] <= result["p95_ms"] <= result["p99_ms"]
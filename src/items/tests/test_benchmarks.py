@@ -0,0 +1,108 @@
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from django.core.management import CommandError, call_command
+from django.db import connections
+
+from items.models import Item, ItemPriceHistory
+from items.utils.benchmarks import (
+    BENCHMARKS,
+    CONNECTION_BENCHMARK_ALIAS,
+    CONNECTION_MODES,
+    compare_results,
+    seed_items,
+)
+
+
+def results(**metrics: dict) -> dict:
+    return {"sizes": {"1000": metrics}}
+
+
+@pytest.mark.django_db
+def test_benchmark_command_writes_every_benchmark(tmp_path: Path) -> None:
+    """Test the command saves results for every benchmark."""
+    output = tmp_path / "baseline.json"
+    Item.objects.bulk_create([Item(name=f"Item{i}", price=1) for i in range(30)])
+
+    call_command("benchmark", sizes=[30], repeat=2, output=str(output))
+
+    saved = json.loads(output.read_text())
+    assert set(saved["sizes"]["30"]) == set(BENCHMARKS)
+    assert saved["sizes"]["30"]["sync.all"]["rows_per_second"] > 0
+    assert saved["sizes"]["30"]["api.list"]["p95_ms"] > 0
+    # The sync benchmarks leave no trace.
+    assert not Item.objects.filter(price_at_sync__isnull=False).exists()
+    assert not ItemPriceHistory.objects.exists()
+
+
+def test_benchmark_connections_command_compares_modes(
+    tmp_path: Path, django_db_setup: None, django_db_blocker: Any
+) -> None:
+    """Test every connection mode is measured and its connection removed."""
+    pytest.importorskip("psycopg_pool")
+    output = tmp_path / "connections.json"
+
+    # Outside a test case: those refuse databases added after they start.
+    # The benchmark only runs SELECT 1.
+    with django_db_blocker.unblock():
+        call_command("benchmark_connections", repeat=3, output=str(output))
+
+    saved = json.loads(output.read_text())
+    assert set(saved["modes"]) == set(CONNECTION_MODES)
+    assert all(mode["p95_ms"] > 0 for mode in saved["modes"].values())
+    assert CONNECTION_BENCHMARK_ALIAS not in connections.settings
+
+
+@pytest.mark.django_db
+def test_seed_items_tops_up_the_table() -> None:
+    """Test seeding only adds the missing rows and never removes any."""
+    Item.objects.bulk_create([Item(name=f"Item{i}", price=1) for i in range(5)])
+
+    assert seed_items(12) == 12
+    assert seed_items(3) == 12
+
+
+@pytest.mark.django_db
+def test_benchmark_command_fails_on_regression(tmp_path: Path) -> None:
+    """Test comparing against a much faster baseline reports the regression."""
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(
+        json.dumps(results(**{"api.list": {"median_ms": 1e-6, "p95_ms": 1e6}}))
+    )
+    Item.objects.bulk_create([Item(name=f"Item{i}", price=1) for i in range(1000)])
+
+    with pytest.raises(CommandError, match="1 metrics regressed"):
+        call_command(
+            "benchmark",
+            sizes=[1000],
+            repeat=2,
+            only=["api.list"],
+            compare=str(baseline),
+        )
+
+
+def test_compare_results_direction_and_threshold() -> None:
+    """Test latencies regress upwards, rates downwards, beyond the threshold."""
+    baseline = results(
+        **{
+            "api.list": {"median_ms": 10.0, "p95_ms": 20.0},
+            "sync.all": {"rows_per_second": 1000, "peak_mb": 10.0},
+        }
+    )
+    current = results(
+        **{
+            "api.list": {"median_ms": 11.0, "p95_ms": 30.0},
+            "sync.all": {"rows_per_second": 700, "peak_mb": 5.0},
+            "sync.item": {"median_ms": 50.0},
+        }
+    )
+
+    regressions = compare_results(baseline, current, threshold=0.2)
+
+    assert [(row["benchmark"], row["metric"]) for row in regressions] == [
+        ("api.list", "p95_ms"),
+        ("sync.all", "rows_per_second"),
+    ]
+    assert regressions[0]["change"] == 0.5
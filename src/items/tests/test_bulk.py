@@ -0,0 +1,170 @@
+from decimal import Decimal
+from typing import List
+from unittest.mock import MagicMock
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from items.models import Item
+
+
+@pytest.fixture
+def items(db) -> List[Item]:
+    """Create three items without triggering price syncs."""
+    return Item.objects.bulk_create(
+        [Item(name=f"Item{i}", price=Decimal(f"{i + 1}.00")) for i in range(3)]
+    )
+
+
+def bulk_url(atomic: bool = True) -> str:
+    url = reverse("item-bulk")
+    return url if atomic else f"{url}?atomic=false"
+
+
+def statuses(response) -> List[str]:
+    return [result["status"] for result in response.data["results"]]
+
+
+def test_bulk_create_inserts_all_items(
+    authenticated_client: APIClient, sync_delay: MagicMock
+) -> None:
+    """Test valid entries are inserted with one INSERT and reported per item."""
+    payload = [{"name": f"New{i}", "price": "1.00"} for i in range(5)]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = authenticated_client.post(bulk_url(), payload, format="json")
+
+    assert response.status_code == 201
+    assert statuses(response) == ["created"] * 5
+    assert Item.objects.count() == 5
+    inserts = [q for q in queries if q["sql"].startswith('INSERT INTO "items_item"')]
+    assert len(inserts) == 1
+    assert response.data["results"][0]["item"]["name"] == "New0"
+
+
+def test_bulk_create_atomic_rejects_everything_on_error(
+    authenticated_client: APIClient, sync_delay: MagicMock
+) -> None:
+    """Test one invalid entry fails the whole atomic request."""
+    payload = [{"name": "Good", "price": "1.00"}, {"name": "Bad", "price": "-1"}]
+
+    response = authenticated_client.post(bulk_url(), payload, format="json")
+
+    assert response.status_code == 400
+    assert statuses(response) == ["skipped", "error"]
+    assert "price" in response.data["results"][1]["errors"]
+    assert not Item.objects.exists()
+
+
+def test_bulk_create_best_effort_keeps_valid_items(
+    authenticated_client: APIClient, sync_delay: MagicMock
+) -> None:
+    """Test best-effort mode inserts the valid entries and reports the rest."""
+    payload = [{"name": "Good", "price": "1.00"}, {"price": "1.00"}]
+
+    response = authenticated_client.post(bulk_url(False), payload, format="json")
+
+    assert response.status_code == 207
+    assert statuses(response) == ["created", "error"]
+    assert list(Item.objects.values_list("name", flat=True)) == ["Good"]
+
+
+def test_bulk_partial_update(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test PATCH updates only the given fields, in one UPDATE."""
+    payload = [
+        {"id": items[0].pk, "price": "10.00"},
+        {"id": items[1].pk, "name": "Renamed"},
+    ]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = authenticated_client.patch(bulk_url(), payload, format="json")
+
+    assert response.status_code == 200
+    assert statuses(response) == ["updated", "updated"]
+    updates = [q for q in queries if q["sql"].startswith('UPDATE "items_item"')]
+    assert len(updates) == 1
+    items[0].refresh_from_db()
+    items[1].refresh_from_db()
+    assert items[0].price == Decimal("10.00")
+    assert items[1].name == "Renamed"
+    assert items[1].updated_at > items[2].updated_at
+
+
+def test_bulk_full_update_requires_all_fields(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test PUT validates entries as full updates."""
+    payload = [
+        {"id": items[0].pk, "name": "Full", "price": "2.00"},
+        {"id": items[1].pk, "name": "Missing price"},
+        {"id": 999999, "name": "Unknown", "price": "1.00"},
+    ]
+
+    response = authenticated_client.put(bulk_url(False), payload, format="json")
+
+    assert response.status_code == 207
+    assert statuses(response) == ["updated", "error", "error"]
+    assert response.data["results"][2]["errors"] == {"id": ["Not found."]}
+    assert Item.objects.get(pk=items[0].pk).name == "Full"
+    assert Item.objects.get(pk=items[1].pk).name == "Item1"
+
+
+def test_bulk_delete_in_one_statement(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test DELETE removes the listed IDs with a single statement."""
+    ids = [items[0].pk, items[2].pk]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = authenticated_client.delete(bulk_url(), ids, format="json")
+
+    assert response.status_code == 200
+    assert statuses(response) == ["deleted", "deleted"]
+    deletes = [q for q in queries if "DELETE" in q["sql"]]
+    assert len(deletes) == 1
+    assert list(Item.objects.values_list("pk", flat=True)) == [items[1].pk]
+
+
+def test_bulk_delete_atomic_rolls_back_on_unknown_id(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test an unknown ID rolls an atomic delete back."""
+    ids = [items[0].pk, 999999]
+
+    response = authenticated_client.delete(bulk_url(), ids, format="json")
+
+    assert response.status_code == 400
+    assert statuses(response) == ["skipped", "error"]
+    assert Item.objects.count() == 3
+
+
+def test_bulk_delete_best_effort_reports_bad_ids(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test best-effort deletes skip unknown, repeated and malformed IDs."""
+    ids = [items[0].pk, items[0].pk, 999999, "abc"]
+
+    response = authenticated_client.delete(bulk_url(False), ids, format="json")
+
+    assert response.status_code == 207
+    assert statuses(response) == ["deleted", "error", "error", "error"]
+    assert response.data["results"][1]["errors"] == {"id": ["Duplicate id in request."]}
+    assert Item.objects.count() == 2
+
+
+def test_bulk_rejects_non_list_and_oversized_bodies(
+    authenticated_client: APIClient, settings
+) -> None:
+    """Test the body must be a list within ITEMS_BULK_MAX_ITEMS."""
+    settings.ITEMS_BULK_MAX_ITEMS = 2
+
+    response = authenticated_client.post(bulk_url(), {"name": "x"}, format="json")
+    assert response.status_code == 400
+
+    response = authenticated_client.delete(bulk_url(), [1, 2, 3], format="json")
+    assert response.status_code == 400
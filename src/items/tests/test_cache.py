@@ -0,0 +1,234 @@
+import time
+from decimal import Decimal
+from typing import Callable, ContextManager, Dict
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.cache import caches
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from items.cache import LIST_GENERATION, stats
+from items.models import Item
+from items.utils.price_sync import sync_all_items
+
+
+@pytest.fixture
+def commit_callbacks(
+    mocker: MagicMock,
+    django_capture_on_commit_callbacks: Callable[..., ContextManager[list]],
+) -> Callable[[], ContextManager[list]]:
+    """
+    Run on_commit callbacks, which carry the cache invalidation.
+    Writes made outside of it stay uncommitted as far as the cache can tell.
+    """
+    mocker.patch("items.utils.sync_dispatch.sync_external_prices_for_items.delay")
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
+def snapshot() -> Dict[str, int]:
+    return stats.snapshot()
+
+
+@pytest.mark.django_db
+def test_list_is_served_from_local_then_shared_cache(
+    authenticated_client: APIClient,
+) -> None:
+    """Test misses fill both tiers and later reads hit them in order."""
+    Item.objects.create(name="Item", price=Decimal("1.00"))
+    url = reverse("item-list")
+
+    first = authenticated_client.get(url)
+    second = authenticated_client.get(url)
+    caches["local"].clear()
+    third = authenticated_client.get(url)
+
+    assert first.data == second.data == third.data
+    assert snapshot() == {"local_hits": 1, "shared_hits": 1, "misses": 1}
+
+
+@pytest.mark.django_db
+def test_local_hits_skip_the_shared_cache(
+    authenticated_client: APIClient, mocker: MagicMock, settings
+) -> None:
+    """Test a warm local tier answers without reading generation tokens."""
+    settings.ITEMS_RESPONSE_CACHE = {
+        **settings.ITEMS_RESPONSE_CACHE,
+        "GENERATION_TIMEOUT": 60,
+    }
+    item = Item.objects.create(name="Item", price=Decimal("1.00"))
+    url = reverse("item-detail", args=[item.id])
+    authenticated_client.get(url)
+    get_many = mocker.spy(caches["default"], "get_many")
+
+    authenticated_client.get(url)
+
+    get_many.assert_not_called()
+    assert snapshot()["local_hits"] == 1
+
+
+@pytest.mark.django_db
+def test_other_processes_writes_show_after_generation_timeout(
+    authenticated_client: APIClient, settings
+) -> None:
+    """Test a token bumped elsewhere is picked up once the local copy expires."""
+    settings.ITEMS_RESPONSE_CACHE = {
+        **settings.ITEMS_RESPONSE_CACHE,
+        "GENERATION_TIMEOUT": 0.05,
+    }
+    url = reverse("item-list")
+    authenticated_client.get(url)
+    # Another process invalidates lists through the shared cache only.
+    caches["default"].set(LIST_GENERATION, "bumped")
+
+    authenticated_client.get(url)
+    time.sleep(0.1)
+    authenticated_client.get(url)
+
+    assert snapshot() == {"local_hits": 1, "shared_hits": 0, "misses": 2}
+
+
+@pytest.mark.django_db
+def test_list_cache_key_only_uses_relevant_params(
+    authenticated_client: APIClient,
+) -> None:
+    """Test unrelated params share an entry while search/ordering do not."""
+    url = reverse("item-list")
+
+    authenticated_client.get(url)
+    authenticated_client.get(url, {"utm_source": "newsletter"})
+    authenticated_client.get(url, {"search": "lamp"})
+    authenticated_client.get(url, {"ordering": "price"})
+    authenticated_client.get(url, {"ordering": "price", "page": 1})
+
+    assert snapshot() == {"local_hits": 1, "shared_hits": 0, "misses": 4}
+
+
+@pytest.mark.django_db
+def test_writes_invalidate_lists(
+    authenticated_client: APIClient, commit_callbacks
+) -> None:
+    """Test that creating, updating and deleting items refreshes lists."""
+    url = reverse("item-list")
+    with commit_callbacks():
+        item = Item.objects.create(name="Before", price=Decimal("1.00"))
+    assert authenticated_client.get(url).data["results"][0]["name"] == "Before"
+
+    with commit_callbacks():
+        authenticated_client.patch(
+            reverse("item-detail", args=[item.id]), {"name": "After"}, format="json"
+        )
+    assert authenticated_client.get(url).data["results"][0]["name"] == "After"
+
+    with commit_callbacks():
+        authenticated_client.delete(reverse("item-detail", args=[item.id]))
+    assert authenticated_client.get(url).data["count"] == 0
+
+
+@pytest.mark.django_db
+def test_detail_invalidation_is_per_item(
+    authenticated_client: APIClient, commit_callbacks
+) -> None:
+    """Test that saving one item leaves other items' entries cached."""
+    with commit_callbacks():
+        first = Item.objects.create(name="First", price=Decimal("1.00"))
+        second = Item.objects.create(name="Second", price=Decimal("1.00"))
+    authenticated_client.get(reverse("item-detail", args=[first.id]))
+    authenticated_client.get(reverse("item-detail", args=[second.id]))
+
+    with commit_callbacks():
+        first.name = "First renamed"
+        first.save()
+    stats.reset()
+    first_data = authenticated_client.get(reverse("item-detail", args=[first.id]))
+    authenticated_client.get(reverse("item-detail", args=[second.id]))
+
+    assert first_data.data["name"] == "First renamed"
+    assert snapshot() == {"local_hits": 1, "shared_hits": 0, "misses": 1}
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("in_database", [False, True])
+def test_price_sync_invalidates_cached_items(
+    authenticated_client: APIClient, commit_callbacks, in_database: bool
+) -> None:
+    """Test that bulk syncs refresh cached lists and details."""
+    with commit_callbacks():
+        item = Item.objects.create(name="Item", price=Decimal("100.00"))
+    detail_url = reverse("item-detail", args=[item.id])
+    assert authenticated_client.get(detail_url).data["external_price"] == "0.00"
+
+    with commit_callbacks():
+        sync_all_items(in_database=in_database)
+
+    assert authenticated_client.get(detail_url).data["external_price"] != "0.00"
+
+
+@pytest.mark.django_db
+def test_detail_entries_use_the_resolved_id(
+    authenticated_client: APIClient, commit_callbacks
+) -> None:
+    """Test a padded ID shares the entry that writes to the item invalidate."""
+    with commit_callbacks():
+        item = Item.objects.create(name="Before", price=Decimal("1.00"))
+    padded_url = f"{reverse('item-list')}0{item.id}/"
+    assert authenticated_client.get(padded_url).data["name"] == "Before"
+
+    with commit_callbacks():
+        authenticated_client.patch(
+            reverse("item-detail", args=[item.id]), {"name": "After"}, format="json"
+        )
+
+    assert authenticated_client.get(padded_url).data["name"] == "After"
+
+
+@pytest.mark.django_db
+def test_detail_entries_depend_on_filters(authenticated_client: APIClient) -> None:
+    """Test a filter excluding the item gets a 404, not the cached item."""
+    item = Item.objects.create(name="Item", price=Decimal("1.00"))
+    url = reverse("item-detail", args=[item.id])
+
+    assert authenticated_client.get(url).status_code == 200
+    assert authenticated_client.get(url, {"price__gte": "100"}).status_code == 404
+    assert authenticated_client.get(url, {"utm_source": "mail"}).status_code == 200
+    assert snapshot() == {"local_hits": 1, "shared_hits": 0, "misses": 2}
+
+
+@pytest.mark.django_db
+def test_non_integer_ids_are_not_found(authenticated_client: APIClient) -> None:
+    """Test IDs that cannot match an item get a 404 without a cache lookup."""
+    response = authenticated_client.get(reverse("item-detail", args=["abc"]))
+
+    assert response.status_code == 404
+    assert response.data == {"detail": "No Item matches the given query."}
+    assert snapshot()["misses"] == 0
+
+
+@pytest.mark.django_db
+def test_missing_items_are_not_cached(authenticated_client: APIClient) -> None:
+    """Test that 404 responses are not stored."""
+    url = reverse("item-detail", args=[0])
+
+    assert authenticated_client.get(url).status_code == 404
+    assert authenticated_client.get(url).status_code == 404
+    assert snapshot()["misses"] == 2
+
+
+@pytest.mark.django_db
+def test_cache_stats_endpoint(authenticated_client: APIClient) -> None:
+    """Test that hit and miss counters are exposed."""
+    authenticated_client.get(reverse("item-list"))
+
+    response = authenticated_client.get(reverse("item-cache-stats"))
+
+    assert response.data == {"local_hits": 0, "shared_hits": 0, "misses": 1}
+
+
+@pytest.mark.django_db
+def test_cache_can_be_disabled(authenticated_client: APIClient, settings) -> None:
+    """Test that reads bypass the cache when it is disabled."""
+    settings.ITEMS_RESPONSE_CACHE = {**settings.ITEMS_RESPONSE_CACHE, "ENABLED": False}
+
+    authenticated_client.get(reverse("item-list"))
+
+    assert snapshot() == {"local_hits": 0, "shared_hits": 0, "misses": 0}
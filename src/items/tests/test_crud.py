@@ -1,5 +1,5 @@
 from typing import Callable
-from unittest.mock import patch
+from unittest.mock import ANY, patch
 
 import pytest
 from django.contrib.auth.models import User
@@ -103,7 +103,7 @@ def test_delete_item(
 
 
 @pytest.mark.django_db
-@patch("items.views.simulate_external_price_sync_for_item.delay")
+@patch("items.views.simulate_external_price_sync_for_item.apply_async")
 def test_sync_price(
     mock_task_delay, authenticated_client: APIClient, create_item: Callable[..., Item]
 ) -> None:
@@ -117,11 +117,11 @@ def test_sync_price(
 
     assert response.status_code == status.HTTP_202_ACCEPTED
     assert response.data["task_id"] == "fake-task-id"
-    mock_task_delay.assert_called_once_with(item.id)
+    mock_task_delay.assert_called_once_with((item.id,), task_id=ANY)
 
 
 @pytest.mark.django_db
-@patch("items.views.hourly_external_price_sync.delay")
+@patch("items.views.hourly_external_price_sync.apply_async")
 def test_sync_all_prices(mock_task_delay, authenticated_client: APIClient) -> None:
     """Test syncing prices for all items."""
     mock_task_delay.reset_mock()
@@ -136,13 +136,10 @@ def test_sync_all_prices(mock_task_delay, authenticated_client: APIClient) -> No
 
 
 @pytest.mark.django_db
-@patch("items.views.AsyncResult")
-def test_task_status(mock_async_result, authenticated_client: APIClient) -> None:
+@patch("items.utils.task_status.read_task_metas")
+def test_task_status(mock_read_metas, authenticated_client: APIClient) -> None:
     """Test checking the status of a Celery task."""
-    mock_result_instance = mock_async_result.return_value
-    mock_result_instance.status = "SUCCESS"
-    mock_result_instance.ready.return_value = True
-    mock_result_instance.result = "done"
+    mock_read_metas.return_value = [{"status": "SUCCESS", "result": "done"}]
 
     task_id = "fake-task-id"
     url = reverse("item-task-status", args=[task_id])
@@ -153,5 +150,6 @@ def test_task_status(mock_async_result, authenticated_client: APIClient) -> None
         "task_id": task_id,
         "status": "SUCCESS",
         "result": "done",
+        "progress": None,
     }
-    mock_async_result.assert_called_once_with(task_id)
+    mock_read_metas.assert_called_once_with([task_id])
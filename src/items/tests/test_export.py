@@ -0,0 +1,103 @@
+import csv
+import io
+import json
+from decimal import Decimal
+from typing import List
+
+import pytest
+from django.db.models.query import QuerySet
+from django.urls import reverse
+from pytest_django.fixtures import SettingsWrapper
+from pytest_mock import MockerFixture
+from rest_framework.test import APIClient
+
+from items.models import Item
+
+
+@pytest.fixture
+def items(db) -> List[Item]:
+    """Create five items with increasing prices."""
+    return [
+        Item.objects.create(
+            name=f"Widget {i}" if i % 2 else f"Gadget {i}",
+            description=None if i == 0 else f"Item number {i}",
+            price=Decimal(f"{i + 1}.50"),
+        )
+        for i in range(5)
+    ]
+
+
+def read_stream(response) -> str:
+    return b"".join(response.streaming_content).decode("utf-8")
+
+
+def test_export_streams_ndjson_matching_the_api(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test each NDJSON line equals the item's detail representation."""
+    response = authenticated_client.get(reverse("item-export"), {"ordering": "price"})
+
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "application/x-ndjson"
+    lines = read_stream(response).splitlines()
+    details = [
+        authenticated_client.get(reverse("item-detail", args=[item.pk])).json()
+        for item in items
+    ]
+    assert [json.loads(line) for line in lines] == details
+
+
+def test_export_streams_csv_with_header(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test CSV export has a header row and renders nulls as empty cells."""
+    response = authenticated_client.get(
+        reverse("item-export"), {"export_format": "csv", "ordering": "price"}
+    )
+
+    assert response["Content-Type"] == "text/csv"
+    assert 'filename="items.csv"' in response["Content-Disposition"]
+    rows = list(csv.DictReader(io.StringIO(read_stream(response))))
+    assert [row["id"] for row in rows] == [str(item.pk) for item in items]
+    assert rows[0]["description"] == ""
+    assert rows[0]["price"] == "1.50"
+
+
+def test_export_honors_filters_search_and_ordering(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test the export applies the same backends as the list endpoint."""
+    response = authenticated_client.get(
+        reverse("item-export"), {"search": "widget", "ordering": "-price"}
+    )
+    ids = [json.loads(line)["id"] for line in read_stream(response).splitlines()]
+    assert ids == [items[3].pk, items[1].pk]
+
+    response = authenticated_client.get(reverse("item-export"), {"price": "3.50"})
+    ids = [json.loads(line)["id"] for line in read_stream(response).splitlines()]
+    assert ids == [items[2].pk]
+
+
+def test_export_reads_through_a_chunked_cursor(
+    authenticated_client: APIClient,
+    items: List[Item],
+    settings: SettingsWrapper,
+    mocker: MockerFixture,
+) -> None:
+    """Test rows are fetched with iterator() using the configured fetch size."""
+    settings.ITEMS_EXPORT_CHUNK_SIZE = 2
+    spy = mocker.spy(QuerySet, "iterator")
+
+    response = authenticated_client.get(reverse("item-export"))
+
+    assert len(read_stream(response).splitlines()) == len(items)
+    assert spy.call_args.kwargs == {"chunk_size": 2}
+
+
+def test_export_rejects_unknown_format(authenticated_client: APIClient) -> None:
+    """Test an unsupported export format is a 400."""
+    response = authenticated_client.get(
+        reverse("item-export"), {"export_format": "xml"}
+    )
+    assert response.status_code == 400
@@ -0,0 +1,185 @@
+import re
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, List
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from items.filters import ItemFilter
+from items.models import Item
+
+NOW = timezone.now()
+
+# Each filter matches well under 1% of the rows made by populated_table.
+FILTERS: Dict[str, Dict[str, str]] = {
+    "price": {"price__gte": "10", "price__lte": "20"},
+    "external_price": {"external_price__gte": "9950"},
+    "created_at": {"created_at__gte": (NOW - timedelta(days=7)).isoformat()},
+    "updated_at": {
+        "updated_at__gte": (NOW - timedelta(days=1)).isoformat(),
+        "updated_at__lt": NOW.isoformat(),
+    },
+    "ids": {"id__in": "1,2,3"},
+}
+
+# The column each filter must find through an index.
+COLUMNS = {
+    "price": "price",
+    "external_price": "external_price",
+    "created_at": "created_at",
+    "updated_at": "updated_at",
+    "ids": "id",
+}
+
+PLAN_ROWS = 10000
+
+
+@pytest.fixture
+def items(db) -> List[Item]:
+    """Create items spread over prices and creation dates."""
+    items = Item.objects.bulk_create(
+        [
+            Item(name=f"Item{i}", price=Decimal(10 * i), external_price=Decimal(i))
+            for i in range(4)
+        ]
+    )
+    for age, item in enumerate(items):
+        Item.objects.filter(pk=item.pk).update(
+            created_at=NOW - timedelta(days=10 * age)
+        )
+    return items
+
+
+def names(client: APIClient, params: Dict[str, str]) -> List[str]:
+    response = client.get(reverse("item-list"), params)
+    assert response.status_code == 200, response.data
+    return sorted(row["name"] for row in response.data["results"])
+
+
+def test_price_range(authenticated_client: APIClient, items: List[Item]) -> None:
+    """Test price bounds are inclusive."""
+    params = {"price__gte": "10", "price__lte": "20"}
+
+    assert names(authenticated_client, params) == ["Item1", "Item2"]
+
+
+def test_external_price_range(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test external_price bounds."""
+    params = {"external_price__lte": "1"}
+
+    assert names(authenticated_client, params) == ["Item0", "Item1"]
+
+
+def test_created_at_window(authenticated_client: APIClient, items: List[Item]) -> None:
+    """Test created_at windows are half-open."""
+    params = {
+        "created_at__gte": (NOW - timedelta(days=25)).isoformat(),
+        "created_at__lt": (NOW - timedelta(days=10)).isoformat(),
+    }
+
+    assert names(authenticated_client, params) == ["Item2"]
+
+
+def test_updated_at_window(authenticated_client: APIClient, items: List[Item]) -> None:
+    """Test updated_at windows."""
+    Item.objects.filter(pk=items[0].pk).update(updated_at=NOW - timedelta(days=3))
+
+    params = {"updated_at__lt": (NOW - timedelta(days=1)).isoformat()}
+
+    assert names(authenticated_client, params) == ["Item0"]
+
+
+def test_ids_in(authenticated_client: APIClient, items: List[Item]) -> None:
+    """Test a comma-separated ID list."""
+    params = {"id__in": f"{items[1].pk},{items[3].pk}"}
+
+    assert names(authenticated_client, params) == ["Item1", "Item3"]
+
+
+def test_filters_combine_with_keyset_pagination(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test filters narrow cursor-paginated listings too."""
+    params = {"cursor": "", "ordering": "price", "price__gte": "10"}
+
+    response = authenticated_client.get(reverse("item-list"), params)
+
+    assert [row["name"] for row in response.data["results"]] == [
+        "Item1",
+        "Item2",
+        "Item3",
+    ]
+
+
+def test_invalid_filter_value_is_rejected(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test malformed values are a 400, not an unfiltered listing."""
+    response = authenticated_client.get(
+        reverse("item-list"), {"created_at__gte": "yesterday"}
+    )
+
+    assert response.status_code == 400
+
+
+@pytest.fixture
+def populated_table(db) -> None:
+    """
+    Fill the table with PLAN_ROWS items, one price, external price, hour of
+    creation and ten minutes of update apart, and ANALYZE it, so the planner
+    sees realistic selectivities.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO {Item._meta.db_table}
+                (name, price, external_price, created_at, updated_at)
+            SELECT 'Item' || i, i, i,
+                   %(now)s - i * interval '1 hour',
+                   %(now)s - i * interval '10 minutes'
+            FROM generate_series(1, %(rows)s) AS i
+            """,
+            {"now": NOW, "rows": PLAN_ROWS},
+        )
+        cursor.execute(f"ANALYZE {Item._meta.db_table}")
+
+
+def index_conditions(plan: str) -> str:
+    """The Index Cond lines of a plan, from index and bitmap index scans."""
+    return "\n".join(line for line in plan.splitlines() if "Index Cond:" in line)
+
+
+def uses_index_on(plan: str, column: str) -> bool:
+    return re.search(rf"\b{column}\b", index_conditions(plan)) is not None
+
+
+@pytest.mark.parametrize("ordering", ["-created_at", "created_at", "price", "-price"])
+@pytest.mark.parametrize("combination", list(FILTERS))
+def test_each_filter_is_an_index_condition(
+    populated_table: None, combination: str, ordering: str
+) -> None:
+    """Test every filter, under every ordering, is looked up in its index."""
+    direction = "-" if ordering.startswith("-") else ""
+    queryset = ItemFilter(FILTERS[combination], queryset=Item.objects.all()).qs
+    plan = queryset.order_by(ordering, f"{direction}pk")[:20].explain()
+
+    assert "Seq Scan" not in plan, plan
+    assert uses_index_on(plan, COLUMNS[combination]), plan
+
+
+@pytest.mark.parametrize("ordering", ["-created_at", "price"])
+def test_combined_filters_use_an_index(populated_table: None, ordering: str) -> None:
+    """Test combining every filter still looks one of them up in its index."""
+    data = {key: value for params in FILTERS.values() for key, value in params.items()}
+    direction = "-" if ordering.startswith("-") else ""
+    queryset = ItemFilter(data, queryset=Item.objects.all()).qs
+    plan = queryset.order_by(ordering, f"{direction}pk")[:20].explain()
+
+    assert "Seq Scan" not in plan, plan
+    assert any(uses_index_on(plan, column) for column in COLUMNS.values()), plan
@@ -0,0 +1,58 @@
+import io
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.utils import timezone
+
+from items.models import Item
+from items.utils.item_generator import generate_items, generate_rows
+
+
+@pytest.mark.django_db
+def test_generate_items_command_writes_requested_count() -> None:
+    """Test the command loads the requested number of rows in batches."""
+    out = io.StringIO()
+
+    call_command(
+        "generate_items", count=25, batch_size=10, workers=1, seed=7, stdout=out
+    )
+
+    assert Item.objects.count() == 25
+    assert "Successfully created 25 items" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_generate_items_is_reproducible_from_seed() -> None:
+    """Test the same seed and batch size produce the same rows."""
+    list(generate_items(12, batch_size=5, seed=42))
+    first = list(Item.objects.order_by("pk").values_list("name", "price"))
+    Item.objects.all().delete()
+
+    list(generate_items(12, batch_size=5, seed=42))
+    second = list(Item.objects.order_by("pk").values_list("name", "price"))
+
+    assert first == second
+
+
+@pytest.mark.parametrize("distribution", ["uniform", "recent", "normal"])
+def test_created_at_stays_within_window(distribution: str) -> None:
+    """Test every distribution keeps timestamps inside the window."""
+    end = timezone.now()
+    start = end - timedelta(days=30)
+
+    rows = generate_rows(500, seed=1, start=start, end=end, distribution=distribution)
+
+    created = [row[4] for row in rows]
+    assert all(start.isoformat() <= value <= end.isoformat() for value in created)
+
+
+def test_recent_distribution_skews_towards_now() -> None:
+    """Test the recent distribution puts most rows in the newest fifth."""
+    end = timezone.now()
+    start = end - timedelta(days=100)
+    cutoff = (end - timedelta(days=20)).isoformat()
+
+    rows = generate_rows(1000, seed=1, start=start, end=end, distribution="recent")
+
+    assert sum(row[4] >= cutoff for row in rows) > 500
@@ -0,0 +1,187 @@
+import io
+import json
+from decimal import Decimal
+from typing import Callable, ContextManager
+from unittest.mock import MagicMock
+
+import pytest
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from items.models import Item
+from items.utils.bulk_import import import_items
+
+
+@pytest.fixture
+def committed(
+    sync_delay: MagicMock,
+    django_capture_on_commit_callbacks: Callable[..., ContextManager[list]],
+) -> Callable[[], ContextManager[list]]:
+    """Run on_commit callbacks, which dispatch the price sync."""
+    return lambda: django_capture_on_commit_callbacks(execute=True)
+
+
+def ndjson(*records: dict) -> io.StringIO:
+    return io.StringIO("".join(json.dumps(record) + "\n" for record in records))
+
+
+@pytest.mark.django_db
+def test_csv_import_creates_items_and_reports_bad_rows(
+    committed: Callable[[], ContextManager[list]], sync_delay: MagicMock
+) -> None:
+    """Test valid rows are created and each invalid row gets its own error."""
+    stream = io.StringIO(
+        "name,description,price\n"
+        'Widget,"Has, a comma",1.50\n'
+        "Gadget,,2.00\n"
+        ",Missing name,3.00\n"
+        "Negative,,-1.00\n"
+        'Quoted,"Say ""hi""",4.00\n'
+    )
+
+    with committed():
+        report = import_items(stream, "csv", batch_size=2)
+
+    assert report.created == 3
+    assert [error["row"] for error in report.errors] == [3, 4]
+    assert "name" in report.errors[0]["errors"]
+    assert "price" in report.errors[1]["errors"]
+
+    widget = Item.objects.get(name="Widget")
+    assert widget.description == "Has, a comma"
+    assert widget.external_price == Decimal("0.00")
+    assert Item.objects.get(name="Gadget").description is None
+    assert Item.objects.get(name="Quoted").description == 'Say "hi"'
+
+    # One batched dispatch for all created items, not one task per row.
+    sync_delay.assert_called_once()
+    assert sorted(sync_delay.call_args.args[0]) == sorted(
+        Item.objects.values_list("pk", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_ndjson_import_upserts_by_id(
+    committed: Callable[[], ContextManager[list]], sync_delay: MagicMock
+) -> None:
+    """Test rows with an existing id update it and keep omitted external prices."""
+    # bulk_create skips the post_save signal that would queue its own sync.
+    [existing] = Item.objects.bulk_create(
+        [Item(name="Old", price=Decimal("1.00"), external_price=Decimal("9.99"))]
+    )
+    new_id = existing.pk + 100
+
+    with committed():
+        report = import_items(
+            ndjson(
+                {"id": existing.pk, "name": "Renamed", "price": "2.00"},
+                {"id": new_id, "name": "Explicit", "price": "3.00"},
+                {"id": new_id, "name": "Duplicate", "price": "4.00"},
+            ),
+            "ndjson",
+        )
+
+    assert (report.created, report.updated) == (1, 1)
+    assert report.errors == [{"row": 3, "errors": {"id": ["Duplicate id in import."]}}]
+    existing.refresh_from_db()
+    assert (existing.name, existing.price) == ("Renamed", Decimal("2.00"))
+    assert existing.external_price == Decimal("9.99")
+    sync_delay.assert_called_once_with([new_id])
+
+    # The identity sequence was moved past the explicit ID.
+    assert Item.objects.create(name="Next", price=Decimal("1.00")).pk > new_id
+
+
+@pytest.mark.django_db
+def test_import_mixes_explicit_ids_and_new_rows(sync_delay: MagicMock) -> None:
+    """Test a row without an id never takes an explicit id of its batch."""
+    [existing] = Item.objects.bulk_create([Item(name="Old", price=Decimal("1.00"))])
+    # The value the identity sequence would hand out next.
+    next_id = existing.pk + 1
+
+    report = import_items(
+        ndjson(
+            {"id": next_id, "name": "Explicit", "price": "2.00"},
+            {"name": "Generated", "price": "3.00"},
+        ),
+        "ndjson",
+    )
+
+    assert (report.created, report.updated, report.errors) == (2, 0, [])
+    assert Item.objects.get(pk=next_id).name == "Explicit"
+    assert Item.objects.get(name="Generated").pk > next_id
+
+
+@pytest.mark.django_db
+def test_ndjson_import_reports_unparseable_lines(sync_delay: MagicMock) -> None:
+    """Test malformed JSON lines are reported without failing the import."""
+    stream = io.StringIO('{"name": "Ok", "price": "1.00"}\n{oops\n\n[1, 2]\n')
+
+    report = import_items(stream, "ndjson")
+
+    assert report.created == 1
+    assert [error["row"] for error in report.errors] == [2, 4]
+
+
+@pytest.mark.django_db
+def test_import_action_accepts_uploads(
+    authenticated_client: APIClient, sync_delay: MagicMock
+) -> None:
+    """Test the API action imports an uploaded file and returns the report."""
+    upload = SimpleUploadedFile(
+        "items.ndjson", b'{"name": "Uploaded", "price": "5.00"}\n{"name": ""}\n'
+    )
+
+    response = authenticated_client.post(
+        reverse("item-bulk-import"), {"file": upload}, format="multipart"
+    )
+
+    assert response.status_code == 200
+    assert response.data["created"] == 1
+    assert response.data["failed"] == 1
+    assert Item.objects.filter(name="Uploaded").exists()
+
+
+@pytest.mark.django_db
+def test_import_action_rejects_invalid_utf8_before_writing(
+    authenticated_client: APIClient, sync_delay: MagicMock, settings
+) -> None:
+    """Test a bad byte late in the upload fails it before any batch commits."""
+    settings.ITEMS_IMPORT_BATCH_SIZE = 100
+    # Past the first chunk the text stream decodes.
+    rows = b"".join(b"Item%d,1.00\n" % i for i in range(1000))
+    upload = SimpleUploadedFile("items.csv", b"name,price\n" + rows + b"Bad\xff,3.00\n")
+
+    response = authenticated_client.post(
+        reverse("item-bulk-import"), {"file": upload}, format="multipart"
+    )
+
+    assert response.status_code == 400
+    assert response.data == {"file": "The file is not valid UTF-8."}
+    assert not Item.objects.exists()
+    sync_delay.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_import_action_requires_authentication() -> None:
+    """Test anonymous clients cannot import."""
+    upload = SimpleUploadedFile("items.csv", b"name,price\nItem,1.00\n")
+    response = APIClient().post(
+        reverse("item-bulk-import"), {"file": upload}, format="multipart"
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_import_items_command(tmp_path, sync_delay: MagicMock) -> None:
+    """Test the management command imports a CSV file."""
+    path = tmp_path / "items.csv"
+    path.write_text("name,price,external_price\nA,1.00,1.10\nB,2.00,\n")
+    out = io.StringIO()
+
+    call_command("import_items", str(path), stdout=out)
+
+    assert "Created 2 and updated 0 items; 0 rows failed." in out.getvalue()
+    assert Item.objects.get(name="A").external_price == Decimal("1.10")
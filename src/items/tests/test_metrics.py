@@ -0,0 +1,120 @@
+import logging
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from backend.metrics import Histogram, render_metrics
+from backend.middleware import RequestMetricsMiddleware
+from items.models import Item
+
+
+def repeat_query(times: int):
+    def view(request):
+        with connection.cursor() as cursor:
+            for _ in range(times):
+                cursor.execute("SELECT 1")
+        return HttpResponse("ok")
+
+    return view
+
+
+def test_server_timing_breaks_down_request(authenticated_client: APIClient) -> None:
+    """Test the header reports SQL, serialization, rendering and the total."""
+    Item.objects.bulk_create([Item(name="A", price=Decimal("1.00"))])
+
+    response = authenticated_client.get(reverse("item-list"))
+
+    timing = response["Server-Timing"]
+    assert "sql;dur=" in timing and 'queries"' in timing
+    for phase in ("auth;dur=", "serialize;dur=", "render;dur=", "total;dur="):
+        assert phase in timing
+
+
+def test_metrics_endpoint_aggregates_per_view_and_action(
+    authenticated_client: APIClient, settings
+) -> None:
+    """Test latency histograms are labelled with the view and viewset action."""
+    settings.DEBUG = True
+    authenticated_client.get(reverse("item-list"))
+    authenticated_client.get(reverse("item-list"))
+
+    response = authenticated_client.get(reverse("metrics"))
+
+    body = response.content.decode()
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    assert "# TYPE http_request_duration_seconds histogram" in body
+    assert (
+        'http_request_duration_seconds_count{view="item-list",action="list"} 2' in body
+    )
+    assert 'http_requests_total{view="item-list",action="list",status="200"} 2' in body
+    assert 'phase="serialize"' in body
+
+
+def test_metrics_token(client, settings) -> None:
+    """Test /metrics can be restricted to a bearer token."""
+    settings.METRICS = {**settings.METRICS, "TOKEN": "secret"}
+
+    assert client.get(reverse("metrics")).status_code == 401
+    response = client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+    assert response.status_code == 200
+
+
+def test_metrics_without_token_need_debug(client, settings) -> None:
+    """Test /metrics is not served without a token unless DEBUG is on."""
+    settings.METRICS = {**settings.METRICS, "TOKEN": None}
+
+    settings.DEBUG = False
+    assert client.get(reverse("metrics")).status_code == 404
+    settings.DEBUG = True
+    assert client.get(reverse("metrics")).status_code == 200
+
+
+@pytest.mark.django_db
+def test_repeated_statement_is_reported(settings, caplog) -> None:
+    """Test a statement repeated past the threshold is logged as N+1."""
+    settings.METRICS = {**settings.METRICS, "N_PLUS_ONE_THRESHOLD": 3}
+    middleware = RequestMetricsMiddleware(repeat_query(3))
+
+    with caplog.at_level(logging.WARNING, logger="backend.middleware"):
+        response = middleware(RequestFactory().get("/"))
+
+    assert 'desc="3 queries"' in response["Server-Timing"]
+    assert "Possible N+1" in caplog.text
+    assert 'kind="n_plus_one"' in render_metrics()
+
+
+@pytest.mark.django_db
+def test_slow_query_is_reported(settings, caplog) -> None:
+    """Test queries over the slow query threshold are logged."""
+    settings.METRICS = {**settings.METRICS, "SLOW_QUERY_MS": 0}
+    middleware = RequestMetricsMiddleware(repeat_query(1))
+
+    with caplog.at_level(logging.WARNING, logger="backend.middleware"):
+        middleware(RequestFactory().get("/"))
+
+    assert "Slow query" in caplog.text
+    assert "Possible N+1" not in caplog.text
+
+
+def test_histogram_buckets_are_cumulative_and_ordered() -> None:
+    """Test the exposition lists cumulative buckets in ascending order."""
+    histogram = Histogram("test_histogram_seconds", "Test.", ["job"], [0.5, 10.0])
+    for value in (0.1, 2.0, 20.0):
+        histogram.observe(value, job="a")
+
+    lines = [line for line in render_metrics().splitlines() if "test_histogram" in line]
+
+    assert lines == [
+        "# HELP test_histogram_seconds Test.",
+        "# TYPE test_histogram_seconds histogram",
+        'test_histogram_seconds_bucket{job="a",le="0.5"} 1',
+        'test_histogram_seconds_bucket{job="a",le="10.0"} 2',
+        'test_histogram_seconds_bucket{job="a",le="+Inf"} 3',
+        'test_histogram_seconds_count{job="a"} 3',
+        'test_histogram_seconds_sum{job="a"} 22.1',
+    ]
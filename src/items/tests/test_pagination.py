@@ -0,0 +1,125 @@
+from datetime import timedelta
+from decimal import Decimal
+from typing import List, Optional
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from items.models import Item
+
+
+@pytest.fixture
+def items(db) -> List[Item]:
+    """Create 7 items; two share a created_at and three share a price."""
+    now = timezone.now()
+    prices = ["5.00", "1.00", "3.00", "3.00", "3.00", "2.00", "4.00"]
+    created = []
+    for i, price in enumerate(prices):
+        item = Item.objects.create(name=f"Item{i}", price=Decimal(price))
+        created_at = now - timedelta(minutes=min(i, 5))
+        Item.objects.filter(pk=item.pk).update(created_at=created_at)
+        created.append(item)
+    return created
+
+
+def collect_pages(client: APIClient, url: Optional[str]) -> List[List[int]]:
+    """Follow `next` links and return the IDs on each page."""
+    pages = []
+    while url:
+        response = client.get(url)
+        assert response.status_code == status.HTTP_200_OK
+        pages.append([row["id"] for row in response.data["results"]])
+        url = response.data["next"]
+    return pages
+
+
+def test_cursor_pagination_walks_created_at_with_id_tiebreaker(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    url = reverse("item-list") + "?pagination=cursor&page_size=3"
+
+    pages = collect_pages(authenticated_client, url)
+
+    expected = [
+        item.id
+        for item in sorted(
+            Item.objects.all(), key=lambda item: (item.created_at, item.id)
+        )
+    ][::-1]
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(pages, []) == expected
+
+
+def test_cursor_pagination_supports_price_ordering(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    url = reverse("item-list") + "?pagination=cursor&page_size=2&ordering=price"
+
+    pages = collect_pages(authenticated_client, url)
+
+    expected = [
+        item.id for item in sorted(items, key=lambda item: (item.price, item.id))
+    ]
+    assert sum(pages, []) == expected
+
+
+def test_cursor_pagination_previous_link(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    url = reverse("item-list") + "?pagination=cursor&page_size=3&ordering=-price"
+    first = authenticated_client.get(url).data
+    second = authenticated_client.get(first["next"]).data
+
+    back = authenticated_client.get(second["previous"]).data
+
+    assert first["previous"] is None
+    assert [row["id"] for row in back["results"]] == [
+        row["id"] for row in first["results"]
+    ]
+    assert back["previous"] is None
+
+
+def test_cursor_pagination_skips_count_query(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    url = reverse("item-list") + "?pagination=cursor&page_size=3"
+    next_url = authenticated_client.get(url).data["next"]
+
+    with CaptureQueriesContext(connection) as queries:
+        response = authenticated_client.get(next_url)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert not any("COUNT(" in query["sql"] for query in queries)
+
+
+def test_cursor_pagination_limits_page_size(
+    authenticated_client: APIClient, items: List[Item], settings
+) -> None:
+    settings.ITEMS_CURSOR_MAX_PAGE_SIZE = 2
+    url = reverse("item-list") + "?pagination=cursor&page_size=50"
+
+    response = authenticated_client.get(url)
+
+    assert len(response.data["results"]) == 2
+
+
+def test_invalid_cursor_returns_404(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    response = authenticated_client.get(reverse("item-list") + "?cursor=garbage")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+def test_page_number_pagination_is_the_default(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    response = authenticated_client.get(reverse("item-list"))
+
+    assert response.data["count"] == len(items)
+    assert len(response.data["results"]) == 5
@@ -0,0 +1,168 @@
+import threading
+import time
+from decimal import Decimal
+from typing import Dict, List, Sequence
+
+import pytest
+from django.core.exceptions import ImproperlyConfigured
+
+from items.models import Item
+from items.utils.price_client import CircuitBreaker, CircuitOpenError, PriceClient
+from items.utils.price_providers import (
+    PriceProvider,
+    PriceProviderError,
+    SimulatedPriceProvider,
+)
+from items.utils.price_sync import sync_all_items
+
+
+class RecordingProvider(PriceProvider):
+    """Provider that records batch sizes and peak concurrency."""
+
+    def __init__(self, host: str, latency: float = 0.02, max_batch_size: int = 10):
+        self.host = host
+        self.latency = latency
+        self.max_batch_size = max_batch_size
+        self.batches: List[int] = []
+        self.active = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        with self.lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.batches.append(len(items))
+        time.sleep(self.latency)
+        with self.lock:
+            self.active -= 1
+        return {item.pk: item.price * 2 for item in items}
+
+
+class FailingProvider(PriceProvider):
+    """Provider whose every call fails."""
+
+    def __init__(self, host: str) -> None:
+        self.host = host
+        self.calls = 0
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        self.calls += 1
+        raise PriceProviderError("boom")
+
+
+def make_items(count: int) -> List[Item]:
+    return [Item(pk=pk, price=Decimal("1.50")) for pk in range(1, count + 1)]
+
+
+def test_fetch_prices_batches_and_bounds_concurrency() -> None:
+    """Test items are batched and at most max_in_flight batches run at once."""
+    provider = RecordingProvider(host="test-bounded", max_batch_size=10)
+    client = PriceClient(provider, max_in_flight=3)
+
+    prices = client.fetch_prices(make_items(95))
+    client.close()
+
+    assert len(prices) == 95
+    assert prices[1] == Decimal("3.00")
+    assert sorted(provider.batches) == [5] + [10] * 9
+    assert provider.peak == 3
+
+
+def test_fetch_prices_runs_batches_concurrently() -> None:
+    """Test that latency overlaps across in-flight batches."""
+    provider = SimulatedPriceProvider(
+        min_latency=0.05, max_latency=0.05, max_batch_size=1, host="test-concurrent"
+    )
+    client = PriceClient(provider, max_in_flight=10)
+
+    started = time.perf_counter()
+    prices = client.fetch_prices(make_items(20))
+    elapsed = time.perf_counter() - started
+    client.close()
+
+    assert len(prices) == 20
+    # Sequential fetching would take 20 * 0.05 = 1s.
+    assert elapsed < 0.5
+
+
+def test_rate_limit_spaces_requests() -> None:
+    """Test that the per-host rate limiter caps request throughput."""
+    provider = RecordingProvider(host="test-rate", latency=0, max_batch_size=1)
+    client = PriceClient(provider, max_in_flight=4, rate_limit=20)
+
+    started = time.perf_counter()
+    client.fetch_prices(make_items(30))
+    elapsed = time.perf_counter() - started
+    client.close()
+
+    # 20 tokens are available up front, the remaining 10 arrive at 20/s.
+    assert elapsed >= 0.45
+
+
+def test_failed_batches_are_skipped() -> None:
+    """Test that items from failed batches are missing from the result."""
+    provider = FailingProvider(host="test-skip")
+    client = PriceClient(provider, max_in_flight=1, failure_threshold=10)
+
+    assert client.fetch_prices(make_items(3)) == {}
+    client.close()
+
+
+def test_circuit_opens_after_repeated_failures() -> None:
+    """Test that the circuit breaker short-circuits calls to a failing host."""
+    provider = FailingProvider(host="test-circuit")
+    client = PriceClient(provider, max_in_flight=1, failure_threshold=2)
+
+    with pytest.raises(CircuitOpenError):
+        client.fetch_prices(make_items(5))
+    client.close()
+
+    assert provider.calls == 2
+
+
+def test_circuit_breaker_half_open_trial() -> None:
+    """Test that a successful trial call after the timeout closes the circuit."""
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.01)
+    breaker.record_failure()
+
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    time.sleep(0.02)
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    breaker.record_success()
+    assert not breaker.is_open
+
+
+def test_unexpected_trial_error_allows_another_trial() -> None:
+    """Test a trial call failing with a non-provider error frees the trial."""
+    provider = RecordingProvider(host="test-trial-error", latency=0)
+    client = PriceClient(provider, failure_threshold=1, reset_timeout=0.01)
+    client.circuit_breaker.record_failure()
+    time.sleep(0.02)
+
+    fetch_prices = provider.fetch_prices
+    provider.fetch_prices = lambda items: {}["missing"]
+    with pytest.raises(KeyError):
+        client.fetch_prices(make_items(1))
+    provider.fetch_prices = fetch_prices
+    prices = client.fetch_prices(make_items(1))
+    client.close()
+
+    assert prices == {1: Decimal("3.00")}
+    assert not client.circuit_breaker.is_open
+
+
+@pytest.mark.django_db
+def test_sync_all_items_in_database_requires_sql_provider() -> None:
+    """Test that the set-based path rejects providers without a SQL form."""
+    Item.objects.create(name="Item", price=Decimal("1.00"))
+    client = PriceClient(RecordingProvider(host="test-sql"))
+
+    with pytest.raises(ImproperlyConfigured):
+        sync_all_items(in_database=True, client=client)
+    client.close()
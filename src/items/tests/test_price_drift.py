@@ -0,0 +1,195 @@
+import io
+import json
+from decimal import Decimal
+from typing import Dict, List, Sequence
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from items.models import Item, PriceDriftBucket
+from items.tasks import rebuild_price_drift_summary
+from items.utils.bulk_import import import_items
+from items.utils.bulk_operations import bulk_delete_items, bulk_update_items
+from items.utils.price_drift import build_drift_buckets, top_drift_items
+from items.utils.price_sync import sync_all_items, sync_item_by_id
+
+
+class MappedPriceClient:
+    """Price client stub returning a preset price per item name."""
+
+    def __init__(self, prices: Dict[str, str]) -> None:
+        self.prices = prices
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        names = dict(
+            Item.objects.filter(pk__in=[i.pk for i in items]).values_list("pk", "name")
+        )
+        return {pk: Decimal(self.prices[name]) for pk, name in names.items()}
+
+
+@pytest.fixture
+def items(db) -> List[Item]:
+    """Create four items priced 100.00 without triggering price syncs."""
+    return Item.objects.bulk_create(
+        [Item(name=f"Item{i}", price=Decimal("100.00")) for i in range(4)]
+    )
+
+
+def summary_rows() -> List[tuple]:
+    return list(
+        PriceDriftBucket.objects.values_list(
+            "bucket", "items", "drift_sum", "abs_drift_sum", "squared_drift_sum"
+        )
+    )
+
+
+def expected_rows() -> List[tuple]:
+    edges = [row.upper for row in PriceDriftBucket.objects.all()][:-1]
+    return [
+        (
+            row["bucket"],
+            row["items"],
+            row["drift_sum"],
+            row["abs_drift_sum"],
+            row["squared_drift_sum"],
+        )
+        for row in build_drift_buckets(Item.objects.all(), edges)
+    ]
+
+
+def test_summary_follows_sync_batches(items: List[Item]) -> None:
+    """Test incremental updates match a full recomputation after each sync."""
+    first = {"Item0": "150.00", "Item1": "95.50", "Item2": "100.00", "Item3": "20"}
+    second = {"Item0": "101.00", "Item1": "95.50", "Item2": "-5", "Item3": "20"}
+
+    sync_all_items(batch_size=3, client=MappedPriceClient(first), full=True)
+    assert summary_rows() == expected_rows()
+    assert sum(row[1] for row in summary_rows()) == 4
+
+    Item.objects.filter(name="Item1").update(price=Decimal("90.00"))
+    sync_all_items(batch_size=3, client=MappedPriceClient(second), full=True)
+    assert summary_rows() == expected_rows()
+
+
+def test_summary_follows_single_item_and_in_database_syncs(
+    items: List[Item],
+) -> None:
+    """Test the single-item and set-based syncs keep the summary current."""
+    sync_item_by_id(items[0].pk, client=MappedPriceClient({"Item0": "130.00"}))
+    assert summary_rows() == expected_rows()
+
+    sync_all_items(batch_size=2, in_database=True, full=True)
+    assert summary_rows() == expected_rows()
+
+
+class RacingPriceClient(MappedPriceClient):
+    """Price client stub that syncs Item0 on its own during the fetch."""
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        item = Item.objects.get(name="Item0")
+        sync_item_by_id(item.pk, client=MappedPriceClient({"Item0": "70.00"}))
+        return super().fetch_prices(items)
+
+
+def test_summary_skips_rows_changed_during_the_fetch(items: List[Item]) -> None:
+    """Test a batch does not overwrite or miscount a row synced meanwhile."""
+    prices = {f"Item{i}": "110.00" for i in range(4)}
+    sync_all_items(batch_size=10, client=MappedPriceClient(prices), full=True)
+
+    prices = {f"Item{i}": "120.00" for i in range(4)}
+    synced = sync_all_items(batch_size=10, client=RacingPriceClient(prices), full=True)
+
+    assert synced == 3
+    assert Item.objects.get(name="Item0").external_price == Decimal("70.00")
+    assert summary_rows() == expected_rows()
+
+
+def test_summary_follows_deletes_imports_and_bulk_updates(items: List[Item]) -> None:
+    """Test writes outside syncs move the drift summary with them."""
+    prices = {f"Item{i}": "110.00" for i in range(4)}
+    sync_all_items(batch_size=10, client=MappedPriceClient(prices), full=True)
+
+    # The instance was loaded before the sync gave it a drift.
+    items[0].delete()
+    assert summary_rows() == expected_rows()
+
+    bulk_delete_items([items[1].pk])
+    assert summary_rows() == expected_rows()
+
+    bulk_update_items([{"id": items[2].pk, "external_price": "50.00"}], partial=True)
+    assert summary_rows() == expected_rows()
+
+    record = {"id": items[3].pk, "name": "Item3", "price": "100.00"}
+    import_items(io.StringIO(json.dumps({**record, "external_price": "180"})), "ndjson")
+    assert summary_rows() == expected_rows()
+    assert sum(row[1] for row in summary_rows()) == 2
+
+
+def test_rebuild_reconciles_changes_outside_syncs(items: List[Item]) -> None:
+    """Test the rebuild task accounts for deletions missed by the summary."""
+    prices = {f"Item{i}": "110.00" for i in range(4)}
+    sync_all_items(batch_size=10, client=MappedPriceClient(prices), full=True)
+    Item.objects.filter(pk=items[0].pk).delete()
+
+    assert rebuild_price_drift_summary() == "Price drift summary rebuilt over 3 items."
+    assert summary_rows() == expected_rows()
+
+
+def test_rebuild_applies_new_bucket_edges(items: List[Item], settings) -> None:
+    """Test changing ITEMS_PRICE_DRIFT_BUCKETS takes effect on rebuild."""
+    settings.ITEMS_PRICE_DRIFT_BUCKETS = [0]
+
+    rebuild_price_drift_summary()
+
+    assert list(PriceDriftBucket.objects.values_list("lower", "upper")) == [
+        (None, Decimal("0.00")),
+        (Decimal("0.00"), None),
+    ]
+
+
+def test_drift_stats_endpoint(authenticated_client: APIClient, items) -> None:
+    """Test top-N, histogram and aggregates of synced items."""
+    prices = {"Item0": "150.00", "Item1": "60.00", "Item2": "100.00", "Item3": "95"}
+    sync_all_items(batch_size=10, client=MappedPriceClient(prices), full=True)
+    Item.objects.bulk_create([Item(name="Unsynced", price=Decimal("1.00"))])
+
+    response = authenticated_client.get(reverse("item-drift-stats"), {"top": 2})
+
+    assert response.status_code == 200
+    assert [row["name"] for row in response.data["top"]] == ["Item0", "Item1"]
+    assert response.data["top"][1]["price_drift"] == "-40.00"
+    assert response.data["items"] == 4
+    assert response.data["mean"] == "1.25"
+    assert response.data["mean_abs"] == "23.75"
+    assert response.data["min"] == "-40.00"
+    assert response.data["max"] == "50.00"
+    histogram = {
+        (row["lower"], row["upper"]): row["items"] for row in response.data["histogram"]
+    }
+    assert histogram[("-100.00", "-10.00")] == 1
+    assert histogram[("-10.00", "-1.00")] == 1
+    assert histogram[("0.00", "1.00")] == 1
+    assert histogram[("10.00", "100.00")] == 1
+
+
+def test_drift_stats_rejects_bad_top(authenticated_client: APIClient, db) -> None:
+    """Test ``top`` is bounded."""
+    response = authenticated_client.get(reverse("item-drift-stats"), {"top": 1000})
+
+    assert response.status_code == 400
+
+
+@pytest.mark.django_db
+def test_drift_queries_use_indexes() -> None:
+    """Test top-N and min/max read drift indexes instead of sorting the table."""
+    # Rule out plans whose only cost advantage comes from the tiny test table.
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_bitmapscan = off")
+        cursor.execute("SET LOCAL enable_sort = off")
+
+    assert "item_abs_price_drift_idx" in top_drift_items(10).explain()
+    assert "Sort" not in top_drift_items(10).explain()
+    assert "item_price_drift_idx" in Item.objects.order_by("price_drift")[:1].explain()
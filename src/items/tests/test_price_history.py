@@ -0,0 +1,182 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from typing import Dict, List, Sequence
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from items.models import Item, ItemPriceHistory
+from items.tasks import maintain_price_history_partitions
+from items.utils.price_history import (
+    DEFAULT_PARTITION,
+    drop_expired_partitions,
+    ensure_partitions,
+    partition_name,
+)
+from items.utils.price_sync import sync_all_items, sync_item_by_id
+
+
+class FixedPriceClient:
+    """Price client stub returning the same price for every item."""
+
+    def __init__(self, price: Decimal) -> None:
+        self.price = price
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        return {item.pk: self.price for item in items}
+
+
+@pytest.fixture
+def item(db) -> Item:
+    """Create an item without triggering a price sync."""
+    return Item.objects.bulk_create([Item(name="Item1", price=Decimal("10.00"))])[0]
+
+
+def record(item: Item, prices: List[str], recorded_at: datetime) -> None:
+    ItemPriceHistory.objects.bulk_create(
+        [
+            ItemPriceHistory(
+                item_id=item.pk,
+                price=item.price,
+                external_price=Decimal(price),
+                recorded_at=recorded_at + timedelta(minutes=10 * index),
+            )
+            for index, price in enumerate(prices)
+        ]
+    )
+
+
+def partition_row_counts() -> Dict[str, int]:
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT tableoid::regclass::text, count(*) "
+            "FROM items_itempricehistory GROUP BY 1"
+        )
+        return dict(cursor.fetchall())
+
+
+def test_sync_all_items_records_history(item: Item) -> None:
+    """Test every synced item gets one history row per sync."""
+    client = FixedPriceClient(Decimal("9.00"))
+
+    sync_all_items(batch_size=10, client=client, full=True)
+    sync_all_items(batch_size=10, client=client, full=True)
+
+    history = ItemPriceHistory.objects.filter(item_id=item.pk)
+    assert history.count() == 2
+    assert set(history.values_list("external_price", flat=True)) == {Decimal("9.00")}
+
+
+def test_in_database_sync_records_history(item: Item) -> None:
+    """Test the in-database sync records history with INSERT ... SELECT."""
+    sync_all_items(batch_size=10, in_database=True)
+
+    item.refresh_from_db()
+    row = ItemPriceHistory.objects.get(item_id=item.pk)
+    assert row.external_price == item.external_price
+    assert row.recorded_at == item.sync_state.synced_at
+
+
+def test_sync_item_by_id_records_history(item: Item) -> None:
+    """Test a single-item sync appends a history row."""
+    sync_item_by_id(item.pk, client=FixedPriceClient(Decimal("8.00")))
+
+    row = ItemPriceHistory.objects.get(item_id=item.pk)
+    assert (row.price, row.external_price) == (Decimal("10.00"), Decimal("8.00"))
+
+
+def test_price_history_endpoint_downsamples(
+    authenticated_client: APIClient, item: Item
+) -> None:
+    """Test the endpoint aggregates samples into hourly buckets."""
+    hour = timezone.now().replace(minute=0, second=0, microsecond=0)
+    record(item, ["1.00", "2.00", "6.00"], hour - timedelta(hours=2))
+    record(item, ["5.00"], hour - timedelta(hours=1))
+
+    response = authenticated_client.get(
+        reverse("item-price-history", args=[item.pk]), {"interval": "hour"}
+    )
+
+    assert response.status_code == 200
+    assert response.data["interval"] == "hour"
+    results = response.data["results"]
+    assert [row["samples"] for row in results] == [3, 1]
+    assert results[0]["min"] == "1.00"
+    assert results[0]["max"] == "6.00"
+    assert results[0]["avg"] == "3.00"
+
+
+def test_price_history_endpoint_filters_range(
+    authenticated_client: APIClient, item: Item
+) -> None:
+    """Test start and end bound the samples and daily buckets are used."""
+    now = timezone.now()
+    record(item, ["1.00"], now - timedelta(days=10))
+    record(item, ["2.00"], now - timedelta(days=1))
+    start = (now - timedelta(days=3)).isoformat()
+
+    response = authenticated_client.get(
+        reverse("item-price-history", args=[item.pk]),
+        {"interval": "day", "start": start},
+    )
+
+    assert response.status_code == 200
+    assert [row["avg"] for row in response.data["results"]] == ["2.00"]
+
+
+def test_price_history_endpoint_rejects_bad_params(
+    authenticated_client: APIClient, item: Item
+) -> None:
+    """Test an unknown interval or inverted range is a 400 and unknown IDs 404."""
+    url = reverse("item-price-history", args=[item.pk])
+
+    assert authenticated_client.get(url, {"interval": "week"}).status_code == 400
+    response = authenticated_client.get(
+        url, {"start": "2024-02-01T00:00:00Z", "end": "2024-01-01T00:00:00Z"}
+    )
+    assert response.status_code == 400
+    missing = reverse("item-price-history", args=[item.pk + 1])
+    assert authenticated_client.get(missing).status_code == 404
+
+
+def test_ensure_partitions_moves_rows_out_of_default(item: Item) -> None:
+    """Test creating a partition moves its day's rows from the default one."""
+    now = timezone.now()
+    record(item, ["1.00", "2.00"], now)
+    assert partition_row_counts() == {DEFAULT_PARTITION: 2}
+
+    created = ensure_partitions(days_ahead=1)
+
+    today = now.astimezone(dt_timezone.utc).date()
+    assert created == [partition_name(today), partition_name(today + timedelta(1))]
+    assert partition_row_counts() == {partition_name(today): 2}
+    assert ensure_partitions(days_ahead=1) == []
+
+
+def test_drop_expired_partitions(db) -> None:
+    """Test only partitions older than the retention window are dropped."""
+    today = timezone.now().astimezone(dt_timezone.utc).date()
+    ensure_partitions(days_ahead=0)
+    old = today - timedelta(days=40)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TABLE {partition_name(old)} PARTITION OF items_itempricehistory "
+            "FOR VALUES FROM (%s) TO (%s)",
+            [old, old + timedelta(days=1)],
+        )
+
+    assert drop_expired_partitions(retention_days=30) == [partition_name(old)]
+    assert drop_expired_partitions(retention_days=30) == []
+
+
+def test_maintain_price_history_partitions_task(settings, db) -> None:
+    """Test the beat task pre-creates upcoming partitions."""
+    settings.ITEMS_PRICE_HISTORY_PRECREATE_DAYS = 2
+
+    result: str = maintain_price_history_partitions()
+
+    assert result == "Created 3 and dropped 0 price history partitions."
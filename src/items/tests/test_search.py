@@ -0,0 +1,85 @@
+from decimal import Decimal
+from typing import List
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from items.filters import ItemSearchFilter
+from items.models import Item
+
+
+@pytest.fixture
+def items(db) -> List[Item]:
+    """Create a small catalogue to search."""
+    return [
+        Item.objects.create(
+            name="Mechanical keyboard", description="Clicky switches", price=1
+        ),
+        Item.objects.create(
+            name="Mouse pad", description="Pairs well with any keyboard", price=1
+        ),
+        Item.objects.create(name="Running shoes", description="Lightweight", price=1),
+        Item.objects.create(name="Desk lamp", description="Warm light", price=1),
+    ]
+
+
+def search(client: APIClient, term: str) -> List[str]:
+    """Return the names of items matching a search term, in result order."""
+    response = client.get(reverse("item-list"), {"search": term, "page_size": 50})
+    assert response.status_code == status.HTTP_200_OK
+    return [row["name"] for row in response.data["results"]]
+
+
+def test_full_text_search_ranks_name_matches_first(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test stemmed full-text matching, ranked by relevance."""
+    assert search(authenticated_client, "keyboards") == [
+        "Mechanical keyboard",
+        "Mouse pad",
+    ]
+    assert search(authenticated_client, "run") == ["Running shoes"]
+
+
+def test_search_falls_back_to_trigram_matching(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test fuzzy (misspelled) and substring matches."""
+    assert search(authenticated_client, "keybord")[0] == "Mechanical keyboard"
+    assert search(authenticated_client, "lightw") == ["Running shoes"]
+
+
+def test_search_vector_is_maintained_on_write(
+    authenticated_client: APIClient, items: List[Item]
+) -> None:
+    """Test that the stored tsvector follows updates."""
+    Item.objects.filter(name="Desk lamp").update(description="Ergonomic keyboard")
+
+    assert "Desk lamp" in search(authenticated_client, "keyboard")
+
+
+def test_search_uses_indexes(items: List[Item]) -> None:
+    """Test that every search predicate is served by a GIN index."""
+    request = Request(APIRequestFactory().get("/", {"search": "keyboard mech"}))
+    queryset = ItemSearchFilter().filter_queryset(request, Item.objects.all(), None)
+
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+    plan = queryset.explain()
+
+    assert "Seq Scan" not in plan, plan
+    assert "item_search_vector_idx" in plan
+    assert "item_name_trgm_idx" in plan
+    assert "item_description_trgm_idx" in plan
+
+
+@pytest.mark.django_db
+def test_search_leaves_other_lookups_alone(authenticated_client: APIClient) -> None:
+    """Test that listing without a search term is unaffected."""
+    Item.objects.create(name="Plain", price=Decimal("1.00"))
+
+    assert search(authenticated_client, "") == ["Plain"]
@@ -0,0 +1,109 @@
+from datetime import datetime, timedelta
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from typing import List
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from pytest_django.fixtures import SettingsWrapper
+from rest_framework.test import APIClient
+
+from items.models import Item
+from items.serializers import ItemRowSerializer, ItemSerializer
+
+
+@pytest.fixture
+def items(db) -> List[Item]:
+    """Create items covering nulls, whole prices and both UTC offsets."""
+    winter = datetime(2024, 1, 15, 12, 0, 0, tzinfo=dt_timezone.utc)
+    summer = datetime(2024, 7, 15, 12, 0, 0, 123456, tzinfo=dt_timezone.utc)
+    created = [
+        Item.objects.create(name="Plain", price=Decimal("10")),
+        Item.objects.create(
+            name="Described",
+            description='Ünïcode "quoted" text',
+            price=Decimal("99999999.99"),
+            external_price=Decimal("0.5"),
+        ),
+        Item.objects.create(name="Free", price=Decimal("0.00")),
+    ]
+    Item.objects.filter(pk=created[0].pk).update(created_at=winter, updated_at=winter)
+    Item.objects.filter(pk=created[1].pk).update(created_at=summer, updated_at=summer)
+    return created
+
+
+def get_both(
+    client: APIClient, settings: SettingsWrapper, url: str, **params: str
+) -> List[bytes]:
+    settings.ITEMS_RESPONSE_CACHE = {**settings.ITEMS_RESPONSE_CACHE, "ENABLED": False}
+    contents = []
+    for fast in (False, True):
+        settings.ITEMS_FAST_READ_SERIALIZATION = fast
+        response = client.get(url, params)
+        assert response.status_code == 200
+        contents.append(response.content)
+    return contents
+
+
+@pytest.mark.parametrize(
+    "params",
+    [
+        {},
+        {"ordering": "price"},
+        {"search": "described"},
+        {"pagination": "cursor", "page_size": "2"},
+    ],
+)
+def test_fast_list_is_byte_identical(
+    authenticated_client: APIClient,
+    settings: SettingsWrapper,
+    items: List[Item],
+    params: dict,
+) -> None:
+    """Test the fast list path renders exactly the ModelSerializer JSON."""
+    slow, fast = get_both(
+        authenticated_client, settings, reverse("item-list"), **params
+    )
+    assert fast == slow
+
+
+def test_fast_retrieve_is_byte_identical(
+    authenticated_client: APIClient, settings: SettingsWrapper, items: List[Item]
+) -> None:
+    """Test the fast detail path renders exactly the ModelSerializer JSON."""
+    for item in items:
+        url = reverse("item-detail", args=[item.pk])
+        slow, fast = get_both(authenticated_client, settings, url)
+        assert fast == slow
+
+
+def test_fast_cursor_pages_follow_dict_rows(
+    authenticated_client: APIClient, settings: SettingsWrapper, items: List[Item]
+) -> None:
+    """Test cursor links built from .values() rows walk every item once."""
+    settings.ITEMS_FAST_READ_SERIALIZATION = True
+    url = reverse("item-list") + "?pagination=cursor&page_size=1"
+    seen = []
+    while url:
+        data = authenticated_client.get(url).data
+        seen.extend(row["id"] for row in data["results"])
+        url = data["next"]
+
+    assert sorted(seen) == sorted(item.pk for item in items)
+
+
+def test_row_serializer_falls_back_for_unusual_values(db) -> None:
+    """Test values outside the fast path still match the field output."""
+    item = Item(
+        pk=1,
+        name="Item",
+        description=None,
+        price=Decimal("7"),
+        external_price=Decimal("1.005"),
+        created_at=timezone.now(),
+        updated_at=timezone.now() - timedelta(days=200),
+    )
+    row = {field: getattr(item, field) for field in ItemRowSerializer.value_fields()}
+
+    assert ItemRowSerializer(row).data == ItemSerializer(item).data
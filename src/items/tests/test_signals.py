@@ -0,0 +1,120 @@
+from decimal import Decimal
+from typing import Callable, ContextManager
+from unittest.mock import MagicMock
+
+import pytest
+from django.db import transaction
+
+from items.models import Item
+from items.tasks import sync_external_prices_for_items
+from items.utils.sync_dispatch import PriceSyncBuffer
+
+
+@pytest.mark.django_db
+def test_created_items_are_synced_in_batches_on_commit(
+    mocker: MagicMock,
+    settings,
+    django_capture_on_commit_callbacks: Callable[..., ContextManager[list]],
+) -> None:
+    """Test that creates in one transaction produce one task per batch."""
+    settings.ITEMS_PRICE_SYNC_DISPATCH_BATCH_SIZE = 2
+    mock_delay: MagicMock = mocker.patch(
+        "items.utils.sync_dispatch.sync_external_prices_for_items.delay"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        items = [
+            Item.objects.create(name=f"Item{i}", price=Decimal("1.00"))
+            for i in range(5)
+        ]
+        mock_delay.assert_not_called()
+
+    ids = [item.id for item in items]
+    assert sum(isinstance(callback, PriceSyncBuffer) for callback in callbacks) == 1
+    assert [call.args for call in mock_delay.call_args_list] == [
+        (ids[0:2],),
+        (ids[2:4],),
+        (ids[4:],),
+    ]
+
+
+@pytest.mark.django_db
+def test_updates_do_not_trigger_sync(
+    mocker: MagicMock,
+    django_capture_on_commit_callbacks: Callable[..., ContextManager[list]],
+) -> None:
+    """Test that saving an existing item does not queue a sync."""
+    item: Item = Item.objects.create(name="Item", price=Decimal("1.00"))
+    mock_delay: MagicMock = mocker.patch(
+        "items.utils.sync_dispatch.sync_external_prices_for_items.delay"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True) as callbacks:
+        item.name = "Renamed"
+        item.save()
+
+    assert not any(isinstance(callback, PriceSyncBuffer) for callback in callbacks)
+    mock_delay.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_rolled_back_items_are_not_synced(
+    mocker: MagicMock,
+    django_capture_on_commit_callbacks: Callable[..., ContextManager[list]],
+) -> None:
+    """Test that items created in a rolled back savepoint are dropped."""
+    mock_delay: MagicMock = mocker.patch(
+        "items.utils.sync_dispatch.sync_external_prices_for_items.delay"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        try:
+            with transaction.atomic():
+                Item.objects.create(name="Doomed", price=Decimal("1.00"))
+                raise RuntimeError
+        except RuntimeError:
+            pass
+
+    mock_delay.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_sync_external_prices_for_items_uses_one_bulk_update(
+    django_assert_num_queries: Callable[..., ContextManager[None]],
+) -> None:
+    """Test that the batch task reprices many items with one SELECT and UPDATE."""
+    items = [
+        Item.objects.create(name=f"Item{i}", price=Decimal("100.00")) for i in range(3)
+    ]
+
+    # SELECT, then the bulk UPDATE, the sync state upsert, the price history
+    # INSERT and the drift summary UPDATE inside their atomic block
+    # (SAVEPOINT/RELEASE).
+    with django_assert_num_queries(7):
+        result: str = sync_external_prices_for_items([item.id for item in items] + [0])
+
+    assert result == "Updated external_price for 3 items."
+    for item in Item.objects.all():
+        assert Decimal("90.00") <= item.external_price <= Decimal("110.00")
+
+
+@pytest.mark.django_db
+def test_items_created_after_a_rolled_back_savepoint_are_synced(
+    mocker: MagicMock,
+    django_capture_on_commit_callbacks: Callable[..., ContextManager[list]],
+) -> None:
+    """Test that a buffer dropped by a savepoint rollback is not reused."""
+    mock_delay: MagicMock = mocker.patch(
+        "items.utils.sync_dispatch.sync_external_prices_for_items.delay"
+    )
+
+    with django_capture_on_commit_callbacks(execute=True):
+        try:
+            with transaction.atomic():
+                Item.objects.create(name="Doomed", price=Decimal("1.00"))
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        item: Item = Item.objects.create(name="Kept", price=Decimal("1.00"))
+
+    mock_delay.assert_called_once_with([item.id])
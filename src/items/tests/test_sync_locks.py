@@ -0,0 +1,207 @@
+import pickle
+import time
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+from celery import current_app
+from celery.exceptions import ChordError
+from django.contrib import admin
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache
+from django.core.cache.backends.redis import RedisCache
+from django.urls import reverse
+from pytest_mock import MockerFixture
+from rest_framework.test import APIClient
+
+from items.models import Item
+from items.tasks import (
+    aggregate_external_price_sync,
+    hourly_external_price_sync,
+    simulate_external_price_sync_for_item,
+)
+from items.utils.sync_locks import (
+    FULL_SYNC_LOCK,
+    ITEM_SYNC_LOCK,
+    RELEASE_SCRIPT,
+    acquire_sync_lock,
+    dispatch_once,
+    release_sync_lock,
+)
+
+
+@pytest.fixture
+def send_hourly(mocker: MockerFixture) -> MagicMock:
+    """Patch sending the full sync task, echoing the requested task ID."""
+    return mocker.patch.object(
+        hourly_external_price_sync,
+        "apply_async",
+        side_effect=lambda args, task_id: MagicMock(id=task_id),
+    )
+
+
+@pytest.fixture
+def send_item_sync(mocker: MockerFixture) -> MagicMock:
+    """Patch sending the single-item sync task, echoing the task ID."""
+    return mocker.patch.object(
+        simulate_external_price_sync_for_item,
+        "apply_async",
+        side_effect=lambda args, task_id: MagicMock(id=task_id),
+    )
+
+
+def test_repeat_full_sync_returns_running_task(
+    authenticated_client: APIClient, send_hourly: MagicMock
+) -> None:
+    """Test a second trigger returns the first task instead of sending one."""
+    url = reverse("item-sync-all-prices")
+
+    first = authenticated_client.post(url)
+    second = authenticated_client.post(url)
+
+    assert second.data["task_id"] == first.data["task_id"]
+    assert "already queued or running" in second.data["message"]
+    send_hourly.assert_called_once()
+
+
+def test_item_syncs_are_deduplicated_per_item(
+    authenticated_client: APIClient, send_item_sync: MagicMock
+) -> None:
+    """Test locks are per item: other items still get their own task."""
+    first, second = Item.objects.bulk_create(
+        [Item(name="A", price=Decimal("1.00")), Item(name="B", price=Decimal("1.00"))]
+    )
+
+    ids = [
+        authenticated_client.post(reverse("item-sync-price", args=[pk])).data["task_id"]
+        for pk in (first.pk, first.pk, second.pk)
+    ]
+
+    assert ids[0] == ids[1] != ids[2]
+    assert send_item_sync.call_count == 2
+
+
+def test_lock_expires(db, send_hourly: MagicMock) -> None:
+    """Test a lock left by a dead worker stops blocking after its timeout."""
+    first, _ = dispatch_once(hourly_external_price_sync, FULL_SYNC_LOCK, timeout=1)
+    time.sleep(1.1)
+
+    second, sent = dispatch_once(hourly_external_price_sync, FULL_SYNC_LOCK, timeout=1)
+
+    assert sent
+    assert second != first
+
+
+def test_dispatch_releases_lock_when_send_fails(db, mocker: MockerFixture) -> None:
+    """Test a broker error does not leave the lock behind."""
+    mocker.patch.object(
+        hourly_external_price_sync, "apply_async", side_effect=ConnectionError
+    )
+
+    with pytest.raises(ConnectionError):
+        dispatch_once(hourly_external_price_sync, FULL_SYNC_LOCK, timeout=60)
+
+    assert cache.get(FULL_SYNC_LOCK) is None
+
+
+def test_release_on_redis_is_one_compare_and_delete(mocker: MockerFixture) -> None:
+    """Test Redis releases run a script instead of a separate read and delete."""
+    backend = RedisCache("redis://localhost:6379/2", {})
+    client = mocker.patch.object(backend._cache, "get_client").return_value
+    mocker.patch("items.utils.sync_locks.caches", {DEFAULT_CACHE_ALIAS: backend})
+
+    release_sync_lock(FULL_SYNC_LOCK, "run-1")
+
+    client.eval.assert_called_once_with(
+        RELEASE_SCRIPT,
+        1,
+        backend.make_and_validate_key(FULL_SYNC_LOCK),
+        pickle.dumps("run-1", pickle.HIGHEST_PROTOCOL),
+    )
+    client.get.assert_not_called()
+    client.delete.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_overlapping_hourly_run_is_skipped(mocker: MockerFixture) -> None:
+    """Test a beat run is skipped while a manually triggered run holds the lock."""
+    mock_chord = mocker.patch("items.tasks.chord")
+    acquire_sync_lock(FULL_SYNC_LOCK, "manual-run", timeout=60)
+
+    result = hourly_external_price_sync.apply(task_id="beat-run").get()
+
+    assert result["message"] == "External price sync is already running (manual-run)."
+    mock_chord.assert_not_called()
+
+
+@pytest.mark.django_db
+def test_hourly_run_holds_lock_until_callback(mocker: MockerFixture) -> None:
+    """Test the lock is released by the chord callback of the owning run."""
+    mocker.patch("items.tasks.plan_id_shards", return_value=[(1, 101)])
+    mock_chord = mocker.patch("items.tasks.chord")
+
+    hourly_external_price_sync.apply(task_id="run-1")
+
+    assert cache.get(FULL_SYNC_LOCK) == "run-1"
+    callback = mock_chord.return_value.call_args.args[0]
+    assert callback.args == ("run-1",)
+    aggregate_external_price_sync([1], "other-run")
+    assert cache.get(FULL_SYNC_LOCK) == "run-1"
+    aggregate_external_price_sync([1], "run-1")
+    assert cache.get(FULL_SYNC_LOCK) is None
+
+
+@pytest.mark.django_db
+def test_failed_shard_releases_hourly_lock(mocker: MockerFixture) -> None:
+    """Test a failed shard releases the lock through the callback's errback."""
+    mocker.patch("items.tasks.plan_id_shards", return_value=[(1, 101)])
+    mock_chord = mocker.patch("items.tasks.chord")
+    hourly_external_price_sync.apply(task_id="run-1")
+    callback = mock_chord.return_value.call_args.args[0]
+    # What the result backend does when a chord part fails; the backend
+    # would then store the callback's failure.
+    mocker.patch.object(current_app.backend, "fail_from_current_stack")
+
+    current_app.backend.chord_error_from_stack(callback, ChordError("Shard failed"))
+
+    assert cache.get(FULL_SYNC_LOCK) is None
+
+
+@pytest.mark.django_db
+def test_hourly_run_releases_lock_when_dispatch_fails(mocker: MockerFixture) -> None:
+    """Test a broker error while sending the chord does not leave the lock."""
+    mocker.patch("items.tasks.plan_id_shards", return_value=[(1, 101)])
+    mocker.patch("items.tasks.chord", side_effect=ConnectionError)
+
+    result = hourly_external_price_sync.apply(task_id="run-1")
+
+    assert isinstance(result.result, ConnectionError)
+    assert cache.get(FULL_SYNC_LOCK) is None
+
+
+@pytest.mark.django_db
+def test_item_sync_task_releases_its_lock(mocker: MockerFixture) -> None:
+    """Test the item task runs under its lock and frees it afterwards."""
+    sync = mocker.patch("items.tasks.sync_item_by_id", return_value="done")
+    acquire_sync_lock(ITEM_SYNC_LOCK.format(7), "other", timeout=60)
+
+    skipped = simulate_external_price_sync_for_item.apply((7,), task_id="t1").get()
+    cache.delete(ITEM_SYNC_LOCK.format(7))
+    ran = simulate_external_price_sync_for_item.apply((7,), task_id="t2").get()
+
+    assert skipped == "External price sync for item 7 is already running (other)."
+    assert ran == "done"
+    sync.assert_called_once_with(7)
+    assert cache.get(ITEM_SYNC_LOCK.format(7)) is None
+
+
+def test_admin_action_is_deduplicated(db, send_hourly: MagicMock) -> None:
+    """Test the admin action reuses the running full sync."""
+    model_admin = admin.site._registry[Item]
+    model_admin.message_user = MagicMock()
+
+    model_admin.run_external_price_sync(MagicMock(), Item.objects.none())
+    model_admin.run_external_price_sync(MagicMock(), Item.objects.none())
+
+    send_hourly.assert_called_once()
+    message = model_admin.message_user.call_args.args[1]
+    assert "is already running" in message
@@ -0,0 +1,95 @@
+import time
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import Dict, Sequence
+
+import pytest
+from pytest_mock import MockerFixture
+
+from backend.celery import (
+    record_task_finished,
+    record_task_published,
+    record_task_started,
+)
+from backend.metrics import render_metrics
+from items.models import Item
+from items.tasks import simulate_external_price_sync_for_item
+from items.utils.price_sync import sync_all_items
+
+
+class FixedPriceClient:
+    """Price client stub returning the same price for every item."""
+
+    def __init__(self, price: Decimal) -> None:
+        self.price = price
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        return {item.pk: self.price for item in items}
+
+
+@pytest.mark.django_db
+def test_task_runs_are_counted_and_timed(mocker: MockerFixture) -> None:
+    """Test finished runs are counted by state, with their run time."""
+    mocker.patch("items.tasks.sync_item_by_id", return_value="done")
+
+    simulate_external_price_sync_for_item.apply((1,), task_id="t1")
+
+    body = render_metrics()
+    labels = 'task="items.tasks.simulate_external_price_sync_for_item",queue="direct"'
+    assert f'celery_tasks_total{{{labels},state="SUCCESS"}} 1' in body
+    assert f"celery_task_runtime_seconds_count{{{labels}}} 1" in body
+    assert "celery_task_queue_wait_seconds_count" not in body
+
+
+@pytest.mark.django_db
+def test_task_failures_are_counted_by_exception(mocker: MockerFixture) -> None:
+    """Test failures are counted with their exception type."""
+    mocker.patch("items.tasks.sync_item_by_id", side_effect=ValueError("boom"))
+
+    simulate_external_price_sync_for_item.apply((1,), task_id="t1")
+
+    body = render_metrics()
+    assert 'exception="ValueError"} 1' in body
+    assert 'state="FAILURE"} 1' in body
+
+
+def test_queue_wait_is_measured_from_publish() -> None:
+    """Test the wait is the time between the publish stamp and the start."""
+    headers: Dict[str, float] = {}
+    record_task_published(sender="sync", headers=headers, routing_key="bulk")
+    request = SimpleNamespace(
+        published_at=headers["published_at"] - 2,
+        delivery_info={"routing_key": "bulk"},
+    )
+    task = SimpleNamespace(name="sync", request=request)
+
+    record_task_started(task_id="t1", task=task)
+    record_task_finished(task_id="t1", task=task, state="SUCCESS")
+
+    body = render_metrics()
+    wait = 'celery_task_queue_wait_seconds_bucket{task="sync",queue="bulk"'
+    assert 'celery_tasks_published_total{task="sync",queue="bulk"} 1' in body
+    assert f'{wait},le="1.0"}} 0' in body
+    assert f'{wait},le="5.0"}} 1' in body
+
+
+@pytest.mark.django_db
+def test_sync_records_rows_and_batches() -> None:
+    """Test the sync reports the rows and timing of every batch."""
+    Item.objects.bulk_create(
+        [Item(name=f"Item{i}", price=Decimal("1.00")) for i in range(5)]
+    )
+    started = time.perf_counter()
+
+    sync_all_items(batch_size=2, client=FixedPriceClient(Decimal("2.00")))
+
+    body = render_metrics()
+    assert 'price_sync_rows_total{mode="batch"} 5' in body
+    assert 'price_sync_batch_rows_count{mode="batch"} 3' in body
+    assert 'price_sync_batch_seconds_count{mode="batch"} 3' in body
+    sum_line = next(
+        line
+        for line in body.splitlines()
+        if line.startswith("price_sync_batch_seconds_sum")
+    )
+    assert 0 < float(sum_line.split()[-1]) <= time.perf_counter() - started
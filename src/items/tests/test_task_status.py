@@ -0,0 +1,136 @@
+from decimal import Decimal
+from types import SimpleNamespace
+from typing import List, Tuple
+from unittest.mock import MagicMock
+
+import pytest
+from celery import current_app, states
+from celery.backends.cache import CacheBackend
+from django.urls import reverse
+from pytest_mock import MockerFixture
+from rest_framework.test import APIClient
+
+from items.models import Item
+from items.utils.price_sync import sync_item_range
+from items.utils.task_status import PROGRESS, TaskProgress
+
+
+@pytest.fixture
+def result_backend(mocker: MockerFixture) -> CacheBackend:
+    """Swap the Redis result backend for an in-memory key-value backend."""
+    backend = CacheBackend(app=current_app, backend="memory")
+    mocker.patch(
+        "items.utils.task_status.current_app", new=SimpleNamespace(backend=backend)
+    )
+    mocker.spy(backend, "mget")
+    return backend
+
+
+def progress_meta(processed: int, total: int, rate: float) -> dict:
+    return {"processed": processed, "total": total, "rows_per_second": rate}
+
+
+def test_batch_status_reads_all_tasks_at_once(
+    authenticated_client: APIClient, result_backend: CacheBackend
+) -> None:
+    """Test many task IDs are resolved with a single MGET."""
+    result_backend.store_result("done", "ok", states.SUCCESS)
+    result_backend.store_result("running", progress_meta(50, 200, 25.0), PROGRESS)
+    result_backend.store_result("failed", ValueError("boom"), states.FAILURE)
+
+    response = authenticated_client.post(
+        reverse("item-task-statuses"),
+        {"task_ids": ["done", "running", "failed", "unknown"]},
+        format="json",
+    )
+
+    assert response.status_code == 200
+    results = response.data["results"]
+    assert [row["status"] for row in results] == [
+        "SUCCESS",
+        "PROGRESS",
+        "FAILURE",
+        "PENDING",
+    ]
+    assert results[0]["result"] == "ok"
+    assert results[1]["progress"] == progress_meta(50, 200, 25.0)
+    assert results[1]["result"] is None
+    assert results[2]["result"] == "ValueError: boom"
+    assert result_backend.mget.call_count == 1
+
+
+def test_status_combines_shard_progress(
+    authenticated_client: APIClient, result_backend: CacheBackend
+) -> None:
+    """Test an hourly sync reports the progress of its shard tasks."""
+    result_backend.store_result(
+        "hourly",
+        {"message": "...", "aggregate_task_id": "agg", "subtask_ids": ["a", "b", "c"]},
+        states.SUCCESS,
+    )
+    result_backend.store_result("a", 120, states.SUCCESS)
+    result_backend.store_result("b", progress_meta(30, 100, 15.0), PROGRESS)
+
+    response = authenticated_client.get(reverse("item-task-status", args=["hourly"]))
+
+    assert response.data["progress"] == {
+        "subtasks": 3,
+        "subtasks_done": 1,
+        "processed": 150,
+        "total": 220,
+        "rows_per_second": 15.0,
+    }
+    assert result_backend.mget.call_count == 2
+
+
+def test_batch_status_validates_body(authenticated_client: APIClient, settings) -> None:
+    """Test the body must hold a bounded list of string IDs."""
+    settings.ITEMS_TASK_STATUS_MAX_IDS = 2
+    url = reverse("item-task-statuses")
+
+    assert authenticated_client.post(url, [], format="json").status_code == 400
+    response = authenticated_client.post(url, {"task_ids": [1]}, format="json")
+    assert response.status_code == 400
+    response = authenticated_client.post(
+        url, {"task_ids": ["a", "b", "c"]}, format="json"
+    )
+    assert response.status_code == 400
+
+
+def test_task_progress_is_throttled() -> None:
+    """Test PROGRESS states are published at most once per interval."""
+    task = MagicMock()
+    progress = TaskProgress(task, interval=3600)
+
+    progress(0, 10)
+    progress(5, 10)
+
+    task.update_state.assert_called_once()
+    assert task.update_state.call_args.kwargs["state"] == PROGRESS
+    assert task.update_state.call_args.kwargs["meta"]["total"] == 10
+
+
+def test_task_progress_is_disabled_inline() -> None:
+    """Test no reporter is created when a task is called directly."""
+    task = MagicMock()
+    task.request.id = None
+
+    assert TaskProgress.for_task(task) is None
+
+
+@pytest.mark.django_db
+def test_sync_reports_progress_per_batch() -> None:
+    """Test the sync calls its progress callback with running totals."""
+    items = Item.objects.bulk_create(
+        [Item(name=f"Item{i}", price=Decimal("1.00")) for i in range(5)]
+    )
+    calls: List[Tuple[int, int]] = []
+
+    sync_item_range(
+        items[0].pk,
+        items[-1].pk + 1,
+        batch_size=2,
+        progress=lambda processed, total: calls.append((processed, total)),
+    )
+
+    assert calls == [(0, 5), (2, 5), (4, 5), (5, 5)]
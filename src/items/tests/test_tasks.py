@@ -1,15 +1,28 @@
+from datetime import timedelta
 from decimal import Decimal
-from typing import List
+from typing import Any, Callable, ContextManager, Dict, List, Sequence
 from unittest.mock import MagicMock
 
 import pytest
+from celery import current_app
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 
-from items.models import Item
+from items.models import PRICE_SYNC_PENDING, Item, ItemSyncState
 from items.tasks import (
+    aggregate_external_price_sync,
     hourly_external_price_sync,
     simulate_external_price_sync_for_item,
+    sync_external_price_shard,
+)
+from items.utils.price_sync import (
+    plan_id_shards,
+    sync_all_items,
+    sync_item_by_id,
+    sync_item_range,
+    sync_items_by_ids,
 )
-from items.utils.price_sync import sync_all_items
 
 
 @pytest.mark.django_db
@@ -28,15 +41,121 @@ def test_simulate_external_price_sync_for_item(mocker: MagicMock) -> None:
 
 @pytest.mark.django_db
 def test_hourly_external_price_sync(mocker: MagicMock) -> None:
-    """Test the hourly external price synchronization task."""
-    mock_sync_all: MagicMock = mocker.patch(
-        "items.tasks.sync_all_items", return_value=3
+    """Test the hourly sync dispatches one chord of shard tasks."""
+    mocker.patch(
+        "items.tasks.plan_id_shards", return_value=[(1, 101), (101, 201), (201, 301)]
     )
+    mock_chord: MagicMock = mocker.patch("items.tasks.chord")
+    mock_chord.return_value.return_value.id = "fake-chord-id"
 
-    result: str = hourly_external_price_sync()
+    result: Dict[str, Any] = hourly_external_price_sync()
 
-    assert result == "Updated external_price for 3 items."
-    mock_sync_all.assert_called_once_with()
+    assert result["message"] == (
+        "Dispatched external_price sync across 3 shards "
+        "(aggregate task fake-chord-id)."
+    )
+    assert result["aggregate_task_id"] == "fake-chord-id"
+    header = list(mock_chord.call_args.args[0])
+    assert result["subtask_ids"] == [signature.id for signature in header]
+    assert [signature.args for signature in header] == [
+        (1, 101),
+        (101, 201),
+        (201, 301),
+    ]
+    callback = mock_chord.return_value.call_args.args[0]
+    assert callback.task == aggregate_external_price_sync.name
+
+
+@pytest.mark.django_db
+def test_hourly_external_price_sync_empty_table(mocker: MagicMock) -> None:
+    """Test that nothing is dispatched when there are no items."""
+    mock_chord: MagicMock = mocker.patch("items.tasks.chord")
+
+    result: Dict[str, Any] = hourly_external_price_sync()
+
+    assert result["message"] == "Updated external_price for 0 items."
+    assert result["subtask_ids"] == []
+    mock_chord.assert_not_called()
+
+
+def test_aggregate_external_price_sync() -> None:
+    """Test that the chord callback sums the shard counts."""
+    assert aggregate_external_price_sync([3, 0, 4]) == (
+        "Updated external_price for 7 items."
+    )
+
+
+@pytest.mark.django_db
+def test_plan_id_shards_respects_max_shards() -> None:
+    """Test that shards split the stale IDs and are widened for max_shards."""
+    items: List[Item] = [
+        Item.objects.create(name=f"Item{i}", price=Decimal("1.00")) for i in range(10)
+    ]
+    ids = [item.id for item in items]
+
+    assert plan_id_shards(shard_size=4, max_shards=10) == [
+        (ids[0], ids[3] + 1),
+        (ids[4], ids[6] + 1),
+        (ids[7], ids[9] + 1),
+    ]
+    assert plan_id_shards(shard_size=1, max_shards=2) == [
+        (ids[0], ids[4] + 1),
+        (ids[5], ids[9] + 1),
+    ]
+
+
+@pytest.mark.django_db
+def test_plan_id_shards_covers_only_stale_items(settings) -> None:
+    """Test shard boundaries follow the stale Items, not the ID span."""
+    settings.ITEMS_PRICE_SYNC_TTL = 3600
+    items = make_synced_items(8, timedelta(minutes=5))
+    ItemSyncState.objects.filter(item__in=items[6:]).update(
+        synced_at=timezone.now() - timedelta(hours=2)
+    )
+    Item.objects.filter(pk=items[1].pk).update(price=Decimal("12.00"))
+
+    assert plan_id_shards(shard_size=2, max_shards=10) == [
+        (items[1].id, items[6].id + 1),
+        (items[7].id, items[7].id + 1),
+    ]
+    assert plan_id_shards(shard_size=2, max_shards=10, ttl=86400) == [
+        (items[1].id, items[1].id + 1)
+    ]
+
+
+@pytest.mark.django_db
+def test_shard_reads_expired_items_along_its_range(settings) -> None:
+    """Test a shard syncs its expired Items in ID order."""
+    settings.ITEMS_PRICE_SYNC_TTL = 60
+    items = make_synced_items(4, timedelta(hours=1))
+    ItemSyncState.objects.filter(item=items[3]).update(
+        synced_at=timezone.now() - timedelta(hours=3)
+    )
+    client = FixedPriceClient(Decimal("9.50"))
+
+    assert sync_item_range(items[1].id, items[3].id + 1, client=client) == 3
+    assert client.fetched == [items[1].id, items[2].id, items[3].id]
+
+
+@pytest.mark.django_db
+def test_sync_external_price_shard_only_touches_its_range() -> None:
+    """Test that a shard task reprices only the items in its ID range."""
+    items: List[Item] = [
+        Item.objects.create(
+            name=f"Item{i}", price=Decimal("100.00"), external_price=Decimal("0.00")
+        )
+        for i in range(4)
+    ]
+
+    count: int = sync_external_price_shard(items[1].id, items[3].id)
+
+    assert count == 2
+    synced = set(
+        Item.objects.exclude(external_price=Decimal("0.00")).values_list(
+            "id", flat=True
+        )
+    )
+    assert synced == {items[1].id, items[2].id}
 
 
 @pytest.mark.django_db
@@ -72,3 +191,229 @@ def test_sync_all_items_updates_all() -> None:
     assert count == len(items)
     for item in Item.objects.all():
         assert item.external_price is not None
+
+
+@pytest.mark.django_db
+def test_sync_all_items_streams_keyset_windows(
+    django_assert_num_queries: Callable[..., ContextManager[None]],
+) -> None:
+    """Test that items are read and written one window at a time."""
+    for i in range(5):
+        Item.objects.create(name=f"Item{i}", price=Decimal("100.00"))
+
+    # 3 windows of (SELECT + bulk UPDATE + sync state upsert + history INSERT
+    # + drift summary UPDATE) plus the final
+    # empty SELECT of the never-synced pass and the empty SELECT of the
+    # expired pass. Each window's writes run in their own atomic block
+    # (SAVEPOINT/RELEASE).
+    with django_assert_num_queries(3 * 7 + 2):
+        count: int = sync_all_items(batch_size=2)
+
+    assert count == 5
+    for item in Item.objects.all():
+        assert Decimal("90.00") <= item.external_price <= Decimal("110.00")
+
+
+@pytest.mark.django_db
+def test_sync_all_items_in_database() -> None:
+    """Test the set-based SQL path reprices every item within ±10%."""
+    for i in range(5):
+        Item.objects.create(name=f"Item{i}", price=Decimal("100.00"))
+
+    count: int = sync_all_items(batch_size=2, in_database=True)
+
+    assert count == 5
+    for item in Item.objects.all():
+        assert Decimal("90.00") <= item.external_price <= Decimal("110.00")
+
+
+class EditingClient:
+    """
+    Price client stub that edits the item during the first `edits` calls.
+    It runs in the calling thread so the edit shares the test transaction.
+    """
+
+    def __init__(self, edits: int) -> None:
+        self.edits = edits
+        self.calls = 0
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        self.calls += 1
+        if self.calls <= self.edits:
+            Item.objects.get(pk=items[0].pk).save()
+        return {item.pk: Decimal("42.00") for item in items}
+
+
+@pytest.mark.django_db
+def test_sync_item_by_id_takes_no_row_lock() -> None:
+    """Test that the item is read without SELECT ... FOR UPDATE."""
+    item: Item = Item.objects.create(name="Item1", price=Decimal("50.00"))
+    client = EditingClient(edits=0)
+
+    with CaptureQueriesContext(connection) as queries:
+        result: str = sync_item_by_id(item.id, client=client)
+
+    assert result == "External price for 'Item1' updated to 42.00"
+    # SELECT, then UPDATE, sync state upsert, history INSERT and drift
+    # summary UPDATE in one atomic block.
+    assert len(queries) == 7
+    assert not any("FOR UPDATE" in query["sql"] for query in queries)
+
+
+@pytest.mark.django_db
+def test_sync_item_by_id_retries_on_conflict() -> None:
+    """Test that a concurrent edit makes the sync re-read and retry."""
+    item: Item = Item.objects.create(name="Item1", price=Decimal("50.00"))
+    client = EditingClient(edits=1)
+
+    result: str = sync_item_by_id(item.id, client=client)
+    item.refresh_from_db()
+
+    assert client.calls == 2
+    assert result == "External price for 'Item1' updated to 42.00"
+    assert item.external_price == Decimal("42.00")
+
+
+@pytest.mark.django_db
+def test_sync_item_by_id_gives_up_after_max_attempts() -> None:
+    """Test that the sync stops retrying after max_attempts conflicts."""
+    item: Item = Item.objects.create(name="Item1", price=Decimal("50.00"))
+    client = EditingClient(edits=5)
+
+    result: str = sync_item_by_id(item.id, client=client, max_attempts=2)
+    item.refresh_from_db()
+
+    assert "was not updated" in result
+    assert item.external_price == Decimal("0.00")
+
+
+class FixedPriceClient:
+    """Price client stub returning the same price for every item."""
+
+    def __init__(self, price: Decimal) -> None:
+        self.price = price
+        self.fetched: List[int] = []
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        self.fetched.extend(item.pk for item in items)
+        return {item.pk: self.price for item in items}
+
+
+def make_synced_items(count: int, synced_ago: timedelta) -> List[Item]:
+    """Create items whose external price was synced ``synced_ago``."""
+    items = [
+        Item.objects.create(name=f"Item{i}", price=Decimal("10.00"))
+        for i in range(count)
+    ]
+    sync_items_by_ids(
+        [item.pk for item in items], client=FixedPriceClient(Decimal("9.00"))
+    )
+    ItemSyncState.objects.update(synced_at=timezone.now() - synced_ago)
+    return items
+
+
+@pytest.mark.django_db
+def test_sync_all_items_skips_fresh_items(settings) -> None:
+    """Test only never-synced, repriced and expired items are synced."""
+    settings.ITEMS_PRICE_SYNC_TTL = 3600
+    fresh, edited, expired = make_synced_items(3, timedelta(minutes=5))
+    ItemSyncState.objects.filter(item=expired).update(
+        synced_at=timezone.now() - timedelta(hours=2)
+    )
+    Item.objects.filter(pk=edited.pk).update(price=Decimal("12.00"))
+    new = Item.objects.create(name="New", price=Decimal("10.00"))
+    client = FixedPriceClient(Decimal("9.50"))
+
+    count: int = sync_all_items(batch_size=10, client=client)
+
+    assert count == 3
+    # Pending items (edited, never synced) come before expired ones.
+    assert client.fetched == [edited.pk, new.pk, expired.pk]
+    assert Item.objects.get(pk=fresh.pk).external_price == Decimal("9.00")
+    edited.refresh_from_db()
+    assert edited.external_price == Decimal("9.50")
+    assert edited.price_at_sync == Decimal("12.00")
+
+
+@pytest.mark.django_db
+def test_sync_all_items_orders_expired_items_oldest_first(settings) -> None:
+    """Test expired items are synced most overdue first across windows."""
+    settings.ITEMS_PRICE_SYNC_TTL = 60
+    items = make_synced_items(5, timedelta(hours=1))
+    now = timezone.now()
+    for age, item in zip([3, 5, 1, 4, 2], items):
+        ItemSyncState.objects.filter(item=item).update(
+            synced_at=now - timedelta(hours=age)
+        )
+    client = FixedPriceClient(Decimal("9.50"))
+
+    assert sync_all_items(batch_size=2, client=client) == 5
+    assert client.fetched == [items[i].pk for i in (1, 3, 0, 4, 2)]
+    assert sync_all_items(batch_size=2, client=client) == 0
+
+
+def row_location(item: Item) -> str:
+    """The physical location (ctid) of an Item's current row version."""
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"SELECT ctid FROM {Item._meta.db_table} WHERE id = %s", [item.pk]
+        )
+        return cursor.fetchone()[0]
+
+
+@pytest.mark.django_db
+def test_unchanged_prices_are_not_rewritten(settings) -> None:
+    """Test a sync that finds the same price only stamps the sync state."""
+    settings.ITEMS_PRICE_SYNC_TTL = 60
+    [item] = make_synced_items(1, timedelta(hours=1))
+    before = ItemSyncState.objects.get(item=item)
+    location = row_location(item)
+
+    assert sync_all_items(client=FixedPriceClient(Decimal("9.00"))) == 1
+
+    assert Item.objects.get(pk=item.pk).external_price == Decimal("9.00")
+    assert ItemSyncState.objects.get(item=item).synced_at > before.synced_at
+    # Any UPDATE, even one writing the same values, moves the row.
+    assert row_location(item) == location
+
+
+@pytest.mark.django_db
+def test_stale_sync_uses_indexes() -> None:
+    """Test both stale passes are served by their indexes."""
+    Item.objects.create(name="Item", price=Decimal("1.00"))
+    cutoff = timezone.now()
+    with connection.cursor() as cursor:
+        # Table statistics left by earlier tests must not sway the planner.
+        cursor.execute("ANALYZE items_item")
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_bitmapscan = off")
+    pending = Item.objects.filter(PRICE_SYNC_PENDING, pk__gt=0).order_by("pk")
+    expired = Item.objects.filter(sync_state__synced_at__lt=cutoff).order_by(
+        "sync_state__synced_at", "pk"
+    )
+
+    assert "item_price_sync_pending_idx" in pending[:10].explain()
+    assert "item_sync_state_synced_at_idx" in expired[:10].explain()
+
+
+@pytest.mark.parametrize(
+    "task, queue",
+    [
+        (simulate_external_price_sync_for_item, "interactive"),
+        (hourly_external_price_sync, "bulk"),
+        (sync_external_price_shard, "bulk"),
+        (aggregate_external_price_sync, "bulk"),
+    ],
+)
+def test_tasks_are_routed_by_workload(task: Any, queue: str) -> None:
+    """Test per-item syncs and full-table syncs go to separate queues."""
+    route = current_app.amqp.router.route({}, task.name)
+
+    assert route["queue"].name == queue
+
+
+def test_bulk_tasks_are_acknowledged_late() -> None:
+    """Test shards are redelivered if their worker dies, item syncs are not."""
+    assert sync_external_price_shard.acks_late
+    assert sync_external_price_shard.reject_on_worker_lost
+    assert not simulate_external_price_sync_for_item.acks_late
@@ -1,6 +1,7 @@
 from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
+from . import async_views
 from .views import ItemViewSet
 
 router = DefaultRouter()
@@ -8,4 +9,7 @@ router.register(r"items", ItemViewSet)
 
 urlpatterns = [
     path("", include(router.urls)),
+    # Async list and retrieve, for serving under ASGI.
+    path("async/items/", async_views.item_list, name="item-async-list"),
+    path("async/items/<str:pk>/", async_views.item_detail, name="item-async-detail"),
 ]
@@ -0,0 +1,379 @@
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from base64 import b64encode
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import connection, connections, transaction
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from items.models import Item
+from items.serializers import ItemRowSerializer, ItemSerializer
+from items.utils.item_generator import generate_items
+from items.utils.price_client import PriceClient
+from items.utils.price_providers import SimulatedPriceProvider
+from items.utils.price_sync import sync_all_items, sync_item_by_id
+from items.views import ItemViewSet
+
+Result = Dict[str, float]
+
+# Fraction of the table skipped by the deep-page scenarios.
+DEEP_PAGE_DEPTH = 0.9
+# Rows rendered per round of the serializer scenarios.
+SERIALIZER_ROWS = 1000
+
+# Database connection settings compared by benchmark_connections: a new
+# connection per request (Django's default), persistent health-checked
+# connections, and a psycopg 3 pool.
+CONNECTION_MODES: Dict[str, Dict[str, Any]] = {
+    "per_request": {"CONN_MAX_AGE": 0},
+    "persistent": {"CONN_MAX_AGE": 60, "CONN_HEALTH_CHECKS": True},
+    "pool": {"CONN_MAX_AGE": 0, "OPTIONS": {"pool": {"min_size": 1, "max_size": 2}}},
+}
+# Alias of the benchmark connections; pools are shared per alias.
+CONNECTION_BENCHMARK_ALIAS = "connection-benchmark"
+
+
+class BenchmarkContext:
+    """
+    Shared state of one benchmark run over the current Item table: the
+    request factory and user for API calls, a sample of IDs and a search
+    term taken from existing rows, and a price client that answers
+    instantly so that only our own code is measured.
+    """
+
+    def __init__(self, repeat: int) -> None:
+        self.repeat = repeat
+        self.count = Item.objects.count()
+        self.factory = APIRequestFactory()
+        self.user = User(username="benchmark")
+        step = max(self.count // repeat, 1)
+        self.sample_ids = list(
+            Item.objects.order_by("pk").values_list("pk", flat=True)[::step][:repeat]
+        )
+        self.search_term = (
+            Item.objects.filter(pk__in=self.sample_ids[:1])
+            .values_list("name", flat=True)
+            .first()
+            or "item"
+        )
+        self.client = PriceClient(
+            SimulatedPriceProvider(host=f"benchmark-{time.monotonic_ns()}"),
+            max_in_flight=1,
+        )
+
+    def get(self, action: str, params: Optional[Dict[str, Any]] = None, **kwargs):
+        """Run ItemViewSet ``action`` on a GET request and render the response."""
+        request = self.factory.get("/api/items/", params or {})
+        force_authenticate(request, user=self.user)
+        view = ItemViewSet.as_view({"get": action})
+        response = view(request, **kwargs)
+        assert response.status_code == 200, response.data
+        return response.render()
+
+
+def measure(run: Callable[[int], Any], repeat: int) -> Result:
+    """
+    Time ``repeat`` calls of ``run(index)`` after one warm-up call and
+    return the median and 95th percentile latency in milliseconds.
+    """
+    run(0)
+    durations = []
+    for index in range(repeat):
+        started = time.perf_counter()
+        run(index)
+        durations.append((time.perf_counter() - started) * 1000)
+    durations.sort()
+    return {
+        "median_ms": round(statistics.median(durations), 3),
+        "p95_ms": round(
+            durations[min(int(len(durations) * 0.95), len(durations) - 1)], 3
+        ),
+    }
+
+
+def deep_cursor(field: str, offset: int) -> Optional[str]:
+    """Keyset cursor for the ``offset``-th row in ``-field`` order, if any."""
+    rows = Item.objects.order_by(f"-{field}", "-pk").values(field, "pk")
+    boundary = rows[offset : offset + 1].first()
+    if boundary is None:
+        return None
+    payload = {"v": str(boundary[field]), "id": boundary["pk"], "r": False}
+    return b64encode(json.dumps(payload).encode("utf-8")).decode("ascii")
+
+
+def bench_list(context: BenchmarkContext) -> Result:
+    return measure(lambda _: context.get("list"), context.repeat)
+
+
+def bench_retrieve(context: BenchmarkContext) -> Result:
+    ids = context.sample_ids
+    return measure(
+        lambda index: context.get("retrieve", pk=ids[index % len(ids)]),
+        context.repeat,
+    )
+
+
+def bench_search(context: BenchmarkContext) -> Result:
+    return measure(
+        lambda _: context.get("list", {"search": context.search_term}),
+        context.repeat,
+    )
+
+
+def bench_ordering(context: BenchmarkContext) -> Result:
+    return measure(
+        lambda _: context.get("list", {"ordering": "-price"}), context.repeat
+    )
+
+
+def bench_deep_page(context: BenchmarkContext) -> Result:
+    page_size = settings.REST_FRAMEWORK["PAGE_SIZE"]
+    page = max(int(context.count * DEEP_PAGE_DEPTH) // page_size, 1)
+    return measure(lambda _: context.get("list", {"page": page}), context.repeat)
+
+
+def bench_deep_cursor(context: BenchmarkContext) -> Result:
+    params = {"pagination": "cursor"}
+    cursor = deep_cursor("created_at", int(context.count * DEEP_PAGE_DEPTH))
+    if cursor is not None:
+        params["cursor"] = cursor
+    return measure(lambda _: context.get("list", params), context.repeat)
+
+
+def serializer_throughput(
+    serialize: Callable[[], Any], rows: int, repeat: int
+) -> Result:
+    timings = measure(lambda _: serialize(), repeat)
+    return {**timings, "rows_per_second": round(rows / timings["median_ms"] * 1000)}
+
+
+def bench_item_serializer(context: BenchmarkContext) -> Result:
+    page = list(Item.objects.defer("search_vector").order_by("pk")[:SERIALIZER_ROWS])
+    renderer = JSONRenderer()
+    return serializer_throughput(
+        lambda: renderer.render(ItemSerializer(page, many=True).data),
+        max(len(page), 1),
+        context.repeat,
+    )
+
+
+def bench_row_serializer(context: BenchmarkContext) -> Result:
+    page = list(
+        Item.objects.order_by("pk").values(*ItemRowSerializer.value_fields())[
+            :SERIALIZER_ROWS
+        ]
+    )
+    renderer = JSONRenderer()
+    return serializer_throughput(
+        lambda: renderer.render(ItemRowSerializer(page, many=True).data),
+        max(len(page), 1),
+        context.repeat,
+    )
+
+
+def bench_sync_all(context: BenchmarkContext) -> Result:
+    """
+    Full sync of every Item: throughput from an untraced run, and the
+    peak Python heap from a second run under tracemalloc (which would
+    otherwise slow the first one down).
+    """
+    started = time.perf_counter()
+    synced = sync_all_items(client=context.client, full=True)
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    try:
+        sync_all_items(client=context.client, full=True)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "rows_per_second": round(synced / max(elapsed, 1e-9)),
+        "peak_mb": round(peak / 2**20, 2),
+    }
+
+
+def bench_sync_item(context: BenchmarkContext) -> Result:
+    ids = context.sample_ids
+    return measure(
+        lambda index: sync_item_by_id(ids[index % len(ids)], client=context.client),
+        context.repeat,
+    )
+
+
+BENCHMARKS: Dict[str, Callable[[BenchmarkContext], Result]] = {
+    "api.list": bench_list,
+    "api.retrieve": bench_retrieve,
+    "api.search": bench_search,
+    "api.ordering": bench_ordering,
+    "api.deep_page": bench_deep_page,
+    "api.deep_cursor": bench_deep_cursor,
+    "serializer.item": bench_item_serializer,
+    "serializer.row": bench_row_serializer,
+    "sync.all": bench_sync_all,
+    "sync.item": bench_sync_item,
+}
+# Benchmarks that write to the Item table, the price history and the drift
+# summary; run_benchmarks() rolls their changes back.
+WRITING_BENCHMARKS = {"sync.all", "sync.item"}
+
+
+def bench_connection_mode(mode: str, repeat: int) -> Result:
+    """
+    Time the database work of ``repeat`` requests on a connection set up as
+    CONNECTION_MODES[``mode``]: the checks Django runs when a request starts
+    and finishes (which close, or return to the pool, a connection that is
+    not to be kept) around one trivial query.
+    """
+    base = connections["default"].settings_dict
+    overrides = CONNECTION_MODES[mode]
+    # Registered as a database of its own, as connection signal handlers
+    # look connections up by alias.
+    connections.settings[CONNECTION_BENCHMARK_ALIAS] = {
+        **base,
+        **overrides,
+        "OPTIONS": {**base.get("OPTIONS", {}), **overrides.get("OPTIONS", {})},
+    }
+    benchmark_connection = connections[CONNECTION_BENCHMARK_ALIAS]
+
+    def request(_: int) -> None:
+        benchmark_connection.close_if_unusable_or_obsolete()
+        with benchmark_connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+        benchmark_connection.close_if_unusable_or_obsolete()
+
+    try:
+        return measure(request, repeat)
+    finally:
+        benchmark_connection.close()
+        if benchmark_connection.settings_dict["OPTIONS"].get("pool"):
+            benchmark_connection.close_pool()
+        del connections[CONNECTION_BENCHMARK_ALIAS]
+        del connections.settings[CONNECTION_BENCHMARK_ALIAS]
+
+
+def run_connection_benchmarks(
+    repeat: int, modes: Optional[Sequence[str]] = None
+) -> Dict[str, Result]:
+    """Run bench_connection_mode for the ``modes`` (all by default)."""
+    return {
+        mode: bench_connection_mode(mode, repeat) for mode in modes or CONNECTION_MODES
+    }
+
+
+def seed_items(count: int, workers: int = 1, seed: int = 0) -> int:
+    """
+    Top the Item table up to ``count`` rows with generate_items. Existing
+    rows are kept, so growing sizes can be benchmarked one after another.
+    Returns the resulting row count.
+    """
+    missing = count - Item.objects.count()
+    if missing > 0:
+        for _ in generate_items(missing, workers=workers, seed=seed):
+            pass
+    return Item.objects.count()
+
+
+@contextmanager
+def rolled_back() -> Iterator[None]:
+    """Run the block in a transaction that is always rolled back."""
+    with transaction.atomic():
+        yield
+        transaction.set_rollback(True)
+
+
+def run_benchmarks(
+    repeat: int,
+    names: Optional[Sequence[str]] = None,
+    use_cache: bool = False,
+) -> Dict[str, Result]:
+    """
+    Run the ``names`` benchmarks (all by default) against the current
+    table. The response cache is disabled unless ``use_cache`` is set, so
+    API timings cover the database and serialization path. Benchmarks in
+    WRITING_BENCHMARKS run in a transaction that is rolled back, so the
+    table is left as seeded.
+    """
+    response_cache = {**settings.ITEMS_RESPONSE_CACHE, "ENABLED": use_cache}
+    results = {}
+    # APIRequestFactory requests come from the "testserver" host.
+    allowed_hosts = [*settings.ALLOWED_HOSTS, "testserver"]
+    with override_settings(
+        ITEMS_RESPONSE_CACHE=response_cache, ALLOWED_HOSTS=allowed_hosts
+    ):
+        context = BenchmarkContext(repeat)
+        try:
+            for name in names or BENCHMARKS:
+                if name in WRITING_BENCHMARKS:
+                    with rolled_back():
+                        results[name] = BENCHMARKS[name](context)
+                else:
+                    results[name] = BENCHMARKS[name](context)
+        finally:
+            context.client.close()
+    return results
+
+
+def describe_environment() -> Dict[str, Any]:
+    """Where and when a set of results was measured."""
+    return {
+        "created_at": timezone.now().isoformat(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "postgres": connection.pg_version,
+    }
+
+
+def is_regression(
+    metric: str, baseline: float, current: float, threshold: float
+) -> bool:
+    """
+    Whether ``current`` is worse than ``baseline`` by more than
+    ``threshold`` (a fraction). Rates are better when higher, latencies and
+    memory when lower.
+    """
+    if not baseline:
+        return False
+    if metric.endswith("_per_second"):
+        change = (baseline - current) / baseline
+    else:
+        change = (current - baseline) / baseline
+    return change > threshold
+
+
+def compare_results(
+    baseline: Dict[str, Any], current: Dict[str, Any], threshold: float
+) -> List[Dict[str, Any]]:
+    """
+    Compare two saved result sets, size by size and metric by metric.
+    Returns one entry per metric that regressed beyond ``threshold``;
+    sizes, benchmarks and metrics missing from either side are skipped.
+    """
+    regressions = []
+    for size, benchmarks in current["sizes"].items():
+        for name, metrics in benchmarks.items():
+            previous = baseline["sizes"].get(size, {}).get(name, {})
+            for metric, value in metrics.items():
+                if metric not in previous:
+                    continue
+                if is_regression(metric, previous[metric], value, threshold):
+                    regressions.append(
+                        {
+                            "size": size,
+                            "benchmark": name,
+                            "metric": metric,
+                            "baseline": previous[metric],
+                            "current": value,
+                            "change": round(value / previous[metric] - 1, 4),
+                        }
+                    )
+    return regressions
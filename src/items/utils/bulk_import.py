@@ -0,0 +1,264 @@
+import codecs
+import csv
+import io
+import json
+from itertools import islice
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import connection, transaction
+from rest_framework import serializers
+
+from items.cache import invalidate_items
+from items.models import Item
+from items.serializers import ItemSerializer
+from items.utils.price_drift import DriftDelta
+from items.utils.sync_dispatch import queue_external_price_sync
+
+IMPORT_FORMATS = ("csv", "ndjson")
+STAGING_TABLE = "items_item_import"
+STAGING_COLUMNS = ("id", "name", "description", "price", "external_price")
+
+MERGE_SQL = f"""
+    INSERT INTO {Item._meta.db_table}
+        (id, name, description, price, external_price, created_at, updated_at)
+    SELECT
+        COALESCE(s.id, nextval(pg_get_serial_sequence(%(table)s, 'id'))),
+        s.name,
+        s.description,
+        s.price,
+        COALESCE(s.external_price, t.external_price, 0),
+        now(),
+        now()
+    FROM {STAGING_TABLE} s
+    LEFT JOIN {Item._meta.db_table} t ON t.id = s.id
+    ON CONFLICT (id) DO UPDATE SET
+        name = EXCLUDED.name,
+        description = EXCLUDED.description,
+        price = EXCLUDED.price,
+        external_price = EXCLUDED.external_price,
+        updated_at = EXCLUDED.updated_at
+    RETURNING id, xmax = 0 AS inserted, price_drift
+"""
+
+# Locks the Items a batch overwrites and reads their drift before the merge.
+LOCK_EXISTING_SQL = f"""
+    SELECT id, price_drift FROM {Item._meta.db_table}
+    WHERE id IN (SELECT id FROM {STAGING_TABLE})
+    ORDER BY id
+    FOR UPDATE
+"""
+
+# Explicit IDs bypass the identity sequence; move it past them before the
+# merge, so neither the batch's rows without an id nor later inserts
+# collide with them.
+RESYNC_SEQUENCE_SQL = f"""
+    SELECT setval(
+        pg_get_serial_sequence(%(table)s, 'id'),
+        GREATEST(
+            (SELECT MAX(id) FROM {STAGING_TABLE}),
+            (SELECT MAX(id) FROM {Item._meta.db_table}),
+            (SELECT last_value FROM pg_sequences
+             WHERE schemaname || '.' || sequencename
+                 = pg_get_serial_sequence(%(table)s, 'id'))
+        )
+    )
+"""
+
+
+class ItemImportSerializer(ItemSerializer):
+    """Validates one imported row; ``id`` selects the Item to overwrite."""
+
+    id = serializers.IntegerField(required=False, min_value=1)
+
+    class Meta(ItemSerializer.Meta):
+        fields = STAGING_COLUMNS
+
+
+class ImportReport:
+    """Outcome of an import: row counts and one error entry per bad row."""
+
+    def __init__(self) -> None:
+        self.created = 0
+        self.updated = 0
+        self.errors: List[Dict[str, Any]] = []
+
+    def add_error(self, row: int, errors: Any) -> None:
+        self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "created": self.created,
+            "updated": self.updated,
+            "failed": len(self.errors),
+            "errors": self.errors,
+        }
+
+
+def guess_import_format(filename: str) -> Optional[str]:
+    """Return the import format matching a file name's extension, if any."""
+    extension = filename.rsplit(".", 1)[-1].lower()
+    if extension == "jsonl":
+        return "ndjson"
+    return extension if extension in IMPORT_FORMATS else None
+
+
+def is_valid_utf8(file: IO[bytes], chunk_size: int = 1 << 20) -> bool:
+    """
+    Whether a binary file decodes as UTF-8, read in chunks and rewound
+    afterwards. Imports commit batch by batch, so an upload is checked
+    before its first batch is written.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            decoder.decode(chunk)
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        file.seek(0)
+    return True
+
+
+def iter_records(
+    stream: IO[str], import_format: str
+) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Yield ``(row number, record, parse error)`` for each row of a CSV (with
+    a header line) or NDJSON text stream. Row numbers are 1-based data rows;
+    blank NDJSON lines are skipped.
+    """
+    if import_format == "csv":
+        for number, record in enumerate(csv.DictReader(stream), start=1):
+            # Empty cells are treated as omitted; extra cells land under None.
+            if None in record:
+                yield number, None, "Row has more cells than the header."
+            else:
+                yield number, {
+                    key: value for key, value in record.items() if value
+                }, None
+        return
+
+    for number, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield number, None, "Invalid JSON."
+            continue
+        if isinstance(record, dict):
+            yield number, record, None
+        else:
+            yield number, None, "Expected a JSON object."
+
+
+def _copy_csv_value(value: Any) -> str:
+    # COPY's CSV format reads an unquoted empty cell as NULL and a quoted
+    # one as an empty string, so every non-null value is quoted.
+    if value is None:
+        return ""
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def copy_rows(
+    cursor: Any, table: str, columns: Iterable[str], rows: Iterable[tuple]
+) -> None:
+    """Load rows into ``table`` with a single COPY ... FROM STDIN."""
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write(",".join(_copy_csv_value(value) for value in row) + "\n")
+    buffer.seek(0)
+    sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)"
+    raw_cursor = cursor.cursor
+    if hasattr(raw_cursor, "copy_expert"):
+        # psycopg2
+        raw_cursor.copy_expert(sql, buffer)
+    else:
+        with raw_cursor.copy(sql) as copy:
+            copy.write(buffer.getvalue())
+
+
+def import_items(
+    stream: IO[str], import_format: str, batch_size: Optional[int] = None
+) -> ImportReport:
+    """
+    Upsert Items from a CSV or NDJSON stream.
+
+    Rows are validated in batches of ``batch_size``; each batch's valid rows
+    are COPYed into a temporary staging table and merged into the Item table
+    in its own transaction: rows with an existing ``id`` overwrite it, the
+    rest are created. Invalid rows are reported individually and do not
+    affect their batch. One batched price sync is queued for all created
+    Items once the import finishes.
+    """
+    if import_format not in IMPORT_FORMATS:
+        raise ValueError(f"Unsupported import format: {import_format}")
+    batch_size = batch_size or settings.ITEMS_IMPORT_BATCH_SIZE
+
+    report = ImportReport()
+    seen_ids = set()
+    created_ids: List[int] = []
+    records = iter_records(stream, import_format)
+
+    while batch := list(islice(records, batch_size)):
+        rows = []
+        for number, record, parse_error in batch:
+            if parse_error is not None:
+                report.add_error(number, {"non_field_errors": [parse_error]})
+                continue
+            serializer = ItemImportSerializer(data=record)
+            if not serializer.is_valid():
+                report.add_error(number, serializer.errors)
+                continue
+            data = serializer.validated_data
+            item_id = data.get("id")
+            if item_id is not None:
+                if item_id in seen_ids:
+                    report.add_error(number, {"id": ["Duplicate id in import."]})
+                    continue
+                seen_ids.add(item_id)
+            rows.append(tuple(data.get(column) for column in STAGING_COLUMNS))
+
+        if rows:
+            created, updated = _merge_batch(rows)
+            report.created += len(created)
+            report.updated += len(updated)
+            created_ids.extend(created)
+
+    if created_ids:
+        queue_external_price_sync(created_ids)
+    return report
+
+
+def _merge_batch(rows: List[tuple]) -> Tuple[List[int], List[int]]:
+    table = Item._meta.db_table
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE {STAGING_TABLE} ("
+            "id bigint, name varchar(255), description text, "
+            "price numeric(10, 2), external_price numeric(10, 2))"
+        )
+        copy_rows(cursor, STAGING_TABLE, STAGING_COLUMNS, rows)
+        drift = DriftDelta()
+        if any(row[0] is not None for row in rows):
+            cursor.execute(RESYNC_SEQUENCE_SQL, {"table": table})
+            cursor.execute(LOCK_EXISTING_SQL)
+            for _, old_drift in cursor.fetchall():
+                drift.remove(old_drift)
+        cursor.execute(MERGE_SQL, {"table": table})
+        results = cursor.fetchall()
+        cursor.execute(f"DROP TABLE {STAGING_TABLE}")
+
+        created = [item_id for item_id, inserted, _ in results if inserted]
+        updated = [item_id for item_id, inserted, _ in results if not inserted]
+        # Overwritten external prices move their Item's drift; created
+        # Items have none until their first sync.
+        for _, inserted, new_drift in results:
+            if not inserted:
+                drift.add(new_drift)
+        drift.save()
+        # The merge bypasses model signals, so invalidate cached responses here.
+        invalidate_items(created + updated)
+    return created, updated
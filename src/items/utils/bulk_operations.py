@@ -0,0 +1,217 @@
+from typing import Any, Dict, List, Optional, Sequence
+
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework import status
+
+from items.cache import invalidate_items
+from items.models import Item, ItemSyncState
+from items.serializers import ItemSerializer
+from items.utils.price_drift import DriftDelta, item_drift
+from items.utils.sync_dispatch import queue_external_price_sync
+
+# Deletes Items with their sync state, returning each deleted Item's drift.
+BULK_DELETE_SQL = f"""
+    WITH deleted AS (
+        DELETE FROM {Item._meta.db_table} WHERE id = ANY(%s)
+        RETURNING id, price_drift
+    ),
+    states AS (
+        DELETE FROM {ItemSyncState._meta.db_table}
+        WHERE item_id IN (SELECT id FROM deleted)
+    )
+    SELECT id, price_drift FROM deleted
+"""
+
+
+class BulkResult:
+    """
+    Per-item outcome of a bulk operation, in request order.
+
+    Each entry has the item's ``index`` in the request and a ``status``:
+    the operation performed, ``error`` (with ``errors``) or, when an atomic
+    operation is rolled back, ``skipped``.
+    """
+
+    def __init__(self, size: int) -> None:
+        self.results: List[Dict[str, Any]] = [{"index": i} for i in range(size)]
+        self.failed = 0
+
+    def error(self, index: int, errors: Any) -> None:
+        self.results[index].update(status="error", errors=errors)
+        self.failed += 1
+
+    def success(self, index: int, outcome: str, **fields: Any) -> None:
+        self.results[index].update(status=outcome, **fields)
+
+    def skip_pending(self) -> None:
+        for result in self.results:
+            if "status" not in result:
+                result["status"] = "skipped"
+
+    def status_code(self, atomic: bool, success: int = status.HTTP_200_OK) -> int:
+        """
+        ``success`` when every item succeeded, 400 when an atomic operation
+        was rolled back and 207 when a best-effort operation partly failed.
+        """
+        if not self.failed:
+            return success
+        if atomic:
+            return status.HTTP_400_BAD_REQUEST
+        return status.HTTP_207_MULTI_STATUS
+
+
+def bulk_create_items(data: Sequence[Any], atomic: bool = True) -> BulkResult:
+    """
+    Validate every item, then insert the valid ones with one bulk_create.
+    With ``atomic``, nothing is written unless every item is valid.
+    """
+    result = BulkResult(len(data))
+    serializers = [ItemSerializer(data=entry) for entry in data]
+    items = []
+    for index, serializer in enumerate(serializers):
+        if serializer.is_valid():
+            items.append((index, Item(**serializer.validated_data)))
+        else:
+            result.error(index, serializer.errors)
+
+    if result.failed and atomic:
+        result.skip_pending()
+        return result
+
+    with transaction.atomic():
+        # bulk_create skips post_save, so do what the signal handlers do.
+        created = Item.objects.bulk_create([item for _, item in items])
+        queue_external_price_sync([item.pk for item in created])
+        invalidate_items([item.pk for item in created])
+
+    for index, item in items:
+        result.success(index, "created", id=item.pk, item=ItemSerializer(item).data)
+    return result
+
+
+def bulk_update_items(
+    data: Sequence[Any], partial: bool = False, atomic: bool = True
+) -> BulkResult:
+    """
+    Load every referenced Item in one query, validate each change against
+    it, then write the valid ones with one bulk_update. Entries must carry
+    the ``id`` of an existing Item. With ``atomic``, nothing is written
+    unless every entry is valid.
+    """
+    result = BulkResult(len(data))
+    ids = _collect_ids(
+        [entry.get("id") if isinstance(entry, dict) else None for entry in data],
+        result,
+    )
+
+    if result.failed and atomic:
+        result.skip_pending()
+        return result
+
+    with transaction.atomic():
+        instances = Item.objects.select_for_update().in_bulk(ids.values())
+        changed, fields = [], set()
+        drift = DriftDelta()
+        for index, item_id in ids.items():
+            instance = instances.get(item_id)
+            if instance is None:
+                result.error(index, {"id": ["Not found."]})
+                continue
+            serializer = ItemSerializer(instance, data=data[index], partial=partial)
+            if not serializer.is_valid():
+                result.error(index, serializer.errors)
+                continue
+            # The rows are locked, so their drift as loaded is current.
+            drift.remove(item_drift(instance))
+            for field, value in serializer.validated_data.items():
+                setattr(instance, field, value)
+                fields.add(field)
+            drift.add(item_drift(instance))
+            changed.append((index, instance))
+
+        if result.failed and atomic:
+            result.skip_pending()
+            return result
+
+        if changed:
+            # bulk_update neither runs auto_now nor post_save.
+            now = timezone.now()
+            for _, instance in changed:
+                instance.updated_at = now
+            Item.objects.bulk_update(
+                [instance for _, instance in changed], [*sorted(fields), "updated_at"]
+            )
+            drift.save()
+            invalidate_items([instance.pk for _, instance in changed])
+
+    for index, instance in changed:
+        result.success(
+            index, "updated", id=instance.pk, item=ItemSerializer(instance).data
+        )
+    return result
+
+
+def bulk_delete_items(data: Sequence[Any], atomic: bool = True) -> BulkResult:
+    """
+    Delete Items by ID with a single ``DELETE ... WHERE id = ANY(...)``.
+    IDs that do not exist are reported as errors; with ``atomic``, any error
+    rolls the whole delete back.
+    """
+    result = BulkResult(len(data))
+    ids = _collect_ids(data, result)
+
+    if result.failed and atomic:
+        result.skip_pending()
+        return result
+
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(BULK_DELETE_SQL, [list(ids.values())])
+            drifts = dict(cursor.fetchall())
+        deleted = set(drifts)
+
+        for index, item_id in ids.items():
+            if item_id in deleted:
+                result.success(index, "deleted", id=item_id)
+            else:
+                result.error(index, {"id": ["Not found."]})
+
+        if result.failed and atomic:
+            transaction.set_rollback(True)
+            for entry in result.results:
+                if entry["status"] == "deleted":
+                    entry["status"] = "skipped"
+            return result
+
+        # The raw DELETE bypasses the delete signals.
+        drift = DriftDelta()
+        for value in drifts.values():
+            drift.remove(value)
+        drift.save()
+        invalidate_items(deleted)
+    return result
+
+
+def _collect_ids(values: Sequence[Any], result: BulkResult) -> Dict[int, int]:
+    """Map request index to Item ID, recording invalid and repeated IDs."""
+    ids: Dict[int, int] = {}
+    seen = set()
+    for index, value in enumerate(values):
+        item_id = _parse_id(value)
+        if item_id is None:
+            result.error(index, {"id": ["A valid integer id is required."]})
+        elif item_id in seen:
+            result.error(index, {"id": ["Duplicate id in request."]})
+        else:
+            seen.add(item_id)
+            ids[index] = item_id
+    return ids
+
+
+def _parse_id(value: Any) -> Optional[int]:
+    if isinstance(value, str) and value.isdigit():
+        value = int(value)
+    if type(value) is not int or value <= 0:
+        return None
+    return value
@@ -0,0 +1,48 @@
+import csv
+import json
+from itertools import islice
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping
+
+RowToDict = Callable[[Mapping[str, Any]], Dict[str, Any]]
+
+
+class Echo:
+    """File-like object whose ``write`` returns the value, for csv.writer."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def iter_chunks(rows: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """Yield lists of up to ``size`` consecutive rows."""
+    rows = iter(rows)
+    while chunk := list(islice(rows, size)):
+        yield chunk
+
+
+def iter_ndjson(
+    rows: Iterable[Mapping[str, Any]], row_to_dict: RowToDict, chunk_size: int
+) -> Iterator[str]:
+    """
+    Render rows as newline-delimited JSON, one object per line. Lines are
+    joined per ``chunk_size`` rows to keep the number of writes low.
+    """
+    dumps = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+    for chunk in iter_chunks(rows, chunk_size):
+        yield "".join(dumps(row_to_dict(row)) + "\n" for row in chunk)
+
+
+def iter_csv(
+    rows: Iterable[Mapping[str, Any]],
+    row_to_dict: RowToDict,
+    fields: List[str],
+    chunk_size: int,
+) -> Iterator[str]:
+    """
+    Render rows as CSV with a header line of ``fields``, the keys produced
+    by ``row_to_dict`` in order. Nulls become empty cells.
+    """
+    writer = csv.writer(Echo())
+    yield writer.writerow(fields)
+    for chunk in iter_chunks(rows, chunk_size):
+        yield "".join(writer.writerow(row_to_dict(row).values()) for row in chunk)
@@ -0,0 +1,136 @@
+import multiprocessing
+import random
+from datetime import datetime, timedelta
+from typing import Callable, Dict, Iterator, List, Optional
+
+import django
+from django.db import connection, transaction
+from django.utils import timezone
+from faker import Faker
+
+from backend.db import close_all_connections
+from items.cache import invalidate_all_items
+from items.models import Item
+from items.utils.bulk_import import copy_rows
+
+COLUMNS = ("name", "description", "price", "external_price", "created_at", "updated_at")
+
+
+def _uniform(rng: random.Random, span: float) -> float:
+    return rng.random() * span
+
+
+def _recent(rng: random.Random, span: float) -> float:
+    # Exponentially more rows towards "now": about 63% in the newest fifth.
+    return span - min(rng.expovariate(5 / span), span)
+
+
+def _normal(rng: random.Random, span: float) -> float:
+    # Bell curve centred on the middle of the window.
+    return min(max(rng.gauss(span / 2, span / 6), 0.0), span)
+
+
+# Offset in seconds from the start of the window, given its length.
+CREATED_AT_DISTRIBUTIONS: Dict[str, Callable[[random.Random, float], float]] = {
+    "uniform": _uniform,
+    "recent": _recent,
+    "normal": _normal,
+}
+
+
+def generate_rows(
+    count: int, seed: int, start: datetime, end: datetime, distribution: str
+) -> List[tuple]:
+    """
+    Build ``count`` fake Item rows in ``COLUMNS`` order. The output depends
+    only on the arguments, so a batch is reproducible from its seed.
+    """
+    rng = random.Random(seed)
+    fake = Faker()
+    fake.seed_instance(seed)
+    offset = CREATED_AT_DISTRIBUTIONS[distribution]
+    span = (end - start).total_seconds()
+
+    rows = []
+    for _ in range(count):
+        created_at = start + timedelta(seconds=offset(rng, span))
+        rows.append(
+            (
+                fake.word().capitalize(),
+                fake.sentence(),
+                f"{rng.uniform(1.0, 1000.0):.2f}",
+                "0.00",
+                created_at.isoformat(),
+                created_at.isoformat(),
+            )
+        )
+    return rows
+
+
+def load_batch(
+    index: int,
+    size: int,
+    seed: int,
+    start: datetime,
+    end: datetime,
+    distribution: str,
+) -> int:
+    """Generate batch ``index`` and COPY it into the Item table."""
+    rows = generate_rows(size, seed + index, start, end, distribution)
+    with transaction.atomic(), connection.cursor() as cursor:
+        copy_rows(cursor, Item._meta.db_table, COLUMNS, rows)
+    return len(rows)
+
+
+def _load_batch(args: tuple) -> int:
+    return load_batch(*args)
+
+
+def _init_worker() -> None:
+    # A no-op for forked workers; spawned ones need the app registry.
+    django.setup()
+
+
+def generate_items(
+    count: int,
+    batch_size: int = 10_000,
+    workers: int = 1,
+    seed: Optional[int] = None,
+    distribution: str = "uniform",
+    days: int = 730,
+) -> Iterator[int]:
+    """
+    Insert ``count`` fake Items, yielding the number of rows written as each
+    batch of ``batch_size`` commits.
+
+    Batches are generated and COPYed by ``workers`` processes, each holding
+    one batch at a time, so memory stays bounded regardless of ``count``.
+    Batch ``i`` is seeded with ``seed + i``, which makes the generated data
+    reproducible for a given seed and batch size whatever the worker count.
+    ``created_at`` follows ``distribution`` over the last ``days`` days.
+    Model signals are not fired, so no price syncs are queued.
+    """
+    if distribution not in CREATED_AT_DISTRIBUTIONS:
+        raise ValueError(f"Unknown created_at distribution: {distribution}")
+    if seed is None:
+        seed = random.SystemRandom().randrange(2**32)
+
+    end = timezone.now()
+    start = end - timedelta(days=days)
+    tasks = [
+        (index, min(batch_size, count - offset), seed, start, end, distribution)
+        for index, offset in enumerate(range(0, count, batch_size))
+    ]
+
+    if workers <= 1:
+        for task in tasks:
+            yield _load_batch(task)
+    else:
+        # Children must open their own connections rather than share ours.
+        close_all_connections()
+        with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+            yield from pool.imap_unordered(_load_batch, tasks)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f"ANALYZE {Item._meta.db_table}")
+    invalidate_all_items()
@@ -0,0 +1,174 @@
+import asyncio
+import statistics
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+Result = Dict[str, float]
+
+
+class LoadStats:
+    """Latencies and failures collected by the virtual users of one run."""
+
+    def __init__(self) -> None:
+        self.latencies: List[float] = []
+        self.errors = 0
+
+    def summary(self, elapsed: float) -> Result:
+        latencies = sorted(self.latencies)
+        if not latencies:
+            return {"requests_per_second": 0, "errors": self.errors}
+
+        def percentile(fraction: float) -> float:
+            index = min(int(len(latencies) * fraction), len(latencies) - 1)
+            return round(latencies[index] * 1000, 3)
+
+        return {
+            "requests_per_second": round(len(latencies) / elapsed, 1),
+            "median_ms": round(statistics.median(latencies) * 1000, 3),
+            "p95_ms": percentile(0.95),
+            "p99_ms": percentile(0.99),
+            "errors": self.errors,
+        }
+
+
+async def read_response(reader: asyncio.StreamReader) -> Tuple[int, bool]:
+    """
+    Read one HTTP/1.1 response and discard its body. Returns the status
+    code and whether the server is closing the connection.
+    """
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionError("Connection closed by the server")
+    status = int(status_line.split()[1])
+    length: Optional[int] = None
+    chunked = close = False
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        name, value = name.strip().lower(), value.strip().lower()
+        if name == "content-length":
+            length = int(value)
+        elif name == "transfer-encoding":
+            chunked = "chunked" in value
+        elif name == "connection":
+            close = value == "close"
+
+    if chunked:
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            await reader.readexactly(size + 2)
+            if size == 0:
+                break
+    elif length is not None:
+        await reader.readexactly(length)
+    else:
+        await reader.read()
+        close = True
+    return status, close
+
+
+async def virtual_user(
+    host: str,
+    port: int,
+    requests: Sequence[bytes],
+    offset: int,
+    deadline: float,
+    stats: LoadStats,
+) -> None:
+    """
+    Send the ``requests`` round-robin, one at a time over a keep-alive
+    connection, until ``deadline``. Non-2xx answers count as errors.
+    """
+    writer: Optional[asyncio.StreamWriter] = None
+    index = offset
+    while time.monotonic() < deadline:
+        close = True
+        try:
+            if writer is None:
+                reader, writer = await asyncio.open_connection(host, port)
+            started = time.perf_counter()
+            writer.write(requests[index % len(requests)])
+            await writer.drain()
+            status, close = await read_response(reader)
+            if 200 <= status < 300:
+                stats.latencies.append(time.perf_counter() - started)
+            else:
+                stats.errors += 1
+        except (OSError, ValueError, IndexError, asyncio.IncompleteReadError):
+            stats.errors += 1
+        index += 1
+        if close and writer is not None:
+            writer.close()
+            writer = None
+    if writer is not None:
+        writer.close()
+
+
+async def slow_client(
+    host: str, port: int, request: bytes, deadline: float, interval: float
+) -> None:
+    """
+    Send ``request`` one byte every ``interval`` seconds until ``deadline``,
+    like a client on a very slow network, holding its connection open.
+    """
+    try:
+        _, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        return
+    try:
+        for byte in request:
+            if time.monotonic() >= deadline:
+                break
+            writer.write(bytes([byte]))
+            await writer.drain()
+            await asyncio.sleep(interval)
+    except OSError:
+        pass
+    finally:
+        writer.close()
+
+
+async def run_load(
+    base_url: str,
+    paths: Sequence[str],
+    concurrency: int,
+    duration: float,
+    token: Optional[str] = None,
+    slow_clients: int = 0,
+    slow_interval: float = 0.5,
+) -> Result:
+    """
+    Drive ``concurrency`` clients against ``base_url`` for ``duration``
+    seconds, each cycling through ``paths`` with GET requests, and return
+    the throughput, latency percentiles and error count. ``slow_clients``
+    more connections trickle their request in meanwhile, which is what
+    ties up the workers of a thread-per-request server.
+    """
+    url = urlsplit(base_url)
+    host = url.hostname or "localhost"
+    port = url.port or 80
+    headers = f"Host: {url.netloc}\r\nAccept: application/json\r\n"
+    if token:
+        headers += f"Authorization: Bearer {token}\r\n"
+    requests = [
+        f"GET {url.path.rstrip('/')}{path} HTTP/1.1\r\n{headers}\r\n".encode()
+        for path in paths
+    ]
+
+    stats = LoadStats()
+    started = time.monotonic()
+    deadline = started + duration
+    await asyncio.gather(
+        *(
+            slow_client(host, port, requests[0], deadline, slow_interval)
+            for _ in range(slow_clients)
+        ),
+        *(
+            virtual_user(host, port, requests, offset, deadline, stats)
+            for offset in range(concurrency)
+        ),
+    )
+    return stats.summary(time.monotonic() - started)
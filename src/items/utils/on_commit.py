@@ -0,0 +1,61 @@
+import abc
+import threading
+from typing import Iterable, List, Optional, Tuple, Type
+from weakref import WeakValueDictionary
+
+from django.db import transaction
+
+# Pending buffers per thread, keyed by connection alias and buffer class.
+# Django's connections are thread-local, so a buffer is only ever joined by
+# the thread that registered it. Only weak references are kept: Django holds
+# the buffer until the transaction commits or rolls back (including a
+# savepoint rollback), after which it drops out of the registry.
+_pending = threading.local()
+
+
+def _pending_buffers() -> (
+    "WeakValueDictionary[Tuple[str, Type[OnCommitBuffer]], OnCommitBuffer]"
+):
+    buffers = getattr(_pending, "buffers", None)
+    if buffers is None:
+        buffers = _pending.buffers = WeakValueDictionary()
+    return buffers
+
+
+class OnCommitBuffer(abc.ABC):
+    """
+    on_commit callback collecting Item IDs over a transaction.
+
+    All calls to ``add()`` within one transaction share a single buffer,
+    which is flushed once when the transaction commits and discarded if it
+    rolls back. Outside a transaction it is flushed immediately.
+    Subclasses implement ``flush()``.
+    """
+
+    def __init__(self) -> None:
+        self.item_ids: List[int] = []
+        self.flushed = False
+
+    def __call__(self) -> None:
+        self.flushed = True
+        self.flush(self.item_ids)
+
+    @abc.abstractmethod
+    def flush(self, item_ids: List[int]) -> None:
+        """Handle the IDs added over the committed transaction."""
+
+    @classmethod
+    def add(cls, item_ids: Iterable[int], using: Optional[str] = None) -> None:
+        """Add IDs to the current transaction's buffer of this class."""
+        connection = transaction.get_connection(using)
+        buffers = _pending_buffers()
+        key = (connection.alias, cls)
+        buffer = buffers.get(key)
+        if buffer is not None and not buffer.flushed:
+            buffer.item_ids.extend(item_ids)
+            return
+
+        buffer = cls()
+        buffer.item_ids.extend(item_ids)
+        buffers[key] = buffer
+        transaction.on_commit(buffer, using=using)
@@ -0,0 +1,231 @@
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from decimal import Decimal
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+from items.models import Item
+from items.utils.price_providers import PriceProvider, PriceProviderError
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(PriceProviderError):
+    """Raised when calls to a host are short-circuited after repeated failures."""
+
+
+class RateLimiter:
+    """
+    Thread-safe token bucket allowing ``rate`` calls per second,
+    with bursts of up to ``burst`` calls. Buckets live in process memory,
+    so the limit applies per worker process.
+    """
+
+    def __init__(self, rate: float, burst: Optional[int] = None) -> None:
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated_at) * self.rate
+                )
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures and rejects calls
+    for ``reset_timeout`` seconds. After that a single trial call is let
+    through (half-open): success closes the circuit, failure reopens it.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self.lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        return self.opened_at is not None
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call is currently allowed."""
+        with self.lock:
+            if self.opened_at is None:
+                return
+            elapsed = time.monotonic() - self.opened_at
+            if elapsed < self.reset_timeout or self.trial_in_flight:
+                raise CircuitOpenError("Circuit is open; skipping price request")
+            self.trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self.lock:
+            self.failures += 1
+            if self.trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self.trial_in_flight = False
+
+    def end_call(self) -> None:
+        """
+        Let the next call after the timeout be a trial, however this one
+        ended: an unexpected error neither closes nor reopens the circuit.
+        """
+        with self.lock:
+            self.trial_in_flight = False
+
+
+_host_lock = threading.Lock()
+_rate_limiters: Dict[str, RateLimiter] = {}
+_circuit_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_rate_limiter(host: str, rate: float) -> RateLimiter:
+    """Return the process-wide rate limiter for a host."""
+    with _host_lock:
+        if host not in _rate_limiters:
+            _rate_limiters[host] = RateLimiter(rate)
+        return _rate_limiters[host]
+
+
+def get_circuit_breaker(
+    host: str, failure_threshold: int, reset_timeout: float
+) -> CircuitBreaker:
+    """Return the process-wide circuit breaker for a host."""
+    with _host_lock:
+        if host not in _circuit_breakers:
+            _circuit_breakers[host] = CircuitBreaker(failure_threshold, reset_timeout)
+        return _circuit_breakers[host]
+
+
+class PriceClient:
+    """
+    Fetches prices from a provider concurrently on a thread pool.
+
+    Items are split into batches of ``provider.max_batch_size``. At most
+    ``max_in_flight`` batches are outstanding at once; submitting more blocks
+    the caller until one completes, so a fast producer cannot queue an
+    unbounded amount of work. Every request passes through the host's rate
+    limiter (if ``rate_limit`` is set) and circuit breaker.
+    """
+
+    def __init__(
+        self,
+        provider: PriceProvider,
+        max_in_flight: int = 8,
+        rate_limit: Optional[float] = None,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+    ) -> None:
+        self.provider = provider
+        self.max_in_flight = max_in_flight
+        self.rate_limiter = (
+            get_rate_limiter(provider.host, rate_limit) if rate_limit else None
+        )
+        self.circuit_breaker = get_circuit_breaker(
+            provider.host, failure_threshold, reset_timeout
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_in_flight, thread_name_prefix="price-client"
+        )
+        self.in_flight = threading.BoundedSemaphore(max_in_flight)
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        """
+        Return a mapping of item ID to external price.
+
+        Items in batches that failed are missing from the result and are
+        logged. CircuitOpenError is raised once the host's circuit opens,
+        since the remaining batches would be rejected anyway.
+        """
+        batch_size = max(1, self.provider.max_batch_size)
+        futures: List[Future] = []
+        for start in range(0, len(items), batch_size):
+            self.in_flight.acquire()
+            future = self.executor.submit(
+                self._fetch_batch, items[start : start + batch_size]
+            )
+            future.add_done_callback(lambda _: self.in_flight.release())
+            futures.append(future)
+
+        prices: Dict[int, Decimal] = {}
+        circuit_error: Optional[CircuitOpenError] = None
+        for future in futures:
+            try:
+                prices.update(future.result())
+            except CircuitOpenError as exc:
+                circuit_error = exc
+            except PriceProviderError:
+                logger.exception("Fetching a batch of external prices failed")
+
+        if circuit_error is not None:
+            raise circuit_error
+        return prices
+
+    def _fetch_batch(self, batch: Sequence[Item]) -> Dict[int, Decimal]:
+        self.circuit_breaker.before_call()
+        try:
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            prices = self.provider.fetch_prices(batch)
+        except PriceProviderError:
+            self.circuit_breaker.record_failure()
+            raise
+        else:
+            self.circuit_breaker.record_success()
+        finally:
+            self.circuit_breaker.end_call()
+        return prices
+
+    def close(self) -> None:
+        """Shut down the thread pool and the provider's connection pool."""
+        self.executor.shutdown(wait=True)
+        self.provider.close()
+
+
+def build_price_provider(config: Optional[dict] = None) -> PriceProvider:
+    """Instantiate a provider from a {"BACKEND": ..., "OPTIONS": ...} mapping."""
+    config = config or settings.ITEMS_PRICE_PROVIDER
+    provider_class = import_string(config["BACKEND"])
+    return provider_class(**config.get("OPTIONS", {}))
+
+
+@lru_cache(maxsize=None)
+def get_price_client() -> PriceClient:
+    """
+    Return the process-wide PriceClient configured in settings.
+    It is reused so its thread and connection pools stay warm.
+    """
+    options = settings.ITEMS_PRICE_CLIENT
+    return PriceClient(
+        build_price_provider(),
+        max_in_flight=options["MAX_IN_FLIGHT"],
+        rate_limit=options["RATE_LIMIT"],
+        failure_threshold=options["FAILURE_THRESHOLD"],
+        reset_timeout=options["RESET_TIMEOUT"],
+    )
@@ -0,0 +1,193 @@
+from bisect import bisect_right
+from decimal import Decimal
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from django.conf import settings
+from django.contrib.postgres.fields import ArrayField
+from django.db import transaction
+from django.db.models import (
+    Count,
+    DecimalField,
+    F,
+    Func,
+    IntegerField,
+    Max,
+    Min,
+    QuerySet,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Abs
+
+from items.models import Item, PriceDriftBucket
+
+TOTAL_FIELDS = ("items", "drift_sum", "abs_drift_sum", "squared_drift_sum")
+ZERO_TOTALS = (0, Decimal("0"), Decimal("0"), Decimal("0"))
+CENT = Decimal("0.01")
+
+Totals = Tuple[int, Decimal, Decimal, Decimal]
+
+
+class WidthBucket(Func):
+    """Postgres ``width_bucket(value, edges)``: the number of edges <= value."""
+
+    function = "width_bucket"
+    output_field = IntegerField()
+
+
+def bucket_edges() -> List[Decimal]:
+    return [Decimal(str(edge)) for edge in settings.ITEMS_PRICE_DRIFT_BUCKETS]
+
+
+def item_drift(item: Item) -> Optional[Decimal]:
+    """An Item's drift as loaded, computed like its generated column."""
+    if item.price_at_sync is None:
+        return None
+    return item.external_price - item.price_at_sync
+
+
+def bucket_totals(queryset: QuerySet, edges: Sequence[Decimal]) -> Dict[int, Totals]:
+    """Drift totals of the Items in ``queryset``, per bucket, in one query."""
+    rows = (
+        queryset.filter(price_drift__isnull=False)
+        .order_by()
+        .annotate(
+            bucket=WidthBucket(
+                "price_drift",
+                Value(
+                    list(edges),
+                    output_field=ArrayField(
+                        DecimalField(max_digits=11, decimal_places=2)
+                    ),
+                ),
+            )
+        )
+        .values("bucket")
+        .annotate(
+            items=Count("pk"),
+            drift_sum=Sum("price_drift"),
+            abs_drift_sum=Sum(Abs("price_drift")),
+            squared_drift_sum=Sum(F("price_drift") * F("price_drift")),
+        )
+    )
+    return {row["bucket"]: tuple(row[field] for field in TOTAL_FIELDS) for row in rows}
+
+
+def build_drift_buckets(
+    queryset: QuerySet, edges: Sequence[Decimal]
+) -> List[Dict[str, Any]]:
+    """Compute every bucket's row from scratch, including empty buckets."""
+    totals = bucket_totals(queryset, edges)
+    bounds = [None, *edges, None]
+    return [
+        {
+            "bucket": bucket,
+            "lower": bounds[bucket],
+            "upper": bounds[bucket + 1],
+            **dict(zip(TOTAL_FIELDS, totals.get(bucket, ZERO_TOTALS))),
+        }
+        for bucket in range(len(edges) + 1)
+    ]
+
+
+class DriftDelta:
+    """
+    Changes to the drift summary collected over a sync batch, then added to
+    the affected PriceDriftBucket rows with a single UPDATE.
+    """
+
+    def __init__(self, edges: Optional[Sequence[Decimal]] = None) -> None:
+        self.edges = bucket_edges() if edges is None else edges
+        self.totals: Dict[int, List[Any]] = {}
+
+    def add(self, drift: Optional[Decimal], sign: int = 1) -> None:
+        if drift is None:
+            return
+        bucket = bisect_right(self.edges, drift)
+        self.add_totals({bucket: (1, drift, abs(drift), drift * drift)}, sign)
+
+    def remove(self, drift: Optional[Decimal]) -> None:
+        self.add(drift, sign=-1)
+
+    def add_totals(self, totals: Dict[int, Totals], sign: int = 1) -> None:
+        for bucket, values in totals.items():
+            current = self.totals.setdefault(bucket, list(ZERO_TOTALS))
+            for index, value in enumerate(values):
+                current[index] += sign * value
+
+    def save(self) -> None:
+        rows = []
+        # Sorted, so concurrent batches lock bucket rows in the same order.
+        for bucket, values in sorted(self.totals.items()):
+            if not any(values):
+                continue
+            row = PriceDriftBucket(bucket=bucket)
+            for field, value in zip(TOTAL_FIELDS, values):
+                setattr(row, field, F(field) + value)
+            rows.append(row)
+        PriceDriftBucket.objects.bulk_update(rows, TOTAL_FIELDS)
+        self.totals.clear()
+
+
+def rebuild_drift_summary(edges: Optional[Sequence[Decimal]] = None) -> int:
+    """
+    Recompute the drift summary from the Item table, reconciling changes
+    it does not follow (single Item edits, raw SQL writes) and applying new
+    bucket edges. Returns the number of Items with a drift.
+
+    The bucket rows are locked before Items are read, so a concurrent sync
+    batch is either already counted or adds its changes afterwards.
+    """
+    if edges is None:
+        edges = bucket_edges()
+    with transaction.atomic():
+        existing = list(PriceDriftBucket.objects.select_for_update())
+        rows = [
+            PriceDriftBucket(**row)
+            for row in build_drift_buckets(Item.objects.all(), edges)
+        ]
+        if [(b.lower, b.upper) for b in existing] == [(b.lower, b.upper) for b in rows]:
+            PriceDriftBucket.objects.bulk_update(rows, TOTAL_FIELDS)
+        else:
+            PriceDriftBucket.objects.all().delete()
+            PriceDriftBucket.objects.bulk_create(rows)
+    return sum(row.items for row in rows)
+
+
+def drift_summary() -> Dict[str, Any]:
+    """
+    Drift aggregates and histogram, read from the PriceDriftBucket totals.
+    Min and max come from the ends of ``item_price_drift_idx``.
+    """
+    buckets = list(PriceDriftBucket.objects.all())
+    items = sum(bucket.items for bucket in buckets)
+    summary: Dict[str, Any] = {
+        "items": items,
+        "mean": None,
+        "mean_abs": None,
+        "stddev": None,
+        **Item.objects.aggregate(min=Min("price_drift"), max=Max("price_drift")),
+        "histogram": buckets,
+    }
+    if items:
+        mean = sum(bucket.drift_sum for bucket in buckets) / items
+        mean_abs = sum(bucket.abs_drift_sum for bucket in buckets) / items
+        squares = sum(bucket.squared_drift_sum for bucket in buckets) / items
+        summary.update(
+            mean=mean.quantize(CENT),
+            mean_abs=mean_abs.quantize(CENT),
+            stddev=max(squares - mean * mean, Decimal("0")).sqrt().quantize(CENT),
+        )
+    return summary
+
+
+def top_drift_items(limit: int) -> QuerySet[Item]:
+    """
+    The ``limit`` Items with the largest absolute drift, read from the
+    partial ``item_abs_price_drift_idx`` instead of sorting the table.
+    """
+    return (
+        Item.objects.filter(price_drift__isnull=False)
+        .select_related("sync_state")
+        .order_by(Abs("price_drift").desc(), "id")[:limit]
+    )
@@ -0,0 +1,153 @@
+from datetime import date, datetime, time, timedelta
+from datetime import timezone as dt_timezone
+from typing import List, Optional, Sequence
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Avg, Count, Max, Min, QuerySet
+from django.db.models.functions import Trunc
+from django.utils import timezone
+
+from items.models import Item, ItemPriceHistory
+
+TABLE = ItemPriceHistory._meta.db_table
+PARTITION_PREFIX = f"{TABLE}_p"
+INTERVALS = ("hour", "day")
+DEFAULT_PARTITION = f"{TABLE}_default"
+
+
+def partition_name(day: date) -> str:
+    return f"{PARTITION_PREFIX}{day:%Y%m%d}"
+
+
+def ensure_partitions(days_ahead: Optional[int] = None) -> List[str]:
+    """
+    Create the daily partitions (UTC days) from today through
+    ``days_ahead`` days from now, if missing. Returns the created names.
+
+    Rows written while a day had no partition sit in the default
+    partition; they are moved into the new partition as it is created.
+    """
+    if days_ahead is None:
+        days_ahead = settings.ITEMS_PRICE_HISTORY_PRECREATE_DAYS
+    today = timezone.now().astimezone(dt_timezone.utc).date()
+
+    created = []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT relname FROM pg_class WHERE relname LIKE %s",
+            [f"{PARTITION_PREFIX}%"],
+        )
+        existing = {name for (name,) in cursor.fetchall()}
+        for offset in range(days_ahead + 1):
+            day = today + timedelta(days=offset)
+            if partition_name(day) not in existing:
+                _create_partition(cursor, day)
+                created.append(partition_name(day))
+    return created
+
+
+def _create_partition(cursor, day: date) -> None:
+    start = datetime.combine(day, time.min, dt_timezone.utc)
+    bounds = [start, start + timedelta(days=1)]
+    with transaction.atomic():
+        # A partition cannot be created while the default partition holds
+        # rows in its range, so park those rows in a temporary table.
+        cursor.execute(f"CREATE TEMPORARY TABLE parked (LIKE {TABLE})")
+        cursor.execute(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            "WHERE recorded_at >= %s AND recorded_at < %s RETURNING *) "
+            "INSERT INTO parked SELECT * FROM moved",
+            bounds,
+        )
+        cursor.execute(
+            f"CREATE TABLE {partition_name(day)} PARTITION OF {TABLE} "
+            "FOR VALUES FROM (%s) TO (%s)",
+            bounds,
+        )
+        cursor.execute(f"INSERT INTO {TABLE} SELECT * FROM parked")
+        cursor.execute("DROP TABLE parked")
+
+
+def drop_expired_partitions(retention_days: Optional[int] = None) -> List[str]:
+    """
+    Drop daily partitions whose whole day is older than ``retention_days``.
+    Dropping a partition is a cheap catalog operation, unlike deleting rows.
+    Returns the names of the dropped partitions.
+    """
+    if retention_days is None:
+        retention_days = settings.ITEMS_PRICE_HISTORY_RETENTION_DAYS
+    cutoff = timezone.now().astimezone(dt_timezone.utc).date() - timedelta(
+        days=retention_days
+    )
+
+    dropped = []
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = %s",
+            [TABLE],
+        )
+        for (name,) in cursor.fetchall():
+            if not name.startswith(PARTITION_PREFIX):
+                continue
+            try:
+                day = datetime.strptime(name[len(PARTITION_PREFIX) :], "%Y%m%d").date()
+            except ValueError:
+                continue
+            if day < cutoff:
+                cursor.execute(f"DROP TABLE {name}")
+                dropped.append(name)
+    return sorted(dropped)
+
+
+def record_price_history(
+    items: Sequence[Item], recorded_at: Optional[datetime] = None
+) -> None:
+    """
+    Append one history row per synced Item, with a single INSERT. The row
+    keeps the Item's ``price`` and ``external_price`` at the time.
+    """
+    if not items:
+        return
+    recorded_at = recorded_at or timezone.now()
+    ItemPriceHistory.objects.bulk_create(
+        [
+            ItemPriceHistory(
+                item_id=item.pk,
+                price=item.price,
+                external_price=item.external_price,
+                recorded_at=recorded_at,
+            )
+            for item in items
+        ]
+    )
+
+
+def price_history_series(
+    item_id: int, interval: str, start: datetime, end: datetime
+) -> QuerySet:
+    """
+    Downsample an Item's external price history between ``start`` and
+    ``end`` into ``interval`` buckets (in the current timezone), each with
+    min, max and average price and the number of samples. The aggregation
+    runs in Postgres; only partitions overlapping the range are scanned.
+    """
+    if interval not in INTERVALS:
+        raise ValueError(f"Unsupported interval: {interval}")
+    return (
+        ItemPriceHistory.objects.filter(
+            item_id=item_id, recorded_at__gte=start, recorded_at__lt=end
+        )
+        .annotate(bucket=Trunc("recorded_at", interval))
+        .values("bucket")
+        .annotate(
+            min=Min("external_price"),
+            max=Max("external_price"),
+            avg=Avg("external_price"),
+            samples=Count("id"),
+        )
+        .order_by("bucket")
+    )
@@ -0,0 +1,142 @@
+import random
+import time
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Dict, Optional, Sequence
+from urllib.parse import urlparse
+
+import requests
+from django.db.models import DecimalField, Expression, F
+from django.db.models.functions import Cast, Random, Round
+from requests.adapters import HTTPAdapter
+
+from items.models import Item
+
+
+class PriceProviderError(Exception):
+    """Raised when an external price provider request fails."""
+
+
+def simulate_external_price(base_price: Decimal) -> Decimal:
+    """
+    Generate a simulated external price with ±10% variation.
+    """
+    variation = random.uniform(-0.10, 0.10)
+    new_price = base_price * Decimal(1 + variation)
+    return new_price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+
+def simulate_external_price_expression() -> Round:
+    """
+    Database-side equivalent of simulate_external_price().
+    Evaluates to price * (1 ± 10%) rounded to two decimals.
+    """
+    variation = Cast(
+        Random() * 0.2 + 0.9,
+        output_field=DecimalField(max_digits=7, decimal_places=6),
+    )
+    return Round(F("price") * variation, 2)
+
+
+class PriceProvider:
+    """
+    Interface for external price sources.
+
+    Providers fetch prices for a batch of at most ``max_batch_size`` items
+    per call; a provider without a batch API uses ``max_batch_size = 1``.
+    ``host`` identifies the upstream for rate limiting and circuit breaking.
+    """
+
+    host: str = "local"
+    max_batch_size: int = 1
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        """Return a mapping of item ID to external price."""
+        raise NotImplementedError
+
+    def as_expression(self) -> Optional[Expression]:
+        """
+        Return a database expression computing the price, if the provider
+        can run inside Postgres. Used by the set-based sync path.
+        """
+        return None
+
+    def close(self) -> None:
+        """Release pooled resources such as HTTP connections."""
+
+
+class SimulatedPriceProvider(PriceProvider):
+    """
+    Local fake provider with configurable latency and failure rate.
+
+    Each call sleeps once for a random duration between ``min_latency`` and
+    ``max_latency`` seconds, like a single round trip to a batch API, which
+    makes it suitable for measuring client throughput offline.
+    """
+
+    def __init__(
+        self,
+        min_latency: float = 0.0,
+        max_latency: float = 0.0,
+        max_batch_size: int = 100,
+        failure_rate: float = 0.0,
+        host: str = "simulated",
+    ) -> None:
+        self.min_latency = min_latency
+        self.max_latency = max_latency
+        self.max_batch_size = max_batch_size
+        self.failure_rate = failure_rate
+        self.host = host
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        if self.max_latency > 0:
+            time.sleep(random.uniform(self.min_latency, self.max_latency))
+        if self.failure_rate and random.random() < self.failure_rate:
+            raise PriceProviderError(f"Simulated failure from {self.host}")
+        return {item.pk: simulate_external_price(item.price) for item in items}
+
+    def as_expression(self) -> Optional[Expression]:
+        return simulate_external_price_expression()
+
+
+class HttpPriceProvider(PriceProvider):
+    """
+    Provider backed by an HTTP batch endpoint.
+
+    Sends ``POST <base_url>`` with ``{"items": [{"id": .., "price": ..}]}``
+    and expects ``{"prices": {"<id>": "<price>"}}``. Connections are kept
+    alive in a pool of ``pool_size`` connections shared by all threads.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        timeout: float = 5.0,
+        max_batch_size: int = 100,
+        pool_size: int = 10,
+    ) -> None:
+        self.base_url = base_url
+        self.timeout = timeout
+        self.max_batch_size = max_batch_size
+        self.host = urlparse(base_url).netloc
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def fetch_prices(self, items: Sequence[Item]) -> Dict[int, Decimal]:
+        payload = {
+            "items": [{"id": item.pk, "price": str(item.price)} for item in items]
+        }
+        try:
+            response = self.session.post(
+                self.base_url, json=payload, timeout=self.timeout
+            )
+            response.raise_for_status()
+            prices = response.json()["prices"]
+        except (requests.RequestException, ValueError, KeyError) as exc:
+            raise PriceProviderError(f"Price request to {self.host} failed") from exc
+
+        return {int(item_id): Decimal(price) for item_id, price in prices.items()}
+
+    def close(self) -> None:
+        self.session.close()
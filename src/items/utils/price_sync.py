@@ -1,64 +1,527 @@
-import random
 import time
-from decimal import ROUND_HALF_UP, Decimal
-from typing import Iterator, List
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
 
-from django.db import transaction
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection, transaction
+from django.db.models import F, Max, Min, Q, QuerySet
+from django.utils import timezone
 
-from items.models import Item
+from backend.metrics import Counter, Histogram
+from items.cache import invalidate_all_items, invalidate_items
+from items.models import PRICE_SYNC_PENDING, Item, ItemSyncState
+from items.utils.price_client import PriceClient, get_price_client
+from items.utils.price_drift import DriftDelta, item_drift
+from items.utils.price_history import TABLE as PRICE_HISTORY_TABLE
+from items.utils.price_history import record_price_history
 
+# Columns read and written when repricing a batch of Items.
+SYNC_READ_FIELDS = ("pk", "price", "external_price", "price_at_sync", "updated_at")
 
-def simulate_external_price(base_price: Decimal) -> Decimal:
+# Writes fetched prices to the Items whose external price differs or whose
+# price was edited since their last sync, provided the row still holds the
+# values the prices were fetched for, and returns their IDs and new drift.
+APPLY_PRICES_SQL = f"""
+    UPDATE {Item._meta.db_table} AS i SET
+        external_price = v.external_price,
+        price_at_sync = i.price,
+        updated_at = %(now)s
+    FROM unnest(
+        %(ids)s::bigint[],
+        %(prices)s::numeric[],
+        %(read_external_prices)s::numeric[],
+        %(read_prices_at_sync)s::numeric[],
+        %(read_updated_at)s::timestamptz[]
+    ) AS v (
+        id, external_price, read_external_price, read_price_at_sync, read_updated_at
+    )
+    WHERE i.id = v.id
+        AND i.external_price = v.read_external_price
+        AND i.price_at_sync IS NOT DISTINCT FROM v.read_price_at_sync
+        AND i.updated_at = v.read_updated_at
+        AND (i.external_price IS DISTINCT FROM v.external_price
+             OR i.price_at_sync IS DISTINCT FROM i.price)
+    RETURNING i.id, i.price_drift
+"""
+
+# Reprices the rows selected by ``priced`` (id, price, price_drift, new
+# external price, locked FOR UPDATE) in one statement: writes the changed
+# ones, stamps and records history for all of them, and returns how many
+# were synced with the drift totals removed (sign -1) and added (sign 1)
+# per bucket. Takes ``priced``'s parameters, then the sync time three times
+# and the drift bucket edges.
+SYNC_IN_DATABASE_SQL = f"""
+    WITH priced (id, price, price_drift, external_price) AS ({{priced}}),
+    changed AS (
+        UPDATE {Item._meta.db_table} AS i SET
+            external_price = p.external_price,
+            price_at_sync = i.price,
+            updated_at = %s
+        FROM priced AS p
+        WHERE i.id = p.id
+            AND (i.external_price IS DISTINCT FROM p.external_price
+                 OR i.price_at_sync IS DISTINCT FROM i.price)
+        RETURNING p.price_drift AS old_drift, i.price_drift AS new_drift
+    ),
+    stamped AS (
+        INSERT INTO {ItemSyncState._meta.db_table} (item_id, synced_at)
+        SELECT id, %s FROM priced
+        ON CONFLICT (item_id) DO UPDATE SET synced_at = EXCLUDED.synced_at
+    ),
+    history AS (
+        INSERT INTO {PRICE_HISTORY_TABLE} (item_id, price, external_price, recorded_at)
+        SELECT id, price, external_price, %s FROM priced
+    ),
+    totals AS (
+        SELECT
+            d.sign,
+            width_bucket(d.drift, %s::numeric[]) AS bucket,
+            COUNT(*),
+            SUM(d.drift),
+            SUM(ABS(d.drift)),
+            SUM(d.drift * d.drift)
+        FROM changed,
+            LATERAL (VALUES (-1, old_drift), (1, new_drift)) AS d (sign, drift)
+        WHERE d.drift IS NOT NULL
+        GROUP BY 1, 2
+    )
+    SELECT (SELECT COUNT(*) FROM priced), totals.*
+    FROM (SELECT 1) AS one LEFT JOIN totals ON TRUE
+"""
+
+# Splits the IDs selected by ``stale`` into at most ``max_shards`` runs of
+# about ``shard_size`` consecutive IDs, and returns each run's first and
+# last ID. Takes ``stale``'s parameters, then max_shards and shard_size.
+PLAN_SHARDS_SQL = """
+    WITH stale (id) AS ({stale}),
+    tiles AS (
+        SELECT id, NTILE(
+            (SELECT LEAST(%s, CEIL(COUNT(*) / %s::numeric))::integer FROM stale)
+        ) OVER (ORDER BY id) AS shard
+        FROM stale
+    )
+    SELECT MIN(id), MAX(id) FROM tiles GROUP BY shard ORDER BY shard
+"""
+
+# Called as progress(processed, total) while a sync runs.
+ProgressCallback = Callable[[int, int], None]
+
+# Sync throughput, by mode: "batch" (windows priced in Python), "database"
+# (set-based UPDATE per ID range), "ids" (a list of IDs) or "item".
+SYNC_ROWS = Counter(
+    "price_sync_rows_total", "Items repriced by the external price sync.", ["mode"]
+)
+SYNC_BATCH_SECONDS = Histogram(
+    "price_sync_batch_seconds",
+    "Time to read, price and write one batch of the external price sync.",
+    ["mode"],
+)
+SYNC_BATCH_ROWS = Histogram(
+    "price_sync_batch_rows",
+    "Items repriced per batch of the external price sync.",
+    ["mode"],
+    buckets=(1, 10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 50000),
+)
+
+
+def record_sync_batch(mode: str, rows: int, seconds: float) -> None:
+    SYNC_ROWS.inc(rows, mode=mode)
+    SYNC_BATCH_ROWS.observe(rows, mode=mode)
+    SYNC_BATCH_SECONDS.observe(seconds, mode=mode)
+
+
+def iter_item_windows(
+    queryset: QuerySet[Item], window_size: int
+) -> Iterator[List[Item]]:
     """
-    Generate a simulated external price with ±10% variation.
+    Yield Items from a queryset one keyset-paginated window at a time.
+    Each window is fetched with "WHERE id > <last id> ORDER BY id LIMIT n",
+    so only a single window is ever held in memory.
+    """
+    last_id = 0
+    while True:
+        window = list(queryset.filter(pk__gt=last_id).order_by("pk")[:window_size])
+        if not window:
+            return
+        yield window
+        last_id = window[-1].pk
+
+
+def stale_cutoff(ttl: Optional[int] = None) -> datetime:
+    """Items last synced before this time are due for a sync."""
+    if ttl is None:
+        ttl = settings.ITEMS_PRICE_SYNC_TTL
+    return timezone.now() - timedelta(seconds=ttl)
+
+
+def iter_stale_windows(
+    queryset: QuerySet[Item],
+    window_size: int,
+    ttl: Optional[int] = None,
+    oldest_first: bool = True,
+) -> Iterator[List[Item]]:
+    """
+    Yield windows of Items due for an external price sync, most overdue
+    first: Items never synced or whose price changed since their last sync,
+    then Items last synced more than ``ttl`` seconds ago, oldest first.
+
+    Both passes are keyset-paginated along an index (the partial
+    ``item_price_sync_pending_idx`` and ItemSyncState's
+    ``item_sync_state_synced_at_idx``), so a run reads only the stale rows,
+    however large the table. Without ``oldest_first`` the expired Items are
+    read in ID order instead, for querysets limited to an ID range: the
+    range is then walked by primary key rather than the whole expired part
+    of ``item_sync_state_synced_at_idx``.
     """
-    variation = random.uniform(-0.10, 0.10)
-    new_price = base_price * Decimal(1 + variation)
-    return new_price.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    cutoff = stale_cutoff(ttl)
 
+    yield from iter_item_windows(queryset.filter(PRICE_SYNC_PENDING), window_size)
 
-def chunked(iterable: List[Item], size: int) -> Iterator[List[Item]]:
+    if not oldest_first:
+        yield from iter_item_windows(
+            queryset.filter(sync_state__synced_at__lt=cutoff), window_size
+        )
+        return
+
+    expired = (
+        queryset.filter(sync_state__synced_at__lt=cutoff)
+        .annotate(synced_at=F("sync_state__synced_at"))
+        .order_by("synced_at", "pk")
+    )
+    last: Optional[Tuple[datetime, int]] = None
+    while True:
+        page = expired
+        if last is not None:
+            synced_at, last_id = last
+            page = page.filter(
+                Q(sync_state__synced_at__gt=synced_at)
+                | Q(sync_state__synced_at=synced_at, pk__gt=last_id)
+            )
+        window = list(page[:window_size])
+        if not window:
+            return
+        # Taken before yielding: syncing the window moves its timestamps.
+        last = (window[-1].synced_at, window[-1].pk)
+        yield window
+
+
+def stale_items_filter(ttl: Optional[int] = None) -> Q:
+    """Condition matching Items that iter_stale_windows() would yield."""
+    return PRICE_SYNC_PENDING | Q(sync_state__synced_at__lt=stale_cutoff(ttl))
+
+
+def mark_synced(item_ids: Sequence[int], synced_at: datetime) -> None:
+    """Record when the given Items were synced, with one upsert."""
+    ItemSyncState.objects.bulk_create(
+        [ItemSyncState(item_id=item_id, synced_at=synced_at) for item_id in item_ids],
+        update_conflicts=True,
+        unique_fields=["item"],
+        update_fields=["synced_at"],
+    )
+
+
+def apply_prices(items: Sequence[Item], prices: Dict[int, Decimal]) -> List[Item]:
     """
-    Yield successive chunks from a list of Items.
+    Record a sync of ``items`` at the fetched ``prices``, in one transaction.
+
+    The Item rows are written by one UPDATE that compares each row's
+    current external price with the new one in SQL, so a row is only
+    rewritten, and its cached responses invalidated, when its external
+    price changed or its price was edited since the last sync. Rows are
+    only written if they still hold the values they were read with; a row
+    changed since is left stale for the next run. Drift changes are taken
+    from the rows actually written, so the drift summary stays exact.
+
+    Synced Items are stamped in ItemSyncState and get a price history row.
+    Items missing from ``prices`` are left untouched, so they stay stale.
+    Returns the synced Items.
     """
-    for i in range(0, len(iterable), size):
-        yield iterable[i : i + size]
+    priced = [item for item in items if item.pk in prices]
+    if not priced:
+        return []
+
+    now = timezone.now()
+    drift = DriftDelta()
+    synced = []
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                APPLY_PRICES_SQL,
+                {
+                    "now": now,
+                    "ids": [item.pk for item in priced],
+                    "prices": [prices[item.pk] for item in priced],
+                    "read_external_prices": [item.external_price for item in priced],
+                    "read_prices_at_sync": [item.price_at_sync for item in priced],
+                    "read_updated_at": [item.updated_at for item in priced],
+                },
+            )
+            changed = dict(cursor.fetchall())
+        for item in priced:
+            if item.pk in changed:
+                drift.remove(item_drift(item))
+                drift.add(changed[item.pk])
+                item.external_price = prices[item.pk]
+                item.price_at_sync = item.price
+                item.updated_at = now
+            elif (prices[item.pk], item.price) != (
+                item.external_price,
+                item.price_at_sync,
+            ):
+                # Changed since it was read.
+                continue
+            synced.append(item)
+        mark_synced([item.pk for item in synced], now)
+        record_price_history(synced, now)
+        drift.save()
+    invalidate_items(list(changed))
+    return synced
 
 
-def sync_item_by_id(item_id: int, simulate_delay: bool = True) -> str:
+def iter_id_ranges(
+    queryset: QuerySet[Item], range_size: int
+) -> Iterator[Tuple[int, int]]:
     """
-    Sync external_price for a single Item by ID.
-    Optionally simulate network/API delay.
+    Yield half-open (start_id, end_id) ranges covering all IDs in a queryset.
     """
-    try:
-        with transaction.atomic():
-            item = Item.objects.select_for_update().get(pk=item_id)
+    bounds = queryset.aggregate(min_id=Min("pk"), max_id=Max("pk"))
+    if bounds["min_id"] is None:
+        return
+    for start_id in range(bounds["min_id"], bounds["max_id"] + 1, range_size):
+        yield start_id, start_id + range_size
+
+
+def sync_item_by_id(
+    item_id: int,
+    client: Optional[PriceClient] = None,
+    max_attempts: Optional[int] = None,
+) -> str:
+    """
+    Sync external_price for a single Item by ID
+    using the configured external price provider.
+
+    The external call happens outside any transaction and without row locks.
+    The new price is then applied by apply_prices(), which skips the row if
+    it was modified meanwhile; the item is then re-read and the price is
+    fetched again, up to ``max_attempts`` times.
+    """
+    client = client or get_price_client()
+    if max_attempts is None:
+        max_attempts = settings.ITEMS_PRICE_SYNC_MAX_ATTEMPTS
 
-            if simulate_delay:
-                time.sleep(random.uniform(0.1, 0.5))
+    started = time.perf_counter()
+    for _ in range(max_attempts):
+        try:
+            item = Item.objects.only("name", *SYNC_READ_FIELDS).get(pk=item_id)
+        except Item.DoesNotExist:
+            return f"Item with ID {item_id} does not exist."
 
-            item.external_price = simulate_external_price(item.price)
-            item.save()
+        prices = client.fetch_prices([item])
+        if item.pk not in prices:
+            return f"External price for '{item.name}' could not be fetched."
 
-            return f"External price for '{item.name}' updated to {item.external_price}"
+        if apply_prices([item], prices):
+            record_sync_batch("item", 1, time.perf_counter() - started)
+            return f"External price for '{item.name}' updated to {prices[item.pk]}"
 
-    except Item.DoesNotExist:
-        return f"Item with ID {item_id} does not exist."
+    return (
+        f"External price for '{item.name}' was not updated: "
+        f"the item changed during {max_attempts} sync attempts."
+    )
 
 
-def sync_all_items(batch_size: int = 500) -> int:
+def sync_items_by_ids(
+    item_ids: Sequence[int], client: Optional[PriceClient] = None
+) -> int:
     """
-    Update external_price for all Items in the database in batches.
-    Returns the number of updated items.
+    Sync external_price for many Items with one SELECT and one bulk_update.
+    Returns the number of synced items; IDs that no longer exist are skipped.
     """
-    updated_items: List[Item] = []
+    client = client or get_price_client()
+    started = time.perf_counter()
+    items = list(Item.objects.filter(pk__in=item_ids).only(*SYNC_READ_FIELDS))
+    synced = len(apply_prices(items, client.fetch_prices(items)))
+    record_sync_batch("ids", synced, time.perf_counter() - started)
+    return synced
 
-    for item in Item.objects.all().iterator():
-        item.external_price = simulate_external_price(item.price)
-        updated_items.append(item)
 
-    for batch in chunked(updated_items, batch_size):
-        with transaction.atomic():
-            Item.objects.bulk_update(batch, ["external_price"])
+def plan_id_shards(
+    shard_size: Optional[int] = None,
+    max_shards: Optional[int] = None,
+    ttl: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    """
+    Split the stale Items into half-open (start_id, end_id) shards of about
+    ``shard_size`` Items each, fewer and larger when needed so that at most
+    ``max_shards`` are returned.
+
+    Boundaries are planned with NTILE over the stale IDs, read from the
+    pending and expired indexes, so shards are balanced by the work they
+    hold and IDs between them have nothing due.
+    """
+    if shard_size is None:
+        shard_size = settings.ITEMS_PRICE_SYNC_SHARD_SIZE
+    if max_shards is None:
+        max_shards = settings.ITEMS_PRICE_SYNC_MAX_PARALLEL_SHARDS
+
+    pending = Item.objects.filter(PRICE_SYNC_PENDING).order_by().values_list("pk")
+    expired = (
+        ItemSyncState.objects.filter(synced_at__lt=stale_cutoff(ttl))
+        .order_by()
+        .values_list("item_id")
+    )
+    sql, params = pending.union(expired).query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(
+            PLAN_SHARDS_SQL.format(stale=sql), [*params, max_shards, shard_size]
+        )
+        return [(first_id, last_id + 1) for first_id, last_id in cursor.fetchall()]
+
+
+def sync_all_items(
+    batch_size: Optional[int] = None,
+    in_database: Optional[bool] = None,
+    client: Optional[PriceClient] = None,
+    full: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Sync external_price for stale Items in batches (see iter_stale_windows),
+    or for every Item with ``full``. Returns the number of synced items.
+
+    Items are streamed one keyset-paginated window of ``batch_size`` rows
+    at a time, so memory stays bounded regardless of table size. With
+    ``in_database`` the price is computed by Postgres instead, using one
+    set-based UPDATE per ID range and never loading rows into Python;
+    this requires a provider that can be expressed in SQL.
+
+    ``progress`` is called with the running and total counts after each
+    batch; the total costs one extra COUNT query.
+    """
+    return _sync_queryset(
+        Item.objects.all(), batch_size, in_database, client, full, progress
+    )
+
+
+def sync_item_range(
+    start_id: int,
+    end_id: int,
+    batch_size: Optional[int] = None,
+    in_database: Optional[bool] = None,
+    client: Optional[PriceClient] = None,
+    full: bool = False,
+    progress: Optional[ProgressCallback] = None,
+) -> int:
+    """
+    Sync external_price for the stale Items (all Items with ``full``) with
+    start_id <= id < end_id. Returns the number of synced items.
 
-    return len(updated_items)
+    Expired Items are synced in ID order rather than oldest first (see
+    iter_stale_windows), so concurrent shards each read only their range.
+    """
+    queryset = Item.objects.filter(pk__gte=start_id, pk__lt=end_id)
+    return _sync_queryset(
+        queryset, batch_size, in_database, client, full, progress, oldest_first=False
+    )
+
+
+def _sync_queryset(
+    queryset: QuerySet[Item],
+    batch_size: Optional[int] = None,
+    in_database: Optional[bool] = None,
+    client: Optional[PriceClient] = None,
+    full: bool = False,
+    progress: Optional[ProgressCallback] = None,
+    oldest_first: bool = True,
+) -> int:
+    """
+    Reprice the stale Items in a queryset (all of them with ``full``),
+    one window at a time.
+    """
+    if batch_size is None:
+        batch_size = settings.ITEMS_PRICE_SYNC_BATCH_SIZE
+    if in_database is None:
+        in_database = settings.ITEMS_PRICE_SYNC_IN_DATABASE
+    client = client or get_price_client()
+
+    total = 0
+    if progress is not None:
+        total = (queryset if full else queryset.filter(stale_items_filter())).count()
+        progress(0, total)
+
+    if in_database:
+        if not full:
+            queryset = queryset.filter(stale_items_filter())
+        return _sync_id_ranges_in_database(
+            queryset, batch_size, client, progress, total
+        )
+
+    queryset = queryset.only(*SYNC_READ_FIELDS)
+    if full:
+        windows = iter_item_windows(queryset, batch_size)
+    else:
+        windows = iter_stale_windows(queryset, batch_size, oldest_first=oldest_first)
+
+    synced = 0
+    started = time.perf_counter()
+    for window in windows:
+        batch = len(apply_prices(window, client.fetch_prices(window)))
+        synced += batch
+        finished = time.perf_counter()
+        record_sync_batch("batch", batch, finished - started)
+        started = finished
+        if progress is not None:
+            progress(synced, total)
+    return synced
+
+
+def _sync_id_ranges_in_database(
+    queryset: QuerySet[Item],
+    range_size: int,
+    client: PriceClient,
+    progress: Optional[ProgressCallback] = None,
+    total: int = 0,
+) -> int:
+    """
+    Reprice a queryset with one statement per "id >= a AND id < b" range
+    (see SYNC_IN_DATABASE_SQL). The range's rows are locked as they are
+    priced, so the drift totals it returns match the rows it wrote.
+    """
+    expression = client.provider.as_expression()
+    if expression is None:
+        raise ImproperlyConfigured(
+            f"{type(client.provider).__name__} cannot compute prices in the database."
+        )
+
+    updated = 0
+    for start_id, end_id in iter_id_ranges(queryset, range_size):
+        started = time.perf_counter()
+        now = timezone.now()
+        drift = DriftDelta()
+        with transaction.atomic():
+            priced = (
+                queryset.filter(pk__gte=start_id, pk__lt=end_id)
+                .order_by("pk")
+                .select_for_update(of=("self",))
+                .values_list("pk", "price", "price_drift", expression)
+            )
+            sql, params = priced.query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    SYNC_IN_DATABASE_SQL.format(priced=sql),
+                    [*params, now, now, now, list(drift.edges)],
+                )
+                rows = cursor.fetchall()
+            for _, sign, bucket, *totals in rows:
+                if sign is not None:
+                    drift.add_totals({bucket: tuple(totals)}, sign)
+            drift.save()
+        batch = rows[0][0]
+        updated += batch
+        record_sync_batch("database", batch, time.perf_counter() - started)
+        if progress is not None:
+            progress(updated, total)
+    invalidate_all_items()
+    return updated
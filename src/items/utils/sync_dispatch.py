@@ -0,0 +1,31 @@
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+
+from items.tasks import sync_external_prices_for_items
+from items.utils.on_commit import OnCommitBuffer
+
+
+class PriceSyncBuffer(OnCommitBuffer):
+    """
+    Sends the IDs of Items created in a transaction as one
+    sync_external_prices_for_items task per ITEMS_PRICE_SYNC_DISPATCH_BATCH_SIZE.
+    """
+
+    def flush(self, item_ids: List[int]) -> None:
+        batch_size = settings.ITEMS_PRICE_SYNC_DISPATCH_BATCH_SIZE
+        for start in range(0, len(item_ids), batch_size):
+            sync_external_prices_for_items.delay(item_ids[start : start + batch_size])
+
+
+def queue_external_price_sync(
+    item_ids: Iterable[int], using: Optional[str] = None
+) -> None:
+    """
+    Schedule an external price sync for the given Items once the current
+    transaction commits. All calls within one transaction share a buffer,
+    so bulk ingests produce a handful of batched tasks instead of one per
+    row, and no task can run before its rows are visible. Outside a
+    transaction the sync is dispatched immediately.
+    """
+    PriceSyncBuffer.add(item_ids, using=using)
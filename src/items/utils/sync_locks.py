@@ -0,0 +1,80 @@
+import uuid
+from typing import Optional, Sequence, Tuple
+
+from celery import Task
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.redis import RedisCache
+
+# Keys of the dedup locks. Each holds the ID of the task that owns the sync.
+ITEM_SYNC_LOCK = "items:sync-lock:item:{}"
+FULL_SYNC_LOCK = "items:sync-lock:all"
+
+# Deletes the lock only if it still holds the given task ID, atomically.
+RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+end
+return 0
+"""
+
+
+def acquire_sync_lock(key: str, task_id: str, timeout: int) -> Optional[str]:
+    """
+    Take the lock ``key`` for ``task_id`` with an atomic add (SET NX EX on
+    Redis). Returns None when ``task_id`` holds the lock, either now or
+    already, or else the ID of the task holding it.
+
+    The lock expires after ``timeout`` seconds, so a task lost with its
+    worker blocks later syncs for at most that long.
+    """
+    while True:
+        if cache.add(key, task_id, timeout):
+            return None
+        holder = cache.get(key)
+        if holder is not None:
+            return None if holder == task_id else holder
+        # Expired between add() and get(): try again.
+
+
+def release_sync_lock(key: str, task_id: str) -> None:
+    """
+    Release the lock ``key`` if ``task_id`` still holds it.
+
+    On Redis the check and the delete run as one script, so a lock that
+    expired and was taken by another task in between is left alone.
+    """
+    backend = caches[DEFAULT_CACHE_ALIAS]
+    if isinstance(backend, RedisCache):
+        # Values are stored serialized, so compare against the same bytes.
+        client = backend._cache
+        client.get_client(key, write=True).eval(
+            RELEASE_SCRIPT,
+            1,
+            backend.make_and_validate_key(key),
+            client._serializer.dumps(task_id),
+        )
+    # Other backends (the tests' LocMemCache) have no compare-and-delete.
+    elif cache.get(key) == task_id:
+        cache.delete(key)
+
+
+def dispatch_once(
+    task: Task, key: str, timeout: int, args: Sequence = ()
+) -> Tuple[str, bool]:
+    """
+    Send ``task`` unless a run holding lock ``key`` is queued or running.
+    Returns the ID of the new or the existing task, and whether it was sent.
+
+    The lock is taken under the new task's ID before it is sent, so repeat
+    requests return that ID straight away; the task releases it when done.
+    """
+    task_id = str(uuid.uuid4())
+    holder = acquire_sync_lock(key, task_id, timeout)
+    if holder is not None:
+        return holder, False
+    try:
+        result = task.apply_async(args, task_id=task_id)
+    except Exception:
+        release_sync_lock(key, task_id)
+        raise
+    return result.id, True
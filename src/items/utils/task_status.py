@@ -0,0 +1,134 @@
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from celery import Task, current_app, states
+from celery.backends.base import KeyValueStoreBackend
+from django.conf import settings
+
+# Custom state published by long-running tasks while they work.
+PROGRESS = "PROGRESS"
+
+
+class TaskProgress:
+    """
+    Progress callback for a bound task: ``progress(processed, total)``
+    publishes a PROGRESS state with the rows processed, the total and the
+    rate so far, at most once every ITEMS_TASK_PROGRESS_INTERVAL seconds.
+    """
+
+    def __init__(self, task: Task, interval: Optional[float] = None) -> None:
+        self.task = task
+        self.interval = (
+            settings.ITEMS_TASK_PROGRESS_INTERVAL if interval is None else interval
+        )
+        self.started = time.monotonic()
+        self.published: Optional[float] = None
+
+    @classmethod
+    def for_task(cls, task: Task) -> Optional["TaskProgress"]:
+        """A reporter when ``task`` runs in a worker; None when called inline."""
+        if task.request.id is None or task.request.is_eager:
+            return None
+        return cls(task)
+
+    def __call__(self, processed: int, total: int) -> None:
+        now = time.monotonic()
+        if self.published is not None and now - self.published < self.interval:
+            return
+        self.published = now
+        elapsed = now - self.started
+        self.task.update_state(
+            state=PROGRESS,
+            meta={
+                "processed": processed,
+                "total": total,
+                "rows_per_second": round(processed / elapsed, 1) if elapsed else 0.0,
+            },
+        )
+
+
+def read_task_metas(task_ids: Sequence[str]) -> List[Optional[Dict[str, Any]]]:
+    """
+    Read the stored state of many tasks, in ``task_ids`` order, with a single
+    MGET on key-value result backends such as Redis. Unknown IDs give None.
+    """
+    backend = current_app.backend
+    if not isinstance(backend, KeyValueStoreBackend):
+        return [backend.get_task_meta(task_id) for task_id in task_ids]
+
+    keys = [backend.get_key_for_task(task_id) for task_id in task_ids]
+    values = backend.mget(keys) if keys else []
+    if hasattr(values, "get"):
+        values = [values.get(key) for key in keys]
+    return [None if value is None else backend.decode_result(value) for value in values]
+
+
+def describe_task(task_id: str, meta: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Render a task's stored state for the status endpoints."""
+    status = meta["status"] if meta else states.PENDING
+    result = meta["result"] if meta else None
+    if isinstance(result, BaseException):
+        result = f"{type(result).__name__}: {result}"
+    return {
+        "task_id": task_id,
+        "status": status,
+        "result": result if status in states.READY_STATES else None,
+        "progress": result if status == PROGRESS else None,
+    }
+
+
+def combine_progress(
+    subtasks: Sequence[Optional[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """
+    Overall progress of a fan-out from its subtasks' states: finished
+    subtasks count their result (rows synced), running ones their progress.
+    """
+    processed = total = done = 0
+    rate = 0.0
+    for meta in subtasks:
+        if meta is None:
+            continue
+        if meta["status"] == states.SUCCESS and isinstance(meta["result"], int):
+            done += 1
+            processed += meta["result"]
+            total += meta["result"]
+        elif meta["status"] == PROGRESS:
+            processed += meta["result"]["processed"]
+            total += meta["result"]["total"]
+            rate += meta["result"]["rows_per_second"]
+    return {
+        "subtasks": len(subtasks),
+        "subtasks_done": done,
+        "processed": processed,
+        "total": total,
+        "rows_per_second": round(rate, 1),
+    }
+
+
+def task_statuses(task_ids: Sequence[str]) -> List[Dict[str, Any]]:
+    """
+    Describe many tasks with one backend read, plus one more for the
+    subtasks of tasks that fanned work out (results with ``subtask_ids``),
+    whose combined progress is reported as the parent's progress.
+    """
+    metas = read_task_metas(task_ids)
+    described = [describe_task(task_id, meta) for task_id, meta in zip(task_ids, metas)]
+
+    parents = [
+        entry
+        for entry in described
+        if isinstance(entry["result"], dict) and entry["result"].get("subtask_ids")
+    ]
+    if not parents:
+        return described
+
+    subtask_ids = [
+        subtask_id for entry in parents for subtask_id in entry["result"]["subtask_ids"]
+    ]
+    subtask_metas = dict(zip(subtask_ids, read_task_metas(subtask_ids)))
+    for entry in parents:
+        entry["progress"] = combine_progress(
+            [subtask_metas[subtask_id] for subtask_id in entry["result"]["subtask_ids"]]
+        )
+    return described
@@ -1,59 +1,327 @@
-from celery.result import AsyncResult
+import io
+
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework import status, viewsets
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import OrderingFilter
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.request import Request
 from rest_framework.response import Response
 
+from backend.middleware import TimedViewMixin
+
+from . import cache
+from .filters import ItemFilter, ItemSearchFilter
 from .models import Item
-from .serializers import ItemSerializer
+from .pagination import (
+    ItemKeysetPagination,
+    ItemPageNumberPagination,
+    uses_keyset_pagination,
+)
+from .serializers import (
+    ItemRowSerializer,
+    ItemSerializer,
+    PriceDriftItemSerializer,
+    PriceDriftQuerySerializer,
+    PriceDriftSummarySerializer,
+    PriceHistoryBucketSerializer,
+    PriceHistoryQuerySerializer,
+)
 from .tasks import hourly_external_price_sync, simulate_external_price_sync_for_item
+from .utils.bulk_import import (
+    IMPORT_FORMATS,
+    guess_import_format,
+    import_items,
+    is_valid_utf8,
+)
+from .utils.bulk_operations import (
+    bulk_create_items,
+    bulk_delete_items,
+    bulk_update_items,
+)
+from .utils.export import iter_csv, iter_ndjson
+from .utils.price_drift import drift_summary, top_drift_items
+from .utils.price_history import price_history_series
+from .utils.sync_locks import FULL_SYNC_LOCK, ITEM_SYNC_LOCK, dispatch_once
+from .utils.task_status import task_statuses
 
 
-class ItemViewSet(viewsets.ModelViewSet):
+class ItemViewSet(TimedViewMixin, viewsets.ModelViewSet):
     """ViewSet for managing items."""
 
-    queryset = Item.objects.all()
+    queryset = Item.objects.defer("search_vector")
     serializer_class = ItemSerializer
-    filterset_fields = ["price"]
+    filter_backends = [DjangoFilterBackend, ItemSearchFilter, OrderingFilter]
+    filterset_class = ItemFilter
     search_fields = ["name", "description"]
     ordering_fields = ["price", "created_at"]
     permission_classes = [IsAuthenticated]
+    pagination_class = ItemPageNumberPagination
+    export_content_types = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+    def uses_fast_read_path(self) -> bool:
+        """
+        List and retrieve read ``.values()`` rows rendered by ItemRowSerializer
+        instead of full model instances, when enabled in settings.
+        """
+        return (
+            settings.ITEMS_FAST_READ_SERIALIZATION
+            and self.action in ("list", "retrieve")
+            and not getattr(self, "swagger_fake_view", False)
+        )
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.uses_fast_read_path():
+            queryset = queryset.values(*ItemRowSerializer.value_fields())
+        return queryset
+
+    def get_serializer_class(self):
+        if self.uses_fast_read_path():
+            return ItemRowSerializer
+        return super().get_serializer_class()
+
+    @property
+    def paginator(self):
+        """
+        Use keyset pagination when the client asks for it with
+        ``?pagination=cursor`` (or passes a ``cursor``), page numbers otherwise.
+        """
+        if not hasattr(self, "_paginator") and uses_keyset_pagination(
+            getattr(self, "request", None)
+        ):
+            self._paginator = ItemKeysetPagination()
+        return super().paginator
+
+    def list(self, request: Request, *args, **kwargs) -> Response:
+        """List items, served from the two-tier response cache when possible."""
+        if not settings.ITEMS_RESPONSE_CACHE["ENABLED"]:
+            return super().list(request, *args, **kwargs)
+
+        key = cache.list_cache_key(request, self)
+        data = cache.get_or_compute(
+            key, lambda: super(ItemViewSet, self).list(request, *args, **kwargs).data
+        )
+        return Response(data)
+
+    def retrieve(self, request: Request, *args, **kwargs) -> Response:
+        """Retrieve an item, served from the two-tier response cache when possible."""
+        if not settings.ITEMS_RESPONSE_CACHE["ENABLED"]:
+            return super().retrieve(request, *args, **kwargs)
+
+        key = cache.detail_cache_key(request, self)
+        data = cache.get_or_compute(
+            key,
+            lambda: super(ItemViewSet, self).retrieve(request, *args, **kwargs).data,
+        )
+        return Response(data)
+
+    @action(detail=False, methods=["get"])
+    def export(self, request: Request) -> StreamingHttpResponse:
+        """
+        Stream every item matching the filter, search and ordering parameters
+        as NDJSON (default) or CSV, chosen with ``?export_format=csv``.
+        Rows are read from a server-side cursor ``ITEMS_EXPORT_CHUNK_SIZE``
+        rows at a time, so memory use does not grow with the export size.
+        """
+        export_format = request.query_params.get("export_format", "ndjson")
+        if export_format not in self.export_content_types:
+            choices = ", ".join(self.export_content_types)
+            raise ValidationError({"export_format": f"Choose one of {choices}."})
+
+        chunk_size = settings.ITEMS_EXPORT_CHUNK_SIZE
+        serializer = ItemRowSerializer()
+        rows = (
+            self.filter_queryset(self.get_queryset())
+            .values(*ItemRowSerializer.value_fields())
+            .iterator(chunk_size=chunk_size)
+        )
+        if export_format == "csv":
+            fields = [field.field_name for field in ItemRowSerializer.readable_fields()]
+            content = iter_csv(rows, serializer.row_to_dict, fields, chunk_size)
+        else:
+            content = iter_ndjson(rows, serializer.row_to_dict, chunk_size)
+
+        response = StreamingHttpResponse(
+            content, content_type=self.export_content_types[export_format]
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="items.{export_format}"'
+        )
+        return response
+
+    @action(detail=False, methods=["post", "put", "patch", "delete"])
+    def bulk(self, request: Request) -> Response:
+        """
+        Create (POST), update (PUT/PATCH) or delete (DELETE) many items in
+        one request. The body is a list of items, of items with their
+        ``id``, or of IDs to delete. All entries are validated up front and
+        written with a single statement.
+
+        By default the request is all-or-nothing (``400`` if any entry
+        fails); ``?atomic=false`` applies the valid entries and answers
+        ``207`` listing the failures. The response has one result per entry.
+        """
+        data = request.data
+        if not isinstance(data, list):
+            raise ValidationError({"non_field_errors": ["Expected a list."]})
+        max_items = settings.ITEMS_BULK_MAX_ITEMS
+        if len(data) > max_items:
+            raise ValidationError(
+                {"non_field_errors": [f"At most {max_items} entries per request."]}
+            )
+        atomic = request.query_params.get("atomic", "true").lower() != "false"
+
+        if request.method == "POST":
+            result = bulk_create_items(data, atomic=atomic)
+            code = result.status_code(atomic, status.HTTP_201_CREATED)
+        elif request.method == "DELETE":
+            result = bulk_delete_items(data, atomic=atomic)
+            code = result.status_code(atomic)
+        else:
+            partial = request.method == "PATCH"
+            result = bulk_update_items(data, partial=partial, atomic=atomic)
+            code = result.status_code(atomic)
+        return Response({"results": result.results}, status=code)
+
+    @action(
+        detail=False,
+        methods=["post"],
+        url_path="import",
+        parser_classes=[MultiPartParser],
+    )
+    def bulk_import(self, request: Request) -> Response:
+        """
+        Upsert items from an uploaded CSV or NDJSON ``file``, loaded with COPY.
+        The format is taken from ``import_format`` or the file extension.
+        Returns created/updated counts and an error entry per rejected row.
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            raise ValidationError({"file": "Upload a CSV or NDJSON file."})
+        import_format = request.query_params.get("import_format") or (
+            guess_import_format(upload.name)
+        )
+        if import_format not in IMPORT_FORMATS:
+            choices = ", ".join(IMPORT_FORMATS)
+            raise ValidationError({"import_format": f"Choose one of {choices}."})
+
+        if not is_valid_utf8(upload.file):
+            raise ValidationError({"file": "The file is not valid UTF-8."})
+        stream = io.TextIOWrapper(upload.file, encoding="utf-8", newline="")
+        return Response(import_items(stream, import_format).as_dict())
+
+    @action(detail=True, methods=["get"], url_path="price-history")
+    def price_history(self, request: Request, pk: str | None = None) -> Response:
+        """
+        Return the item's external price history downsampled into ``interval``
+        (hour or day) buckets between ``start`` and ``end`` (default: the last
+        7 days), with min, max and average price per bucket.
+        """
+        item = self.get_object()
+        query = PriceHistoryQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        params = query.validated_data
+        series = price_history_series(
+            item.pk, params["interval"], params["start"], params["end"]
+        )
+        return Response(
+            {
+                "item": item.pk,
+                "interval": params["interval"],
+                "start": query.fields["start"].to_representation(params["start"]),
+                "end": query.fields["end"].to_representation(params["end"]),
+                "results": PriceHistoryBucketSerializer(series, many=True).data,
+            }
+        )
+
+    @action(detail=False, methods=["get"], url_path="drift-stats")
+    def drift_stats(self, request: Request) -> Response:
+        """
+        Return the ``top`` items whose external price drifts most from the
+        price it was synced against, plus drift aggregates and histogram
+        maintained incrementally by the price sync.
+        """
+        query = PriceDriftQuerySerializer(data=request.query_params)
+        query.is_valid(raise_exception=True)
+        top = top_drift_items(query.validated_data["top"])
+        return Response(
+            {
+                "top": PriceDriftItemSerializer(top, many=True).data,
+                **PriceDriftSummarySerializer(drift_summary()).data,
+            }
+        )
 
     @action(detail=True, methods=["post"])
     def sync_price(self, request: Request, pk: str | None = None) -> Response:
         """
         Trigger external price sync for a single item (async).
-        Returns the Celery task ID so it can be tracked.
+        Returns the Celery task ID so it can be tracked; while a sync of the
+        item is queued or running, returns that task's ID instead.
         """
-        task = simulate_external_price_sync_for_item.delay(int(pk))
+        task_id, sent = dispatch_once(
+            simulate_external_price_sync_for_item,
+            ITEM_SYNC_LOCK.format(int(pk)),
+            settings.ITEMS_PRICE_SYNC_ITEM_LOCK_TIMEOUT,
+            args=(int(pk),),
+        )
+        message = "triggered" if sent else "already queued or running"
         return Response(
-            {"message": f"Price sync triggered for item {pk}", "task_id": task.id},
+            {"message": f"Price sync {message} for item {pk}", "task_id": task_id},
             status=status.HTTP_202_ACCEPTED,
         )
 
     @action(detail=False, methods=["post"])
     def sync_all_prices(self, request: Request) -> Response:
         """
-        Trigger external price sync for all items (async).
+        Trigger external price sync for all items (async), or return the
+        ID of the full sync already queued or running.
         """
-        task = hourly_external_price_sync.delay()
+        task_id, sent = dispatch_once(
+            hourly_external_price_sync,
+            FULL_SYNC_LOCK,
+            settings.ITEMS_PRICE_SYNC_FULL_LOCK_TIMEOUT,
+        )
+        message = "triggered" if sent else "already queued or running"
         return Response(
-            {"message": "Price sync triggered for all items", "task_id": task.id},
+            {"message": f"Price sync {message} for all items", "task_id": task_id},
             status=status.HTTP_202_ACCEPTED,
         )
 
+    @action(detail=False, methods=["get"], url_path="cache-stats")
+    def cache_stats(self, request: Request) -> Response:
+        """
+        Return this process's response cache hit and miss counters.
+        """
+        return Response(cache.stats.snapshot())
+
     @action(detail=False, methods=["get"], url_path="task-status/(?P<task_id>[^/.]+)")
     def task_status(self, request: Request, task_id: str | None = None) -> Response:
         """
-        Check the status of a Celery task by ID.
+        Check the status of a Celery task by ID, with its progress while a
+        price sync is running.
         Requires that CELERY_RESULT_BACKEND is configured.
         """
-        result = AsyncResult(task_id)
-        return Response(
-            {
-                "task_id": task_id,
-                "status": result.status,
-                "result": result.result if result.ready() else None,
-            }
+        return Response(task_statuses([task_id])[0])
+
+    @action(detail=False, methods=["post"], url_path="task-status")
+    def task_statuses(self, request: Request) -> Response:
+        """
+        Check the status of many Celery tasks, given as ``{"task_ids": [...]}``,
+        with one result backend read.
+        """
+        task_ids = (
+            request.data.get("task_ids") if isinstance(request.data, dict) else None
         )
+        if not isinstance(task_ids, list) or not all(
+            isinstance(task_id, str) for task_id in task_ids
+        ):
+            raise ValidationError({"task_ids": ["Expected a list of task IDs."]})
+        max_ids = settings.ITEMS_TASK_STATUS_MAX_IDS
+        if len(task_ids) > max_ids:
+            raise ValidationError({"task_ids": [f"At most {max_ids} IDs per request."]})
+        return Response({"results": task_statuses(task_ids)})